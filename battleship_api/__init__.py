@@ -1,16 +1,64 @@
 from fastapi import FastAPI
+import math
 
-from .core import database, exceptions, logging
+from .core import (
+    admission,
+    database,
+    diagnostics,
+    exceptions,
+    idempotency,
+    logging,
+    memory,
+    migrations,
+    negotiation,
+    rate_limit)
 from .core.settings import (
     get_app_settings,
     init as init_settings,
     init_from_object as init_settings_from_object)
 
-from .api import api_router, api_tags
+from .api import api_router, api_tags, diagnostics_tags, get_debug_api_router
+from .api.player import jwt as player_jwt
 
 from .core.settings import Settings
 
 
+def init_database(settings: Settings):
+    """
+    Function initializing database connection with given settings and
+    (if enabled by `db_migrate` setting) applying pending schema migrations.
+    Then (unless disabled by `db_create_all` setting) creates all needed, non
+    existing tables.
+
+    Params:
+        - settings - Settings object instance.
+    """
+    db_args = dict()
+    if settings.db_check_same_thread is not None:
+        db_args |= {'check_same_thread': settings.db_check_same_thread}
+    database.init(settings.db_url, False, **db_args)
+    if settings.db_migrate:
+        migrations.upgrade(database.get_engine())
+    if settings.db_create_all:
+        database.create_all()
+
+
+def get_rate_limit(
+    rate: float | None,
+    burst: int | None
+) -> rate_limit.RateLimit | None:
+    """
+    Function creating rate limit from `rate_limit_*` settings values.
+
+    Returns:
+        Rate limit or None if rate is not set. Burst defaults to number of
+        requests allowed per second.
+    """
+    if rate is None:
+        return None
+    return rate_limit.RateLimit(rate, burst or max(1, math.ceil(rate)))
+
+
 def create_app(settings: Settings | None = None) -> FastAPI:
     """
     Function initializing application instance with given settings.
@@ -35,18 +83,76 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     logging.init(
         logging.DEFAULT_LOGGER_NAME
         if settings.debug
-        else logging.DEBUG_LOGGER_NAME)
+        else logging.DEBUG_LOGGER_NAME,
+        json_format=settings.log_format == 'json',
+        use_queue=settings.log_queue,
+        access_sample_rate=settings.log_access_sample_rate,
+        debug_sample_rate=settings.log_debug_sample_rate)
 
-    db_args = dict()
-    if settings.db_check_same_thread is not None:
-        db_args |= {'check_same_thread': settings.db_check_same_thread}
-    database.init(settings.db_url, **db_args)
+    memory.init(settings.storage == 'memory')
+    if memory.is_enabled():
+        diagnostics.register_cache('memory_records', lambda: len(memory.store))
+    else:
+        init_database(settings)
 
-    app = FastAPI(openapi_tags=api_tags)
+    app = FastAPI(
+        openapi_tags=api_tags + (diagnostics_tags if settings.debug else []),
+        default_response_class=negotiation.NegotiatedResponse)
     app.add_exception_handler(
         exceptions.BaseAPIException,
         exceptions.api_exceptions_handler)
+    admission.init(
+        {
+            'gameplay': settings.admission_gameplay_limit,
+            'listing': settings.admission_listing_limit,
+            admission.DEFAULT_GROUP: settings.admission_default_limit},
+        settings.admission_queue_size,
+        settings.admission_queue_timeout)
+    app.add_middleware(
+        admission.AdmissionControlMiddleware,
+        retry_after=settings.admission_retry_after)
+    # Requests waiting for the store lock (e.g. for running batch, whose
+    # operations are admitted separately) do not hold admission slots.
+    app.add_middleware(
+        memory.StoreLockMiddleware,
+        get_lock=database.get_lock)
+    idempotency.init(settings.idempotency_ttl, settings.idempotency_redis_url)
+    app.add_middleware(
+        idempotency.IdempotencyMiddleware,
+        identify_player=player_jwt.get_player_id)
+    rate_limit.init(
+        {
+            'gameplay': get_rate_limit(
+                settings.rate_limit_gameplay,
+                settings.rate_limit_gameplay_burst),
+            'listing': get_rate_limit(
+                settings.rate_limit_listing,
+                settings.rate_limit_listing_burst),
+            admission.DEFAULT_GROUP: get_rate_limit(
+                settings.rate_limit_default,
+                settings.rate_limit_default_burst)},
+        settings.rate_limit_redis_url)
+    app.add_middleware(
+        rate_limit.RateLimitMiddleware,
+        identify_player=player_jwt.get_player_id)
+    if settings.msgpack:
+        app.add_middleware(negotiation.ContentNegotiationMiddleware)
+    app.add_middleware(
+        logging.RequestLoggingMiddleware,
+        access_log=settings.log_access)
 
     app.include_router(api_router)
+    if settings.debug:
+        app.include_router(get_debug_api_router())
+        diagnostics.register_cache(
+            'openapi_schema',
+            lambda: len(app.openapi_schema or ()))
+
+    if settings.storage == 'sqlalchemy':
+        if settings.db_pool_warm_up:
+            app.add_event_handler(
+                'startup',
+                lambda: database.warm_up(settings.db_pool_warm_up))
+        app.add_event_handler('shutdown', database.dispose)
 
     return app
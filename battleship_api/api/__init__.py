@@ -4,17 +4,33 @@ from .board.routes import router as board_router
 from .player.routes import router as player_router
 from .ship.routes import router as ship_router
 from .shot.routes import router as shot_router
+from .matchmaking.routes import router as matchmaking_router
+from .batch.routes import router as batch_router
+from .status.routes import router as status_router
 
 from .board.tags import all_tags as board_tags
 from .player.tags import all_tags as player_tags
 from .ship.tags import all_tags as ship_tags
 from .shot.tags import all_tags as shot_tags
+from .matchmaking.tags import all_tags as matchmaking_tags
+from .batch.tags import all_tags as batch_tags
+from .status.tags import all_tags as status_tags
+from .diagnostics.tags import all_tags as diagnostics_tags
+
+__all__ = (
+    'api_router',
+    'api_tags',
+    'diagnostics_tags',
+    'get_debug_api_router')
 
 api_tags = (
     board_tags
     + player_tags
     + ship_tags
-    + shot_tags)
+    + shot_tags
+    + matchmaking_tags
+    + batch_tags
+    + status_tags)
 
 
 api_router = APIRouter(prefix='/api')
@@ -23,3 +39,20 @@ api_router.include_router(board_router)
 api_router.include_router(player_router)
 api_router.include_router(ship_router)
 api_router.include_router(shot_router)
+api_router.include_router(matchmaking_router)
+api_router.include_router(batch_router)
+api_router.include_router(status_router)
+
+
+def get_debug_api_router() -> APIRouter:
+    """
+    Returns router with operations available only in debug mode.
+
+    Debug operations are imported on first call, so applications running in
+    production mode do not pay for building them.
+    """
+    from .diagnostics.routes import router as diagnostics_router
+
+    debug_api_router = APIRouter(prefix='/api')
+    debug_api_router.include_router(diagnostics_router)
+    return debug_api_router
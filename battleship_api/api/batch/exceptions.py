@@ -0,0 +1,17 @@
+from fastapi import status
+
+from . import schemas
+from battleship_api.core.exceptions import BaseAPIException
+
+
+class BatchTooLargeException(BaseAPIException):
+    """
+    API exception raise when batch contains more operations than allowed by
+    `batch_max_operations` setting.
+
+    `battleship_api.api.batch.schemas.BatchLimit` data must be provided, when
+    initialized.
+    """
+    code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    message = "Batch contains too many operations."
+    schema = schemas.BatchLimit
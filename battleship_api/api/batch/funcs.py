@@ -0,0 +1,193 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from starlette.middleware.exceptions import ExceptionMiddleware
+from sqlalchemy.orm import Session
+
+from . import schemas
+
+from battleship_api.core import (
+    admission,
+    idempotency,
+    negotiation,
+    rate_limit)
+from battleship_api.core.database import SESSION_SCOPE_KEY
+from battleship_api.core.logging import get_app_logger
+
+
+# Response headers not returned in operation results.
+SKIPPED_HEADERS = frozenset({'content-length', 'content-type'})
+
+# Application middlewares applied to every operation separately, so they are
+# rate limited, admitted and deduplicated as separate requests would be.
+OPERATION_MIDDLEWARES = (
+    rate_limit.RateLimitMiddleware,
+    idempotency.IdempotencyMiddleware,
+    admission.AdmissionControlMiddleware)
+
+
+def get_operations_app(app: FastAPI):
+    """
+    Returns ASGI application handling batch operations: router of given
+    application with its exception handlers and with those of its
+    middlewares, which are listed in `OPERATION_MIDDLEWARES` (the others,
+    like logging, were already passed by batch request).
+
+    Params:
+        - app: Application instance
+
+    Returns:
+        ASGI application.
+    """
+    handlers = {
+        key: handler
+        for key, handler in app.exception_handlers.items()
+        if key not in (500, Exception)}
+    operations_app = ExceptionMiddleware(
+        AsyncExitStackMiddleware(app.router),
+        handlers=handlers,
+        debug=app.debug)
+    # The first middleware is the outermost one.
+    for middleware in reversed(app.user_middleware):
+        if middleware.cls in OPERATION_MIDDLEWARES:
+            operations_app = middleware.cls(
+                operations_app, **middleware.options)
+    return operations_app
+
+
+async def run_operation(
+    app,
+    parent_scope: dict,
+    db: Session,
+    operation: schemas.BatchOperation,
+    pending_responses: list
+) -> schemas.BatchOperationResult:
+    """
+    Dispatches operation as internal request to given ASGI application,
+    using given database session.
+
+    Unhandled exceptions are logged and reported as `500 Internal Server
+    Error` results.
+
+    Params:
+        - app: ASGI application handling operations
+        - parent_scope: ASGI scope of the batch request
+        - db: Database session shared by batch operations
+        - operation: Operation data
+        - pending_responses: List collecting operations responses to store
+            under their idempotency keys after batch is committed (see
+            `battleship_api.core.idempotency.finish_pending`)
+
+    Returns:
+        Operation result.
+    """
+    path, _, query = operation.path.partition('?')
+    body = (
+        json.dumps(operation.body).encode('utf-8')
+        if operation.body is not None
+        else b'')
+    headers = [
+        (name.lower().encode('latin-1'), value.encode('latin-1'))
+        for name, value in operation.headers.items()
+        if name.lower() not in SKIPPED_HEADERS] + [
+            (b'content-type', negotiation.JSON_MEDIA_TYPE.encode('latin-1')),
+            (b'content-length', str(len(body)).encode('latin-1'))]
+    scope = {
+        key: parent_scope[key]
+        for key in (
+            'asgi', 'http_version', 'scheme', 'server', 'client', 'app')
+        if key in parent_scope} | {
+            'type': 'http',
+            'method': operation.method,
+            'path': path,
+            'raw_path': path.encode('latin-1'),
+            'root_path': '',
+            'query_string': query.encode('latin-1'),
+            'headers': headers,
+            SESSION_SCOPE_KEY: db,
+            idempotency.PENDING_SCOPE_KEY: pending_responses}
+
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {'type': 'http.disconnect'}
+        received = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    status = None
+    response_headers = dict()
+    response_body = bytearray()
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+            response_headers.update(
+                (name.decode('latin-1'), value.decode('latin-1'))
+                for name, value in message.get('headers', ())
+                if name.decode('latin-1') not in SKIPPED_HEADERS)
+        elif message['type'] == 'http.response.body':
+            response_body.extend(message.get('body', b''))
+
+    # Operations responses are always decoded from JSON.
+    token = negotiation.response_media_type.set(negotiation.JSON_MEDIA_TYPE)
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        get_app_logger().exception(
+            f"Batch operation {operation.method} {operation.path} failed.")
+        return schemas.BatchOperationResult(
+            status=500,
+            headers=dict(),
+            body={'description': "Internal Server Error"})
+    finally:
+        negotiation.response_media_type.reset(token)
+    return schemas.BatchOperationResult(
+        status=status,
+        headers=response_headers,
+        body=json.loads(response_body) if response_body else None)
+
+
+async def run_batch(
+    app,
+    parent_scope: dict,
+    db: Session,
+    batch: schemas.BatchCreate,
+    pending_responses: list
+) -> tuple[bool, list[schemas.BatchOperationResult]]:
+    """
+    Runs batch operations in order, in given shared database session (see
+    `battleship_api.core.database.begin_shared_session`). Changes of every
+    failed operation (with response status code 400 or higher) are rolled
+    back. In atomic mode batch is stopped at the first failed operation.
+
+    Params:
+        - app: ASGI application handling operations
+        - parent_scope: ASGI scope of the batch request
+        - db: Database session shared by batch operations
+        - batch: Batch data
+        - pending_responses: List collecting operations responses to store
+            under their idempotency keys after batch is committed
+
+    Returns:
+        Tuple of success flag (False if any operation failed in atomic mode)
+        and operations results.
+    """
+    results = list()
+    for operation in batch.operations:
+        operation_responses = list()
+        result = await run_operation(
+            app, parent_scope, db, operation, operation_responses)
+        results.append(result)
+        if result.status < 400:
+            db.commit()
+            pending_responses.extend(operation_responses)
+            continue
+        db.rollback()
+        await idempotency.finish_pending(operation_responses, False)
+        if batch.mode is schemas.BatchMode.atomic:
+            return False, results
+    return True, results
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Request, status
+
+from . import funcs, schemas, tags
+from .exceptions import BatchTooLargeException
+
+from battleship_api.core import idempotency
+from battleship_api.core.database import begin_shared_session
+from battleship_api.core.exceptions import build_exceptions_dict
+from battleship_api.core.settings import get_app_settings
+
+
+router = APIRouter(prefix='/batch')
+
+
+@router.post(
+    '',
+    response_model=schemas.BatchResult,
+    status_code=status.HTTP_200_OK,
+    responses=build_exceptions_dict(BatchTooLargeException),
+    tags=[tags.batch_operation['name']])
+async def run_batch(batch: schemas.BatchCreate, request: Request):
+    """
+    Runs given list of operations on boards, players, ships and shots (each
+    described by method, path with query string, headers and JSON body, as
+    separate request would be) in order, in single database transaction, and
+    returns their results (response status code, headers and body).
+
+    In `atomic` mode (default) batch is stopped at the first failed operation
+    (with response status code 400 or higher) and changes of all operations
+    are rolled back. In `independent` mode changes of failed operations are
+    rolled back and changes of the others are committed.
+
+    Every operation is rate limited and admitted (and its `Idempotency-Key`
+    header is handled) as separate request would be. Responses of operations
+    with idempotency keys are stored only if their changes are committed.
+    \f
+    Params:
+        - batch: Batch operations and mode.
+        - request: Batch request.
+            - It is provided via FastAPI framework by default.
+
+    Raises:
+        - BatchTooLargeException: Batch contains more operations than allowed
+            by `batch_max_operations` setting.
+
+    Returns:
+        Operations results and whether their changes were committed.
+    """
+    max_operations = get_app_settings().batch_max_operations
+    if len(batch.operations) > max_operations:
+        raise BatchTooLargeException({'max_operations': max_operations})
+
+    committed = False
+    # Responses stored under operations idempotency keys, only if their
+    # changes are committed.
+    pending_responses = list()
+    try:
+        with begin_shared_session() as (db, transaction):
+            succeeded, results = await funcs.run_batch(
+                funcs.get_operations_app(request.app),
+                request.scope,
+                db,
+                batch,
+                pending_responses)
+            if succeeded:
+                transaction.commit()
+                committed = True
+    finally:
+        await idempotency.finish_pending(pending_responses, committed)
+    return schemas.BatchResult(committed=succeeded, results=results)
@@ -0,0 +1,48 @@
+from pydantic import BaseModel as BaseSchema, Field
+
+from enum import Enum
+from typing import Any, Literal
+
+
+# Paths of operations which can be run in batch.
+OPERATION_PATH_PATTERN = r'^/api/(boards|players|ships|shots)(/[^?]*)?(\?.*)?$'
+
+
+class BatchMode(str, Enum):
+    """
+    Batch operations results handling.
+
+    - atomic: Batch is stopped at the first failed operation and all its
+      changes are rolled back.
+    - independent: Changes of failed operations are rolled back, changes of
+      successful ones are committed.
+    """
+    atomic = 'atomic'
+    independent = 'independent'
+
+
+class BatchOperation(BaseSchema):
+    method: Literal['GET', 'POST', 'PUT', 'DELETE']
+    path: str = Field(..., regex=OPERATION_PATH_PATTERN)
+    headers: dict[str, str] = Field(default_factory=dict)
+    body: Any = None
+
+
+class BatchCreate(BaseSchema):
+    operations: list[BatchOperation] = Field(..., min_items=1)
+    mode: BatchMode = BatchMode.atomic
+
+
+class BatchOperationResult(BaseSchema):
+    status: int
+    headers: dict[str, str]
+    body: Any
+
+
+class BatchResult(BaseSchema):
+    committed: bool
+    results: list[BatchOperationResult]
+
+
+class BatchLimit(BaseSchema):
+    max_operations: int
@@ -0,0 +1,11 @@
+batch_operation = {
+    'name': 'batch-operation',
+    'description':
+        "Batch of API operations.<br>"
+        "Runs many operations on boards, players, ships and shots in single"
+        " request and database transaction."}
+
+
+all_tags = [
+    batch_operation,
+]
@@ -1,11 +1,23 @@
 from sqlalchemy.orm import Session
 
+from datetime import datetime
+
 from . import schemas
 
 from .models import Board as BoardModel
+from .repository import get_repository
+
+from battleship_api.api.player.models import Player as PlayerModel
+
+from battleship_api.core import database, single_flight
+from battleship_api.core.types import BoardState
 
 
-def create_board(db: Session, board: schemas.BoardCreate) -> BoardModel:
+def create_board(
+    db: Session,
+    board: schemas.BoardCreate,
+    matchmaking: bool = False
+) -> BoardModel:
     """
     Creates board instance and adds it to the database.
 
@@ -13,13 +25,38 @@ def create_board(db: Session, board: schemas.BoardCreate) -> BoardModel:
         - db: Database session
         - board: Board data represented by
             `battleship_api.api.board.schemas.BoardCreate` schema
+        - [Optional] matchmaking: Whether board is created by matchmaking
+            - Defaults to: False
 
     Returns:
         New board database object instance.
     """
-    new_board = BoardModel(**board.dict())
-    db.add(new_board)
-    return new_board
+    return get_repository(db).create_board(board, matchmaking)
+
+
+def create_boards(
+    db: Session,
+    board: schemas.BoardCreate,
+    count: int,
+    players_count: int = 0
+) -> list[int]:
+    """
+    Creates given number of boards with the same data, with set based
+    inserts (see `battleship_api.core.database.insert_many`).
+
+    Params:
+        - db: Database session
+        - board: Board data represented by
+            `battleship_api.api.board.schemas.BoardCreate` schema
+        - count: Number of boards to create
+        - [Optional] players_count: Number of players which will be assigned
+            to every board
+            - Defaults to: 0
+
+    Returns:
+        Created boards ids.
+    """
+    return get_repository(db).create_boards(board, count, players_count)
 
 
 def get_board(db: Session, board_id: int) -> BoardModel | None:
@@ -33,12 +70,32 @@ def get_board(db: Session, board_id: int) -> BoardModel | None:
     Returns:
         Board database object instance.
     """
-    return db.query(BoardModel).filter(BoardModel.id == board_id).first()
+    return get_repository(db).get_board(board_id)
 
 
-def get_boards(db: Session, limit: int, offset: int) -> list[BoardModel]:
+def get_board_with_winner(
+    db: Session,
+    board_id: int
+) -> tuple[BoardModel, PlayerModel | None] | None:
     """
-    Returns list of 'limit' boards in database starting from `offset` board.
+    Returns board object from database searched by board id, together with
+    its winner (player) object, with single query.
+
+    Params:
+        - db: Database session
+        - board_id: Board id
+
+    Returns:
+        Tuple of board and winner (None if it is not stored) database object
+        instances, or None if board not found.
+    """
+    return get_repository(db).get_board_with_winner(board_id)
+
+
+def get_winners(db: Session, limit: int, offset: int) -> list[BoardModel]:
+    """
+    Returns list of 'limit' finished boards with stored winner, starting from
+    `offset` board. The most recently finished boards are returned first.
 
     Params:
         db: Database session
@@ -48,4 +105,131 @@ def get_boards(db: Session, limit: int, offset: int) -> list[BoardModel]:
     Returns:
         Board list of 'limit' elements starting from 'offset' database.
     """
-    return db.query(BoardModel).offset(offset).limit(limit).all()
+    return get_repository(db).get_winners(limit, offset)
+
+
+def get_boards(
+    db: Session,
+    limit: int,
+    offset: int,
+    state: BoardState | None = None,
+    open_seats: bool | None = None,
+    has_password: bool | None = None
+) -> list[BoardModel]:
+    """
+    Returns list of 'limit' boards in database starting from `offset` board,
+    optionally filtered by given criteria. Boards are ordered by id.
+
+    Params:
+        db: Database session
+        - limit: Number of boards to return
+        - offset: Number of skipped boards
+        - [Optional] state: Boards state
+        - [Optional] open_seats: Whether boards should have less than two
+            players assigned or not
+        - [Optional] has_password: Whether boards should require password or
+            not
+
+    Returns:
+        Board list of 'limit' elements starting from 'offset' database.
+    """
+    return get_repository(db).get_boards(
+        limit, offset, state, open_seats, has_password)
+
+
+def get_waiting_board(db: Session, public: bool = True) -> BoardModel | None:
+    """
+    Returns the longest waiting (with the lowest id) password-less board in
+    preparation, with one player waiting for an opponent.
+
+    Params:
+        - db: Database session
+        - [Optional] public: Whether boards created directly should be
+            searched, not only ones created by matchmaking
+            - Defaults to: True
+
+    Returns:
+        Board database object instance or None if no board is waiting.
+    """
+    return get_repository(db).get_waiting_board(public)
+
+
+def delete_board(db: Session, board_id: int) -> int:
+    """
+    Deletes board searched by board id with single statement, without loading
+    it. Players assigned to the board are removed by the database
+    (`ON DELETE CASCADE`).
+
+    Params:
+        - db: Database session
+        - board_id: Board id
+
+    Returns:
+        Number of deleted boards.
+    """
+    invalidate_board(db, board_id)
+    return get_repository(db).delete_board(board_id)
+
+
+def claim_board(db: Session, board: BoardModel) -> bool:
+    """
+    Increments version of given board, only if it was not changed since the
+    board was loaded (compare-and-swap). Used before modifying game state, so
+    conflicting concurrent requests (also handled by other workers) cannot
+    both pass their validation.
+
+    Update locks the board's row till the end of transaction, so transaction
+    should be commited (or rolled back) right after the modification.
+
+    Params:
+        - db: Database session
+        - board: Board database object instance, loaded in current
+            transaction
+
+    Returns:
+        True if board was claimed, False if it was concurrently modified.
+    """
+    invalidate_board(db, board.id)
+    return get_repository(db).claim_board(board)
+
+
+def invalidate_board(db: Session, board_id: int):
+    """
+    Detaches in-flight board reads (see `battleship_api.core.single_flight`)
+    from requests arriving now and after the current transaction is
+    committed, so they never share result read before the board was changed.
+
+    Params:
+        - db: Database session
+        - board_id: Board id
+    """
+    single_flight.invalidate(board_id)
+    database.on_commit(db, lambda: single_flight.invalidate(board_id))
+
+
+def finish_game(board: BoardModel, winner_id: int, shots_count: int):
+    """
+    Changes board status to "game finished" and stores the game result.
+
+    Params:
+        - board: Board database object instance
+        - winner_id: Winner (player) id
+        - shots_count: Number of shots created during the game
+    """
+    board.state = BoardState.game_finished
+    board.winner_id = winner_id
+    board.finished_at = datetime.utcnow()
+    board.shots_count = shots_count
+
+
+def reset_game(board: BoardModel):
+    """
+    Changes board status to "preparing" and clears the game result.
+
+    Params:
+        - board: Board database object instance
+    """
+    board.state = BoardState.preparing
+    board.winner_id = None
+    board.finished_at = None
+    board.shots_count = None
@@ -74,3 +74,31 @@ class GameFinishedException(BaseAPIException):
         "Action cannot be performed, when board status is \"game"
         " finished\".")
     schema = schemas.BoardSearch
+
+
+class BoardConcurrentModificationException(BaseAPIException):
+    """
+    API exception raise when board's game state was modified by another
+    request during processing of the request. Request can be retried.
+
+    `battleship_api.api.board.schemas.BoardSearch` data must be provided, when
+    initialized.
+    """
+    code = status.HTTP_409_CONFLICT
+    message = (
+        "Board was concurrently modified by another request. Retry the"
+        " request.")
+    schema = schemas.BoardSearch
+
+
+class BoardsLimitExceededException(BaseAPIException):
+    """
+    API exception raise when more boards are requested to be created at once
+    than allowed by `bulk_max_boards` setting.
+
+    `battleship_api.api.board.schemas.BoardsLimit` data must be provided, when
+    initialized.
+    """
+    code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    message = "Too many boards requested to be created at once."
+    schema = schemas.BoardsLimit
@@ -0,0 +1,235 @@
+from sqlalchemy.orm import Session
+
+from . import crud, schemas
+from .exceptions import BoardNotFoundException, GameNotFinishedException
+
+from battleship_api.api.player import crud as player_crud
+from battleship_api.api.player import schemas as player_schemas
+from battleship_api.api.player.jwt import encode_player
+
+from battleship_api.api.ship import crud as ship_crud
+from battleship_api.api.ship import schemas as ship_schemas
+from battleship_api.api.ship.funcs import ShipIndex, get_ship_cells
+
+from battleship_api.api.shot import crud as shot_crud
+
+from battleship_api.core.grid import encode_cells
+from battleship_api.core.types import BoardState
+
+
+def provision_boards(
+    db: Session,
+    boards: schemas.BoardBulkCreate
+) -> list[schemas.BoardProvisioned]:
+    """
+    Creates given number of boards with the same password (hashed once) and,
+    if requested, two players assigned to each of them, with set based
+    inserts in single transaction.
+
+    Params:
+        - db: Database session
+        - boards: Boards creation data
+
+    Returns:
+        Created boards with their players and players access tokens.
+    """
+    players_count = 2 if boards.seat_players else 0
+    board_ids = crud.create_boards(db, boards, boards.count, players_count)
+    board_players = {board_id: list() for board_id in board_ids}
+    if boards.seat_players:
+        for player_id, board_id in player_crud.create_boards_players(
+            db, board_ids
+        ):
+            player = player_schemas.Player(id=player_id, board_id=board_id)
+            board_players[board_id].append(player_schemas.PlayerCredentials(
+                **player.dict(),
+                token=encode_player(player)))
+    db.commit()
+    return [
+        schemas.BoardProvisioned(
+            board=schemas.BoardOut(
+                id=board_id,
+                state=BoardState.preparing,
+                has_password=boards.password is not None,
+                players_count=players_count,
+                width=boards.width,
+                height=boards.height,
+                fleet=boards.fleet),
+            players=players)
+        for board_id, players in board_players.items()]
+
+
+def get_board(db: Session, board_id: int) -> schemas.BoardOut:
+    """
+    Returns data of board searched by board id.
+
+    Params:
+        - db: Database session
+        - board_id: Board id
+
+    Raises:
+        - BoardNotFoundException: Board not found by given id.
+
+    Returns:
+        Board data.
+    """
+    board = crud.get_board(db, board_id)
+    if board is None:
+        raise BoardNotFoundException(schemas.BoardSearch(id=board_id))
+    return schemas.BoardOut.from_orm(board)
+
+
+def get_winner(db: Session, board_id: int) -> player_schemas.Player:
+    """
+    Returns data of the winner (player) of game on board searched by board
+    id.
+
+    Params:
+        - db: Database session
+        - board_id: Board id
+
+    Raises:
+        - BoardNotFoundException: Board not found by given id.
+        - GameNotFinishedException: Operation can not be performed, due to
+            board status is not "finished".
+
+    Returns:
+        Winner (player) data.
+    """
+    found = crud.get_board_with_winner(db, board_id)
+    if found is None:
+        raise BoardNotFoundException(schemas.BoardSearch(id=board_id))
+    board, winner = found
+    if board.state is not BoardState.game_finished:
+        raise GameNotFinishedException(schemas.BoardOut.from_orm(board))
+    if winner is not None:
+        return player_schemas.Player.from_orm(winner)
+
+    # Games finished before results were stored.
+    stats = shot_crud.get_board_hits_stats(db, board_id)
+    first_stats = stats.get(board.players[0].id)
+    if first_stats is not None and first_stats.enemy_sunk:
+        return player_schemas.Player.from_orm(board.players[0])
+    return player_schemas.Player.from_orm(board.players[1])
+
+
+def get_snapshot(
+    db: Session,
+    board_id: int,
+    player_id: int,
+    since: int = 0
+) -> schemas.BoardSnapshot | None:
+    """
+    Returns game state on board searched by board id, seen by given player:
+    board data, players, id of player whose turn it is, winner id, player's
+    own fleet and shots of both players with hit flags.
+
+    Uses fixed number of queries, independent of number of ships and shots.
+
+    Params:
+        - db: Database session
+        - board_id: Board id
+        - player_id: Id of player requesting the snapshot
+        - [Optional] since: Id of the last shot already known to the player.
+            Only newer shots are returned.
+            - Defaults to: 0
+
+    Raises:
+        - BoardNotFoundException: Board not found by given id.
+
+    Returns:
+        Board snapshot or None if player is not assigned to the board.
+    """
+    board = crud.get_board(db, board_id)
+    if board is None:
+        raise BoardNotFoundException(schemas.BoardSearch(id=board_id))
+    players = sorted(board.players, key=lambda player: player.id)
+    player_ids = [player.id for player in players]
+    if player_id not in player_ids:
+        return None
+
+    ships = ship_crud.get_owners_ships(db, player_ids)
+    shots = shot_crud.get_players_shots(db, player_ids, since)
+    stats = shot_crud.get_players_shots_stats(db, player_ids)
+
+    turn = None
+    if board.state is BoardState.in_game and len(players) == 2:
+        first_count, second_count = (
+            stats.get(id_, (0, 0))[0] for id_ in player_ids)
+        turn = player_ids[0] if first_count == second_count else player_ids[1]
+
+    fleets = {
+        id_: ShipIndex(ship for ship in ships if ship.owner_id == id_)
+        for id_ in player_ids}
+
+    def snapshot_shot(shot) -> schemas.BoardSnapshotShot:
+        return schemas.BoardSnapshotShot(
+            id=shot.id,
+            player_id=shot.player_id,
+            column=shot.column,
+            row=shot.row,
+            hit=any(
+                fleet.is_ship(shot.column, shot.row)
+                for owner_id, fleet in fleets.items()
+                if owner_id != shot.player_id))
+
+    return schemas.BoardSnapshot(
+        board=schemas.BoardOut.from_orm(board),
+        players=[player_schemas.Player.from_orm(player) for player in players],
+        turn=turn,
+        winner_id=board.winner_id,
+        fleet=[
+            ship_schemas.Ship.from_orm(ship)
+            for ship in ships
+            if ship.owner_id == player_id],
+        own_shots=[
+            snapshot_shot(shot)
+            for shot in shots
+            if shot.player_id == player_id],
+        enemy_shots=[
+            snapshot_shot(shot)
+            for shot in shots
+            if shot.player_id != player_id],
+        sequence=max(
+            (last_id for _, last_id in stats.values()), default=0))
+
+
+def get_compact_snapshot(
+    snapshot: schemas.BoardSnapshot
+) -> schemas.BoardSnapshotCompact:
+    """
+    Returns given board snapshot with fleet and shots encoded as cells
+    bitmasks.
+
+    Params:
+        - snapshot: Board snapshot
+
+    Returns:
+        Compact board snapshot.
+    """
+    width, height = snapshot.board.width, snapshot.board.height
+
+    def shots_grids(shots: list[schemas.BoardSnapshotShot]) -> tuple[str, str]:
+        return (
+            encode_cells(
+                ((shot.column, shot.row) for shot in shots), width, height),
+            encode_cells(
+                ((shot.column, shot.row) for shot in shots if shot.hit),
+                width,
+                height))
+
+    own_shots_grid, own_hits_grid = shots_grids(snapshot.own_shots)
+    enemy_shots_grid, enemy_hits_grid = shots_grids(snapshot.enemy_shots)
+    return schemas.BoardSnapshotCompact(
+        **snapshot.dict(include=set(schemas.BoardSnapshotBase.__fields__)),
+        fleet_grid=encode_cells(
+            (
+                cell
+                for ship in snapshot.fleet
+                for cell in get_ship_cells(ship)),
+            width,
+            height),
+        own_shots_grid=own_shots_grid,
+        own_hits_grid=own_hits_grid,
+        enemy_shots_grid=enemy_shots_grid,
+        enemy_hits_grid=enemy_hits_grid)
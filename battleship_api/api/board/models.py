@@ -1,18 +1,65 @@
-from sqlalchemy import Enum, Integer, String
+from sqlalchemy import Boolean, DateTime, Enum, Integer, String, false
 from sqlalchemy.orm import relationship
-from sqlalchemy.schema import Column
+from sqlalchemy.schema import Column, Index
 
 from battleship_api.core.database import BaseModel
+from battleship_api.core.grid import (
+    DEFAULT_BOARD_SIZE, DEFAULT_FLEET, dump_fleet)
 from battleship_api.core.types import BoardState
 
 
 class Board(BaseModel):
     __tablename__ = 'boards'
+    __table_args__ = (Index(
+        'ix_boards_lobby',
+        'state',
+        'has_password',
+        'id',
+        'players_count'),
+        Index('ix_boards_finished_at', 'finished_at', 'id'))
 
     id = Column(Integer, primary_key=True, index=True)
     password = Column(String, nullable=True)
     state = Column(Enum(BoardState), default=BoardState.preparing)
+    # Denormalized columns allowing to filter boards (see `ix_boards_lobby`)
+    # without joining players.
+    has_password = Column(
+        Boolean, default=False, server_default=false(), nullable=False)
+    players_count = Column(
+        Integer, default=0, server_default='0', nullable=False)
+    # Whether board was created by matchmaking (see
+    # `battleship_api.api.matchmaking.routes.join_game`).
+    matchmaking = Column(
+        Boolean, default=False, server_default=false(), nullable=False)
+    # Incremented by each request changing game state, to detect concurrent
+    # modifications of the board (see
+    # `battleship_api.api.board.crud.claim_board`).
+    version = Column(Integer, default=0, server_default='0', nullable=False)
+    # Game result, stored when the game finishes (see
+    # `battleship_api.api.board.crud.finish_game`). Winner id is not a foreign
+    # key, to not make boards and players tables depend on each other.
+    winner_id = Column(Integer, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    shots_count = Column(Integer, nullable=True)
+    # Board geometry and lengths of ships every player places on it (see
+    # `battleship_api.core.grid.dump_fleet`).
+    width = Column(
+        Integer,
+        default=DEFAULT_BOARD_SIZE,
+        server_default=str(DEFAULT_BOARD_SIZE),
+        nullable=False)
+    height = Column(
+        Integer,
+        default=DEFAULT_BOARD_SIZE,
+        server_default=str(DEFAULT_BOARD_SIZE),
+        nullable=False)
+    fleet = Column(
+        String,
+        default=dump_fleet(DEFAULT_FLEET),
+        server_default=dump_fleet(DEFAULT_FLEET),
+        nullable=False)
 
     players = relationship(
         'battleship_api.api.player.models.Player',
+        passive_deletes=True,
         back_populates='board')
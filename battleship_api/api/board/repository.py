@@ -0,0 +1,332 @@
+"""
+Boards storage backends used by `battleship_api.api.board.crud`: SQLAlchemy
+(database) and in-memory (see `battleship_api.core.memory`) one.
+"""
+import heapq
+import itertools
+
+from abc import ABC, abstractmethod
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from . import schemas
+from .models import Board as BoardModel
+
+from battleship_api.api.player.models import Player as PlayerModel
+
+from battleship_api.core.database import insert_many
+from battleship_api.core.grid import (
+    DEFAULT_BOARD_SIZE,
+    DEFAULT_FLEET,
+    dump_fleet)
+from battleship_api.core.memory import MemoryRecord, MemorySession
+from battleship_api.core.types import BoardState
+
+
+class BoardRepository(ABC):
+    """
+    Interface of boards storage. Methods are described by functions of
+    `battleship_api.api.board.crud` calling them.
+    """
+    @abstractmethod
+    def create_board(
+        self,
+        board: schemas.BoardCreate,
+        matchmaking: bool
+    ) -> BoardModel:
+        pass
+
+    @abstractmethod
+    def create_boards(
+        self,
+        board: schemas.BoardCreate,
+        count: int,
+        players_count: int
+    ) -> list[int]:
+        pass
+
+    @abstractmethod
+    def get_board(self, board_id: int) -> BoardModel | None:
+        pass
+
+    @abstractmethod
+    def get_board_with_winner(
+        self,
+        board_id: int
+    ) -> tuple[BoardModel, PlayerModel | None] | None:
+        pass
+
+    @abstractmethod
+    def get_winners(self, limit: int, offset: int) -> list[BoardModel]:
+        pass
+
+    @abstractmethod
+    def get_boards(
+        self,
+        limit: int,
+        offset: int,
+        state: BoardState | None,
+        open_seats: bool | None,
+        has_password: bool | None
+    ) -> list[BoardModel]:
+        pass
+
+    @abstractmethod
+    def get_waiting_board(self, public: bool) -> BoardModel | None:
+        pass
+
+    @abstractmethod
+    def delete_board(self, board_id: int) -> int:
+        pass
+
+    @abstractmethod
+    def claim_board(self, board: BoardModel) -> bool:
+        pass
+
+
+class SQLBoardRepository(BoardRepository):
+    """
+    Boards stored in the database.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_board(
+        self,
+        board: schemas.BoardCreate,
+        matchmaking: bool
+    ) -> BoardModel:
+        new_board = BoardModel(
+            **board.dict(exclude={'fleet'}),
+            fleet=dump_fleet(board.fleet),
+            has_password=board.password is not None,
+            matchmaking=matchmaking)
+        self.db.add(new_board)
+        return new_board
+
+    def create_boards(
+        self,
+        board: schemas.BoardCreate,
+        count: int,
+        players_count: int
+    ) -> list[int]:
+        values = {
+            'password': board.password,
+            'has_password': board.password is not None,
+            'width': board.width,
+            'height': board.height,
+            'fleet': dump_fleet(board.fleet),
+            'players_count': players_count}
+        return [
+            board_id
+            for board_id, in insert_many(
+                self.db, BoardModel, [values] * count, BoardModel.id)]
+
+    def get_board(self, board_id: int) -> BoardModel | None:
+        return self.db.query(BoardModel).filter(
+            BoardModel.id == board_id).first()
+
+    def get_board_with_winner(
+        self,
+        board_id: int
+    ) -> tuple[BoardModel, PlayerModel | None] | None:
+        return self.db.query(BoardModel, PlayerModel).outerjoin(
+            PlayerModel, PlayerModel.id == BoardModel.winner_id
+        ).filter(BoardModel.id == board_id).first()
+
+    def get_winners(self, limit: int, offset: int) -> list[BoardModel]:
+        return self.db.query(BoardModel).filter(
+            BoardModel.finished_at.is_not(None)
+        ).order_by(
+            BoardModel.finished_at.desc(),
+            BoardModel.id.desc()
+        ).offset(offset).limit(limit).all()
+
+    def get_boards(
+        self,
+        limit: int,
+        offset: int,
+        state: BoardState | None,
+        open_seats: bool | None,
+        has_password: bool | None
+    ) -> list[BoardModel]:
+        query = self.db.query(BoardModel)
+        if state is not None:
+            query = query.filter(BoardModel.state == state)
+        if has_password is not None:
+            query = query.filter(BoardModel.has_password == has_password)
+        if open_seats is not None:
+            query = query.filter(
+                BoardModel.players_count < 2
+                if open_seats
+                else BoardModel.players_count >= 2)
+        return query.order_by(BoardModel.id).offset(offset).limit(limit).all()
+
+    def get_waiting_board(self, public: bool) -> BoardModel | None:
+        # Filtered and ordered by columns of `ix_boards_lobby` index.
+        query = self.db.query(BoardModel).filter(
+            BoardModel.state == BoardState.preparing,
+            BoardModel.has_password.is_(False),
+            BoardModel.players_count == 1)
+        if not public:
+            query = query.filter(BoardModel.matchmaking.is_(True))
+        return query.order_by(BoardModel.id).first()
+
+    def delete_board(self, board_id: int) -> int:
+        return self.db.query(BoardModel).filter(
+            BoardModel.id == board_id
+        ).delete(synchronize_session=False)
+
+    def claim_board(self, board: BoardModel) -> bool:
+        claimed = self.db.query(BoardModel).filter(
+            BoardModel.id == board.id,
+            BoardModel.version == board.version
+        ).update(
+            {BoardModel.version: BoardModel.version + 1},
+            synchronize_session=False)
+        if claimed:
+            set_committed_value(board, 'version', board.version + 1)
+        return bool(claimed)
+
+
+class BoardRecord(MemoryRecord):
+    """
+    In-memory board, with attributes of `BoardModel`.
+    """
+    __tablename__ = BoardModel.__tablename__
+    __columns__ = {
+        'password': None,
+        'state': BoardState.preparing,
+        'has_password': False,
+        'players_count': 0,
+        'matchmaking': False,
+        'version': 0,
+        'winner_id': None,
+        'finished_at': None,
+        'shots_count': None,
+        'width': DEFAULT_BOARD_SIZE,
+        'height': DEFAULT_BOARD_SIZE,
+        'fleet': dump_fleet(DEFAULT_FLEET)}
+    # Replaces `ix_boards_lobby` index, for matchmaking.
+    __indexes__ = (
+        ('state', 'has_password', 'players_count', 'matchmaking'),)
+
+    @property
+    def players(self) -> list[MemoryRecord]:
+        return self.get_referencing(PlayerModel.__tablename__, 'board_id')
+
+    def get_dependents(self) -> list[MemoryRecord]:
+        return self.players
+
+
+class MemoryBoardRepository(BoardRepository):
+    """
+    Boards stored in process memory.
+    """
+    def __init__(self, db: MemorySession):
+        self.db = db
+        self.boards = db.store.table(BoardRecord.__tablename__)
+
+    def create_board(
+        self,
+        board: schemas.BoardCreate,
+        matchmaking: bool
+    ) -> BoardRecord:
+        new_board = BoardRecord(
+            **board.dict(exclude={'fleet'}),
+            fleet=dump_fleet(board.fleet),
+            has_password=board.password is not None,
+            matchmaking=matchmaking)
+        self.db.add(new_board)
+        return self.db.bind(new_board)
+
+    def create_boards(
+        self,
+        board: schemas.BoardCreate,
+        count: int,
+        players_count: int
+    ) -> list[int]:
+        fleet = dump_fleet(board.fleet)
+        board_ids = list()
+        for _ in range(count):
+            self.db.add(new_board := BoardRecord(
+                password=board.password,
+                has_password=board.password is not None,
+                width=board.width,
+                height=board.height,
+                fleet=fleet,
+                players_count=players_count))
+            board_ids.append(new_board.id)
+        return board_ids
+
+    def get_board(self, board_id: int) -> BoardRecord | None:
+        return self.db.bind(self.boards.get(board_id))
+
+    def get_board_with_winner(
+        self,
+        board_id: int
+    ) -> tuple[BoardRecord, MemoryRecord | None] | None:
+        if (board := self.boards.get(board_id)) is None:
+            return None
+        return self.db.bind((board, board.get_related(
+            PlayerModel.__tablename__, board.winner_id)))
+
+    def get_winners(self, limit: int, offset: int) -> list[BoardRecord]:
+        return self.db.bind(heapq.nlargest(
+            offset + limit,
+            (
+                board
+                for board in self.boards.rows.values()
+                if board.finished_at is not None),
+            key=lambda board: (board.finished_at, board.id))[offset:])
+
+    def get_boards(
+        self,
+        limit: int,
+        offset: int,
+        state: BoardState | None,
+        open_seats: bool | None,
+        has_password: bool | None
+    ) -> list[BoardRecord]:
+        boards = (
+            board
+            for board in self.boards.rows.values()
+            if (state is None or board.state == state)
+            and (has_password is None or board.has_password == has_password)
+            and (
+                open_seats is None
+                or (board.players_count < 2) == open_seats))
+        return self.db.bind(
+            list(itertools.islice(boards, offset, offset + limit)))
+
+    def get_waiting_board(self, public: bool) -> BoardRecord | None:
+        waiting = [
+            self.boards.first(
+                ('state', 'has_password', 'players_count', 'matchmaking'),
+                (BoardState.preparing, False, 1, matchmaking))
+            for matchmaking in ((True, False) if public else (True,))]
+        return self.db.bind(min(
+            (board for board in waiting if board is not None),
+            key=lambda board: board.id,
+            default=None))
+
+    def delete_board(self, board_id: int) -> int:
+        if (board := self.boards.get(board_id)) is None:
+            return 0
+        self.db.delete(board)
+        return 1
+
+    def claim_board(self, board: BoardRecord) -> bool:
+        # Path operations do not interleave, so board could not be changed.
+        board.version += 1
+        return True
+
+
+def get_repository(db: Session | MemorySession) -> BoardRepository:
+    """
+    Returns boards storage backend of given session.
+    """
+    if isinstance(db, MemorySession):
+        return MemoryBoardRepository(db)
+    return SQLBoardRepository(db)
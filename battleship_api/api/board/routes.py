@@ -1,17 +1,28 @@
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    Query,
+    Request,
+    Response,
+    status)
 
-from . import crud, schemas, tags
+from . import crud, funcs, schemas, tags
 from .exceptions import (
     BoardInUseException,
     BoardNotFoundException,
+    BoardsLimitExceededException,
     GameNotFinishedException)
 
 from battleship_api.api.player import schemas as player_schemas
+from battleship_api.api.player.exceptions import (
+    InvalidPlayerAccessTokenException)
+from battleship_api.api.player.jwt import decode_player
 
-from battleship_api.api.ship.funcs import is_ship
-
-from battleship_api.core.database import get_db_session
+from battleship_api.core.database import SESSION_SCOPE_KEY, get_db_session
 from battleship_api.core.exceptions import build_exceptions_dict
+from battleship_api.core.settings import get_app_settings
+from battleship_api.core.single_flight import get_single_flight
 from battleship_api.core.types import BoardState
 
 from sqlalchemy.orm import Session
@@ -19,6 +30,9 @@ from sqlalchemy.orm import Session
 
 router = APIRouter(prefix='/boards')
 
+board_flight = get_single_flight('boards.get_board')
+winner_flight = get_single_flight('boards.get_winner')
+
 
 @router.post(
     '/',
@@ -48,6 +62,41 @@ async def create_board(
     return new_board
 
 
+@router.post(
+    '/bulk',
+    response_model=list[schemas.BoardProvisioned],
+    status_code=status.HTTP_201_CREATED,
+    responses=build_exceptions_dict(BoardsLimitExceededException),
+    tags=[tags.boards_operation['name']])
+async def create_boards(
+    boards: schemas.BoardBulkCreate,
+    db: Session = Depends(get_db_session)
+):
+    """
+    Creates `count` boards with the same, given password and (if
+    `seat_players` is set) assigns two new players to each of them, in single
+    transaction. Used to provision tournaments.
+    \f
+    Params:
+        - boards: Boards creation data.
+        - db: Database session.
+            - Provided automatically by
+                `battleship_api.core.database.get_db_session` dependency
+                during request.
+
+    Raises:
+        - BoardsLimitExceededException: More boards requested than allowed by
+            `bulk_max_boards` setting.
+
+    Returns:
+        Created boards with their players and players access tokens.
+    """
+    max_boards = get_app_settings().bulk_max_boards
+    if boards.count > max_boards:
+        raise BoardsLimitExceededException({'max_boards': max_boards})
+    return funcs.provision_boards(db, boards)
+
+
 @router.get(
     '/',
     response_model=list[schemas.BoardOut],
@@ -56,11 +105,18 @@ async def create_board(
 async def get_boards(
     db: Session = Depends(get_db_session),
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    state: schemas.BoardStateName | None = None,
+    open_seats: bool | None = None,
+    has_password: bool | None = None
 ):
     """
     Retrieves list of boards with lenght limited to `limit` query parameter
     value, starting from `offset` player.
+
+    Boards can be filtered by `state`, by having less than two players
+    assigned (`open_seats`) and by requiring access password
+    (`has_password`).
     \f
     Params:
         - db: Database session.
@@ -71,11 +127,54 @@ async def get_boards(
             - Defaults to: 100.
         - [Optional] offset: Number of boards to skip before retrieve.
             - Defaults to: 0.
+        - [Optional] state: Retrieved boards state name.
+        - [Optional] open_seats: Whether retrieved boards should have less
+            than two players assigned or not.
+        - [Optional] has_password: Whether retrieved boards should require
+            access password or not.
 
     Returns:
         Boards list of `limit` players from `offset` player.
     """
-    return crud.get_boards(db, limit, offset)
+    return crud.get_boards(
+        db,
+        limit,
+        offset,
+        state=BoardState[state.value] if state is not None else None,
+        open_seats=open_seats,
+        has_password=has_password)
+
+
+@router.get(
+    '/winners',
+    response_model=list[schemas.BoardWinner],
+    status_code=status.HTTP_200_OK,
+    tags=[tags.boards_operation['name']])
+async def get_winners(
+    db: Session = Depends(get_db_session),
+    limit: int = 100,
+    offset: int = 0
+):
+    """
+    Retrieves list of finished games results (winner id, finish time and
+    number of shots) with length limited to `limit` query parameter value,
+    starting from `offset` game. The most recently finished games are
+    retrieved first.
+    \f
+    Params:
+        - db: Database session.
+            - Provided automatically by
+                `battleship_api.core.database.get_db_session` dependency
+                during request.
+        - [Optional] limit: Number of results to retrieve.
+            - Defaults to: 100.
+        - [Optional] offset: Number of results to skip before retrieve.
+            - Defaults to: 0.
+
+    Returns:
+        Finished boards list of `limit` results from `offset` result.
+    """
+    return crud.get_winners(db, limit, offset)
 
 
 @router.get(
@@ -84,24 +183,35 @@ async def get_boards(
     status_code=status.HTTP_200_OK,
     tags=[tags.boards_operation['name']],
     responses=build_exceptions_dict(BoardNotFoundException))
-async def get_board(board_id: int, db: Session = Depends(get_db_session)):
+async def get_board(
+    board_id: int,
+    request: Request,
+    db: Session = Depends(get_db_session)
+):
     """
     Retrieves board with given id equal to given `board_id` path parameter.
     \f
     Params:
         - board_id: Retrieving board id
+        - request: Request.
+            - It is provided via FastAPI framework by default.
         - db: Database session.
             - Provided automatically by
                 `battleship_api.core.database.get_db_session` dependency
                 during request.
 
+    Raises:
+        - BoardNotFoundException: Board not found by given id.
+
     Returns:
         Board with given id.
     """
-    board = crud.get_board(db, board_id)
-    if board is None:
-        raise BoardNotFoundException(schemas.BoardSearch(id=board_id))
-    return board
+    if SESSION_SCOPE_KEY in request.scope:
+        # Batch operation reads uncommitted changes of its own batch, which
+        # cannot be shared with other requests.
+        return funcs.get_board(db, board_id)
+    # Concurrent requests of the same board share single query.
+    return await board_flight.do(board_id, funcs.get_board, db, board_id)
 
 
 @router.delete(
@@ -132,9 +242,9 @@ async def delete_board(board_id: int, db: Session = Depends(get_db_session)):
     board = crud.get_board(db, board_id)
     if board is None:
         raise BoardNotFoundException(schemas.BoardSearch(id=board_id))
-    if len(board.players):
+    if board.players_count:
         raise BoardInUseException(schemas.BoardSearch(id=board_id))
-    db.delete(board)
+    crud.delete_board(db, board_id)
     db.commit()
 
 
@@ -147,13 +257,19 @@ async def delete_board(board_id: int, db: Session = Depends(get_db_session)):
         GameNotFinishedException),
     tags=[tags.boards_operation['name']]
 )
-async def get_winner(board_id: int, db: Session = Depends(get_db_session)):
+async def get_winner(
+    board_id: int,
+    request: Request,
+    db: Session = Depends(get_db_session)
+):
     """
     Retrieves players assigned to the given board and returns this one, which
     is winner after finished game.
 
     Params:
         - board_id: Board id
+        - request: Request.
+            - It is provided via FastAPI framework by default.
         - db: Database session.
             - Provided automatically by
                 `battleship_api.core.database.get_db_session` dependency
@@ -167,19 +283,71 @@ async def get_winner(board_id: int, db: Session = Depends(get_db_session)):
     Returns:
         Winner (player) object
     """
-    board = crud.get_board(db, board_id)
-    if board is None:
-        raise BoardNotFoundException(schemas.BoardSearch(id=board_id))
-    if board.state is not BoardState.game_finished:
-        raise GameNotFinishedException(schemas.BoardOut.from_orm(board))
-
-    enemy_ships = board.players[1].ships
-    success_shots = [
-        shot
-        for shot
-        in board.players[0].shots
-        if is_ship(shot.column, shot.row, enemy_ships)]
-
-    if (sum([ship.length for ship in enemy_ships]) == len(success_shots)):
-        return player_schemas.Player.from_orm(board.players[0])
-    return player_schemas.Player.from_orm(board.players[1])
+    if SESSION_SCOPE_KEY in request.scope:
+        # See `get_board`.
+        return funcs.get_winner(db, board_id)
+    # Concurrent requests of the same board's winner share single
+    # computation.
+    return await winner_flight.do(board_id, funcs.get_winner, db, board_id)
+
+
+@router.get(
+    '/{board_id}/snapshot',
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.BoardSnapshot | schemas.BoardSnapshotCompact,
+    responses=build_exceptions_dict(
+        BoardNotFoundException,
+        InvalidPlayerAccessTokenException),
+    tags=[tags.boards_operation['name']])
+async def get_snapshot(
+    board_id: int,
+    x_auth_token: str = Header(...),
+    since: int = 0,
+    snapshot_format: schemas.SnapshotFormat = Query(
+        schemas.SnapshotFormat.full,
+        alias='format'),
+    db: Session = Depends(get_db_session)
+):
+    """
+    Retrieves whole game state seen by authenticated player assigned to the
+    board: board data, players, id of player whose turn it is, winner id,
+    player's own fleet and shots of both players with hit flags.
+
+    Response's `sequence` value passed as `since` query parameter of the next
+    request limits returned shots to the ones created in the meantime.
+
+    With `format=compact` query parameter, fleet and shots are returned as
+    base64 encoded bitmasks of board cells (bit of cell in given column and
+    row has index `(row - 1) * width + column - 1`, where `width` is
+    snapshot's `board.width`, counted from the least significant bit of the
+    first byte).
+    \f
+    Params:
+        - board_id: Board id
+        - x_auth_token: Player validation token.
+        - [Optional] since: Id of the last shot already known to the player.
+            - Defaults to: 0.
+        - [Optional] snapshot_format: Representation of fleet and shots.
+            - Defaults to: full.
+        - db: Database session.
+            - Provided automatically by
+                `battleship_api.core.database.get_db_session` dependency
+                during request.
+
+    Raises:
+        - BoardNotFoundException: Board not found by given id.
+        - InvalidPlayerAccessTokenException: Given player authentication token
+            is invalid or player is not assigned to the board.
+
+    Returns:
+        Board snapshot.
+    """
+    authed = decode_player(x_auth_token)
+    if authed is None or authed.board_id != board_id:
+        raise InvalidPlayerAccessTokenException({"x_auth_token": x_auth_token})
+    snapshot = funcs.get_snapshot(db, board_id, authed.id, since)
+    if snapshot is None:
+        raise InvalidPlayerAccessTokenException({"x_auth_token": x_auth_token})
+    if snapshot_format is schemas.SnapshotFormat.compact:
+        return funcs.get_compact_snapshot(snapshot)
+    return snapshot
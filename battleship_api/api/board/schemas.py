@@ -1,6 +1,19 @@
-from pydantic import BaseModel as BaseSchema, validator
+from pydantic import BaseModel as BaseSchema, Field, conint, validator
 import bcrypt
 
+from datetime import datetime
+from enum import Enum
+
+from battleship_api.api.player import schemas as player_schemas
+from battleship_api.api.ship import schemas as ship_schemas
+from battleship_api.api.shot import schemas as shot_schemas
+
+from battleship_api.core.grid import (
+    DEFAULT_BOARD_SIZE,
+    DEFAULT_FLEET,
+    MAX_BOARD_SIZE,
+    MAX_FLEET_SIZE,
+    load_fleet)
 from battleship_api.core.types import BoardState
 
 
@@ -8,7 +21,31 @@ class BoardSecure(BaseSchema):
     password: str | bytes | None
 
 
-class BoardCreate(BoardSecure):
+class BoardGeometry(BaseSchema):
+    """
+    Board dimensions and lengths of ships every player places on it.
+    """
+    width: int = Field(DEFAULT_BOARD_SIZE, ge=1, le=MAX_BOARD_SIZE)
+    height: int = Field(DEFAULT_BOARD_SIZE, ge=1, le=MAX_BOARD_SIZE)
+    fleet: list[conint(ge=1)] = Field(
+        list(DEFAULT_FLEET), min_items=1, max_items=MAX_FLEET_SIZE)
+
+    @validator('fleet', pre=True)
+    def fleet_loader(cls, fleet):
+        return load_fleet(fleet) if isinstance(fleet, str) else fleet
+
+
+class BoardCreate(BoardSecure, BoardGeometry):
+    @validator('fleet')
+    def fleet_validator(cls, fleet, values):
+        if 'width' not in values or 'height' not in values:
+            return fleet
+        if max(fleet) > max(values['width'], values['height']):
+            raise ValueError("ship does not fit on the board")
+        if sum(fleet) > values['width'] * values['height']:
+            raise ValueError("fleet does not fit on the board")
+        return fleet
+
     @validator('password')
     def password_validator(cls, password):
         if not password:
@@ -19,6 +56,11 @@ class BoardCreate(BoardSecure):
         ).decode('utf-8')
 
 
+class BoardBulkCreate(BoardCreate):
+    count: int = Field(..., ge=1)
+    seat_players: bool = False
+
+
 class BoardSearch(BaseSchema):
     id: int
 
@@ -30,11 +72,87 @@ class BoardState(BaseSchema):
     state: BoardState
 
 
-class BoardOut(BoardSearch, BoardState):
+class BoardOut(BoardSearch, BoardState, BoardGeometry):
+    has_password: bool
+    players_count: int
+
+    class Config:
+        orm_mode = True
+
+
+class BoardWinner(BoardSearch):
+    winner_id: int
+    finished_at: datetime
+    shots_count: int
+
     class Config:
         orm_mode = True
 
 
+class BoardProvisioned(BaseSchema):
+    board: BoardOut
+    players: list[player_schemas.PlayerCredentials]
+
+
+class BoardsLimit(BaseSchema):
+    max_boards: int
+
+
+class BoardSnapshotShot(shot_schemas.Shot):
+    hit: bool
+
+
+class BoardSnapshotBase(BaseSchema):
+    """
+    Game state on board seen by one of its players.
+
+    `sequence` is the highest id of shot created on the board (0 if there is
+    none). Passed back as `since`, it limits next snapshot's shots to the
+    newer ones.
+    """
+    board: BoardOut
+    players: list[player_schemas.Player]
+    turn: int | None
+    winner_id: int | None
+    sequence: int
+
+
+class BoardSnapshot(BoardSnapshotBase):
+    fleet: list[ship_schemas.Ship]
+    own_shots: list[BoardSnapshotShot]
+    enemy_shots: list[BoardSnapshotShot]
+
+
+class BoardSnapshotCompact(BoardSnapshotBase):
+    """
+    Board snapshot with fleet and shots encoded as base64 bitmasks of cells
+    (see `battleship_api.core.grid`).
+    """
+    fleet_grid: str
+    own_shots_grid: str
+    own_hits_grid: str
+    enemy_shots_grid: str
+    enemy_hits_grid: str
+
+
+class SnapshotFormat(str, Enum):
+    """
+    Representation of fleet and shots in board snapshot.
+    """
+    full = 'full'
+    compact = 'compact'
+
+
 class BoardDB(BoardOut, BoardSecure):
     class Config:
         orm_mode = True
+
+
+class BoardStateName(str, Enum):
+    """
+    Names of `battleship_api.core.types.BoardState` members, used to filter
+    boards by state.
+    """
+    preparing = 'preparing'
+    in_game = 'in_game'
+    game_finished = 'game_finished'
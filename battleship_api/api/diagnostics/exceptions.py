@@ -0,0 +1,12 @@
+from fastapi import status
+
+from battleship_api.core.exceptions import BaseAPIException
+
+
+class TracingNotStartedException(BaseAPIException):
+    """
+    API exception raise when memory allocations snapshot is requested, while
+    memory allocations tracing is not started.
+    """
+    code = status.HTTP_409_CONFLICT
+    message = "Memory allocations tracing is not started."
@@ -0,0 +1,125 @@
+from fastapi import APIRouter, status
+import tracemalloc
+
+from . import schemas, tags
+from .exceptions import TracingNotStartedException
+
+from battleship_api.core import diagnostics
+from battleship_api.core.exceptions import build_exceptions_dict
+
+
+router = APIRouter(prefix='/diagnostics')
+
+
+def get_tracing_status() -> schemas.TracingStatus:
+    """
+    Returns current `tracemalloc` tracing status.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    return schemas.TracingStatus(
+        tracing=tracemalloc.is_tracing(),
+        frames=tracemalloc.get_traceback_limit(),
+        current=current,
+        peak=peak)
+
+
+@router.get(
+    '/memory',
+    response_model=schemas.Memory,
+    status_code=status.HTTP_200_OK,
+    tags=[tags.diagnostics_operation['name']])
+async def get_memory():
+    """
+    Retrieves process memory usage and number of entries held by each internal
+    application cache and buffer.
+    \f
+    Returns:
+        Memory usage report.
+    """
+    return schemas.Memory(
+        max_rss=diagnostics.get_max_rss(),
+        tracing=get_tracing_status(),
+        caches=diagnostics.get_caches_sizes())
+
+
+@router.post(
+    '/tracemalloc/start',
+    response_model=schemas.TracingStatus,
+    status_code=status.HTTP_200_OK,
+    tags=[tags.diagnostics_operation['name']])
+async def start_tracing(body: schemas.TracingStart | None = None):
+    """
+    Starts (or restarts) tracing memory allocations.
+    \f
+    Params:
+        - [Optional] body: Tracing parameters.
+
+    Returns:
+        Tracing status.
+    """
+    diagnostics.start_tracing((body or schemas.TracingStart()).frames)
+    return get_tracing_status()
+
+
+@router.post(
+    '/tracemalloc/stop',
+    response_model=schemas.TracingStatus,
+    status_code=status.HTTP_200_OK,
+    tags=[tags.diagnostics_operation['name']])
+async def stop_tracing():
+    """
+    Stops tracing memory allocations and drops last taken snapshot.
+    \f
+    Returns:
+        Tracing status.
+    """
+    diagnostics.stop_tracing()
+    return get_tracing_status()
+
+
+@router.post(
+    '/tracemalloc/snapshots',
+    response_model=schemas.Snapshot,
+    status_code=status.HTTP_201_CREATED,
+    responses=build_exceptions_dict(TracingNotStartedException),
+    tags=[tags.diagnostics_operation['name']])
+async def take_snapshot(
+    limit: int = 10,
+    key_type: schemas.SnapshotKeyType = schemas.SnapshotKeyType.lineno
+):
+    """
+    Takes memory allocations snapshot and returns top `limit` allocation sites
+    and top `limit` differences against previously taken snapshot.
+    \f
+    Params:
+        - [Optional] limit: Number of allocation sites to return.
+            - Defaults to: 10.
+        - [Optional] key_type: Allocation sites grouping key.
+            - Defaults to: `lineno`.
+
+    Raises:
+        - TracingNotStartedException: Memory allocations tracing is not
+            started.
+
+    Returns:
+        Top allocation sites and their differences.
+    """
+    if not tracemalloc.is_tracing():
+        raise TracingNotStartedException()
+
+    top, diff = diagnostics.take_snapshot(limit, key_type.value)
+    return schemas.Snapshot(
+        top=[
+            schemas.AllocationSite(
+                traceback=stat.traceback.format(),
+                size=stat.size,
+                count=stat.count)
+            for stat in top],
+        diff=[
+            schemas.AllocationSiteDiff(
+                traceback=stat.traceback.format(),
+                size=stat.size,
+                count=stat.count,
+                size_diff=stat.size_diff,
+                count_diff=stat.count_diff)
+            for stat in diff])
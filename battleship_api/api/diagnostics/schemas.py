@@ -0,0 +1,42 @@
+from pydantic import BaseModel as BaseSchema, Field
+
+from enum import Enum
+
+
+class SnapshotKeyType(str, Enum):
+    filename = 'filename'
+    lineno = 'lineno'
+    traceback = 'traceback'
+
+
+class TracingStart(BaseSchema):
+    frames: int = Field(1, ge=1, le=100)
+
+
+class TracingStatus(BaseSchema):
+    tracing: bool
+    frames: int
+    current: int
+    peak: int
+
+
+class AllocationSite(BaseSchema):
+    traceback: list[str]
+    size: int
+    count: int
+
+
+class AllocationSiteDiff(AllocationSite):
+    size_diff: int
+    count_diff: int
+
+
+class Snapshot(BaseSchema):
+    top: list[AllocationSite]
+    diff: list[AllocationSiteDiff]
+
+
+class Memory(BaseSchema):
+    max_rss: int
+    tracing: TracingStatus
+    caches: dict[str, int]
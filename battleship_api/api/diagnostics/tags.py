@@ -0,0 +1,10 @@
+diagnostics_operation = {
+    'name': 'diagnostics-operation',
+    'description':
+        "Application memory diagnostics.<br>"
+        "Available only in debug mode."}
+
+
+all_tags = [
+    diagnostics_operation,
+]
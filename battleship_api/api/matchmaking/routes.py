@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Body, Depends, Response, status
+
+from . import schemas, tags
+
+from battleship_api.api.board import crud as board_crud
+from battleship_api.api.board import schemas as board_schemas
+from battleship_api.api.board.exceptions import (
+    BoardConcurrentModificationException)
+
+from battleship_api.api.player import crud as player_crud
+from battleship_api.api.player import jwt as player_jwt
+from battleship_api.api.player import schemas as player_schemas
+
+from battleship_api.core.database import get_db_session
+from battleship_api.core.exceptions import build_exceptions_dict
+
+from sqlalchemy.orm import Session
+
+
+router = APIRouter(prefix='/matchmaking')
+
+
+@router.post(
+    '',
+    response_model=player_schemas.Player,
+    status_code=status.HTTP_201_CREATED,
+    responses=build_exceptions_dict(BoardConcurrentModificationException),
+    tags=[tags.matchmaking_operation['name']])
+async def join_game(
+    response: Response,
+    body: schemas.MatchmakingRequest = Body(schemas.MatchmakingRequest()),
+    db: Session = Depends(get_db_session)
+):
+    """
+    Creates player assigned to the oldest password-less board with one player
+    waiting for an opponent. If there is no such board, creates new one,
+    which will wait for the next player.
+
+    If `public` is false, player is assigned only to boards created by
+    matchmaking.
+    \f
+    Params:
+        - response: Response object that will be modified during request
+        processing.
+            - It is provided via FastAPI framework by default.
+        - [Optional] body: Matchmaking options.
+        - db: Database session.
+            - Provided automatically by
+                `battleship_api.core.database.get_db_session` dependency
+                during request.
+
+    Raises:
+        - BoardConcurrentModificationException: Waiting board was joined by
+            another player during request processing.
+
+    Returns:
+        Created player instance data and player access token via
+        `X-Auth-Token` header.
+    """
+    board = board_crud.get_waiting_board(db, body.public)
+    if board is None:
+        board = board_crud.create_board(
+            db, board_schemas.BoardCreate(password=None), matchmaking=True)
+    elif not board_crud.claim_board(db, board):
+        board_id = board.id
+        db.rollback()
+        raise BoardConcurrentModificationException({'id': board_id})
+
+    player = player_crud.create_player(db, board)
+    db.commit()
+    db.refresh(player)
+
+    token = player_jwt.encode_player(player_schemas.Player.from_orm(player))
+    response.headers['X-Auth-Token'] = token
+    return player
@@ -0,0 +1,5 @@
+from pydantic import BaseModel as BaseSchema
+
+
+class MatchmakingRequest(BaseSchema):
+    public: bool = True
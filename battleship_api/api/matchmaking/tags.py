@@ -0,0 +1,11 @@
+matchmaking_operation = {
+    'name': 'matchmaking-operation',
+    'description':
+        "Matchmaking of players.<br>"
+        "Joins player to the board waiting for an opponent or creates new"
+        " one."}
+
+
+all_tags = [
+    matchmaking_operation,
+]
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
 from .models import Player as PlayerModel
+from .repository import get_repository
 
 from battleship_api.api.board.models import Board as BoardModel
 
@@ -20,8 +21,32 @@ def create_player(
     Returns:
         New player database object instance.
     """
-    board.players.append(player := PlayerModel())
-    return player
+    return get_repository(db).create_player(board)
+
+
+def create_boards_players(
+    db: Session,
+    board_ids: list[int],
+    players_per_board: int = 2
+) -> list[tuple[int, int]]:
+    """
+    Creates given number of players assigned to each of given boards, with
+    set based inserts (see `battleship_api.core.database.insert_many`).
+    Boards players counters are not changed.
+
+    Params:
+        - db: Database session
+        - board_ids: Boards ids
+        - [Optional] players_per_board: Number of players assigned to each
+            board
+            - Defaults to: 2
+
+    Returns:
+        Tuples of created player id and board id, ordered by board id and
+        player id.
+    """
+    return get_repository(db).create_boards_players(
+        board_ids, players_per_board)
 
 
 def get_player(db: Session, player_id: int) -> PlayerModel | None:
@@ -35,7 +60,7 @@ def get_player(db: Session, player_id: int) -> PlayerModel | None:
     Returns:
         Player database object instance.
     """
-    return db.query(PlayerModel).filter(PlayerModel.id == player_id).first()
+    return get_repository(db).get_player(player_id)
 
 
 def get_players(
@@ -54,4 +79,35 @@ def get_players(
     Returns:
         Player list of 'limit' elements starting from 'offset' database.s
     """
-    return db.query(PlayerModel).offset(offset).limit(limit).all()
+    return get_repository(db).get_players(limit, offset)
+
+
+def get_opponent(db: Session, player: PlayerModel) -> PlayerModel | None:
+    """
+    Returns the other player assigned to the same board as given player.
+
+    Params:
+        - db: Database session
+        - player: Player database object instance
+
+    Returns:
+        Opponent database object instance or None if player has no opponent
+        yet.
+    """
+    return get_repository(db).get_opponent(player)
+
+
+def delete_player(db: Session, player: PlayerModel) -> int:
+    """
+    Deletes given player with single statement, without loading its
+    relationships, and decrements board's players counter. Player's ships and
+    shots are removed by the database (`ON DELETE CASCADE`).
+
+    Params:
+        - db: Database session
+        - player: Player database object instance
+
+    Returns:
+        Number of deleted players.
+    """
+    return get_repository(db).delete_player(player)
@@ -43,3 +43,15 @@ def decode_player(token: str) -> schemas.Player:
                 DECODE_ALGORITHMS))
     except jwt.JWTError:
         return None
+
+
+def get_player_id(token: str) -> int | None:
+    """
+    Returns id of player encoded into JWT (JSON Web Token) or None if it's
+    invalid.
+
+    Params:
+        token: Player's JWT token string
+    """
+    player = decode_player(token)
+    return player.id if player is not None else None
@@ -11,7 +11,7 @@ class Player(BaseModel):
     id = Column(Integer, primary_key=True, index=True)
     board_id = Column(
         Integer,
-        ForeignKey(f'{Board.__tablename__}.id'),
+        ForeignKey(f'{Board.__tablename__}.id', ondelete='CASCADE'),
         index=True)
     ready = Column(Boolean, default=False)
 
@@ -21,8 +21,10 @@ class Player(BaseModel):
     ships = relationship(
         'battleship_api.api.ship.models.Ship',
         cascade="all, delete",
+        passive_deletes=True,
         back_populates='owner')
     shots = relationship(
         'battleship_api.api.shot.models.Shot',
         cascade="all, delete",
+        passive_deletes=True,
         back_populates='player')
@@ -0,0 +1,189 @@
+"""
+Players storage backends used by `battleship_api.api.player.crud`: SQLAlchemy
+(database) and in-memory (see `battleship_api.core.memory`) one.
+"""
+import itertools
+
+from abc import ABC, abstractmethod
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from .models import Player as PlayerModel
+
+from battleship_api.api.board.models import Board as BoardModel
+
+from battleship_api.core.database import insert_many
+from battleship_api.core.memory import MemoryRecord, MemorySession
+
+
+class PlayerRepository(ABC):
+    """
+    Interface of players storage. Methods are described by functions of
+    `battleship_api.api.player.crud` calling them.
+    """
+    @abstractmethod
+    def create_player(self, board: BoardModel) -> PlayerModel:
+        pass
+
+    @abstractmethod
+    def create_boards_players(
+        self,
+        board_ids: list[int],
+        players_per_board: int
+    ) -> list[tuple[int, int]]:
+        pass
+
+    @abstractmethod
+    def get_player(self, player_id: int) -> PlayerModel | None:
+        pass
+
+    @abstractmethod
+    def get_players(self, limit: int, offset: int) -> list[PlayerModel]:
+        pass
+
+    @abstractmethod
+    def get_opponent(self, player: PlayerModel) -> PlayerModel | None:
+        pass
+
+    @abstractmethod
+    def delete_player(self, player: PlayerModel) -> int:
+        pass
+
+
+class SQLPlayerRepository(PlayerRepository):
+    """
+    Players stored in the database.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_player(self, board: BoardModel) -> PlayerModel:
+        # Assigning board (instead of appending to `board.players`) does not
+        # load board's players collection.
+        self.db.add(player := PlayerModel(board=board))
+        # Counter of already stored board is incremented by the database, so
+        # concurrent increments are not lost.
+        board.players_count = (
+            BoardModel.players_count + 1
+            if inspect(board).persistent
+            else (board.players_count or 0) + 1)
+        return player
+
+    def create_boards_players(
+        self,
+        board_ids: list[int],
+        players_per_board: int
+    ) -> list[tuple[int, int]]:
+        rows = insert_many(
+            self.db,
+            PlayerModel,
+            [
+                {'board_id': board_id, 'ready': False}
+                for board_id in board_ids
+                for _ in range(players_per_board)],
+            PlayerModel.id,
+            PlayerModel.board_id)
+        return sorted(rows, key=lambda row: (row[1], row[0]))
+
+    def get_player(self, player_id: int) -> PlayerModel | None:
+        return self.db.query(PlayerModel).filter(
+            PlayerModel.id == player_id).first()
+
+    def get_players(self, limit: int, offset: int) -> list[PlayerModel]:
+        return self.db.query(PlayerModel).offset(offset).limit(limit).all()
+
+    def get_opponent(self, player: PlayerModel) -> PlayerModel | None:
+        return self.db.query(PlayerModel).filter(
+            PlayerModel.board_id == player.board_id,
+            PlayerModel.id != player.id
+        ).first()
+
+    def delete_player(self, player: PlayerModel) -> int:
+        deleted = self.db.query(PlayerModel).filter(
+            PlayerModel.id == player.id
+        ).delete(synchronize_session=False)
+        if deleted:
+            player.board.players_count = BoardModel.players_count - deleted
+        return deleted
+
+
+class PlayerRecord(MemoryRecord):
+    """
+    In-memory player, with attributes of `PlayerModel`.
+    """
+    __tablename__ = PlayerModel.__tablename__
+    __columns__ = {'board_id': None, 'ready': False}
+    __indexes__ = ('board_id',)
+
+    @property
+    def board(self) -> MemoryRecord | None:
+        return self.get_related(BoardModel.__tablename__, self.board_id)
+
+    @property
+    def ships(self) -> list[MemoryRecord]:
+        return self.get_referencing('ships', 'owner_id')
+
+    @property
+    def shots(self) -> list[MemoryRecord]:
+        return self.get_referencing('shots', 'player_id')
+
+    def get_dependents(self) -> list[MemoryRecord]:
+        return self.ships + self.shots
+
+
+class MemoryPlayerRepository(PlayerRepository):
+    """
+    Players stored in process memory.
+    """
+    def __init__(self, db: MemorySession):
+        self.db = db
+        self.players = db.store.table(PlayerRecord.__tablename__)
+
+    def create_player(self, board: MemoryRecord) -> PlayerRecord:
+        self.db.add(player := PlayerRecord(board_id=board.id))
+        board.players_count += 1
+        return self.db.bind(player)
+
+    def create_boards_players(
+        self,
+        board_ids: list[int],
+        players_per_board: int
+    ) -> list[tuple[int, int]]:
+        rows = list()
+        for board_id in sorted(board_ids):
+            for _ in range(players_per_board):
+                self.db.add(player := PlayerRecord(board_id=board_id))
+                rows.append((player.id, board_id))
+        return rows
+
+    def get_player(self, player_id: int) -> PlayerRecord | None:
+        return self.db.bind(self.players.get(player_id))
+
+    def get_players(self, limit: int, offset: int) -> list[PlayerRecord]:
+        return self.db.bind(list(itertools.islice(
+            self.players.rows.values(), offset, offset + limit)))
+
+    def get_opponent(self, player: PlayerRecord) -> PlayerRecord | None:
+        return self.db.bind(next(
+            (
+                opponent
+                for opponent in self.players.find('board_id', player.board_id)
+                if opponent.id != player.id),
+            None))
+
+    def delete_player(self, player: PlayerRecord) -> int:
+        if player.table is None:
+            return 0
+        player.board.players_count -= 1
+        self.db.delete(player)
+        return 1
+
+
+def get_repository(db: Session | MemorySession) -> PlayerRepository:
+    """
+    Returns players storage backend of given session.
+    """
+    if isinstance(db, MemorySession):
+        return MemoryPlayerRepository(db)
+    return SQLPlayerRepository(db)
@@ -13,20 +13,23 @@ from .exceptions import (
     MaximumPlayersNumberException,
     PlayerNotFoundException,
     PlayerStatusChangeConflictException)
-from .models import Player as PlayerModel
 
 from battleship_api.api.board import crud as board_crud
 from battleship_api.api.board import schemas as board_schemas
 from battleship_api.api.board.exceptions import (
+    BoardConcurrentModificationException,
     BoardNotFoundException,
     GameFinishedException,
     InvalidBoardPasswordException,
     MissingBoardPasswordException)
 
-from battleship_api.api.shot.models import Shot as ShotModel
+from battleship_api.api.ship import crud as ship_crud
+
+from battleship_api.api.shot import crud as shot_crud
 
 from battleship_api.core.database import get_db_session
 from battleship_api.core.exceptions import build_exceptions_dict
+from battleship_api.core.grid import load_fleet
 from battleship_api.core.types import BoardState
 
 from sqlalchemy.orm import Session
@@ -71,6 +74,7 @@ async def get_players(
     status_code=status.HTTP_201_CREATED,
     tags=[tags.players_operation['name']],
     responses=build_exceptions_dict(
+        BoardConcurrentModificationException,
         BoardNotFoundException,
         InvalidBoardPasswordException,
         MaximumPlayersNumberException,
@@ -118,9 +122,12 @@ async def create_player(
             board.password.encode('utf-8')
         ):
             raise InvalidBoardPasswordException()
-    if not len(board.players) < 2:
+    if not board.players_count < 2:
         raise MaximumPlayersNumberException({'id': board.id})
 
+    if not board_crud.claim_board(db, board):
+        db.rollback()
+        raise BoardConcurrentModificationException({'id': board_id})
     player = crud.create_player(db, board)
     db.commit()
     db.refresh(player)
@@ -161,6 +168,7 @@ async def get_player(player_id: int, db: Session = Depends(get_db_session)):
     status_code=status.HTTP_204_NO_CONTENT,
     response_class=Response,
     responses=build_exceptions_dict(
+        BoardConcurrentModificationException,
         GameFinishedException,
         InvalidPlayerAccessTokenException,
         PlayerNotFoundException),
@@ -186,6 +194,8 @@ async def delete_player(
                 during request.
 
     Raises:
+        - BoardConcurrentModificationException: Board was modified by another
+            request during validation.
         - GameFinishedException: Board status is "finished" and player cannot
             be deleted.
         - InvalidPlayerAccessTokenException: Given player authentication token
@@ -203,16 +213,17 @@ async def delete_player(
         raise GameFinishedException(
             board_schemas.BoardSearch.from_orm(player.board))
 
-    player.board.state = BoardState.preparing
-    enemy_player_id = db.query(PlayerModel.id).filter(
-        PlayerModel.id != authed.id,
-        PlayerModel.board_id == authed.board_id
-    ).scalar()
-    shots_to_delete = db.query(ShotModel).filter(
-        ShotModel.player_id == enemy_player_id).all()
-    for shot in shots_to_delete:
-        db.delete(shot)
-    db.delete(player)
+    board_id = player.board_id
+    if not board_crud.claim_board(db, player.board):
+        db.rollback()
+        raise BoardConcurrentModificationException({'id': board_id})
+    board_crud.reset_game(player.board)
+    # Set-based deletes keep number of statements independent from number of
+    # shots and ships. Ships are deleted explicitly, for databases created
+    # before foreign keys got `ON DELETE CASCADE` action.
+    shot_crud.delete_board_shots(db, board_id)
+    ship_crud.delete_owner_ships(db, player.id)
+    crud.delete_player(db, player)
     db.commit()
 
 
@@ -221,6 +232,7 @@ async def delete_player(
     status_code=status.HTTP_200_OK,
     response_model=schemas.Player,
     responses=build_exceptions_dict(
+        BoardConcurrentModificationException,
         InvalidPlayerAccessTokenException,
         PlayerNotFoundException,
         PlayerStatusChangeConflictException),
@@ -239,7 +251,7 @@ async def update_player_status(
     board status to "in game".
 
     Cannot update player status if board status is not "preparing" or player
-    has not assigned 4 ships.
+    has not placed all ships of board fleet.
     \f
     Params:
         - player_id: Player id
@@ -252,12 +264,14 @@ async def update_player_status(
                 during request.
 
     Raises:
+        - BoardConcurrentModificationException: Board was modified by another
+            request during validation.
         - InvalidPlayerAccessTokenException: Given player authentication token
             is invalid.
         - PlayerNotFoundException: Player not found by given id.
         - PlayerStatusChangeConflictException: Player status cannot be updated
-            because board status is not "preparing" or player has not 4 ships
-            assigned.
+            because board status is not "preparing" or player has not placed
+            all ships of board fleet.
 
     Returns:
         Updated player database object.
@@ -273,21 +287,27 @@ async def update_player_status(
 
     if (
         player.board.state != BoardState.preparing
-        or (new_status and len(player.ships) != 4)
+        or (
+            new_status
+            and ship_crud.get_owner_ships_count(db, player.id)
+            != len(load_fleet(player.board.fleet)))
     ):
         raise PlayerStatusChangeConflictException(
             schemas.PlayerSearch.from_orm(player))
 
+    # Other player's ready status checked below could be changed in the
+    # meantime otherwise.
+    if not board_crud.claim_board(db, player.board):
+        db.rollback()
+        raise BoardConcurrentModificationException(
+            board_schemas.BoardSearch(id=player.board_id))
+
     player.ready = new_status
 
-    if (
-        player.ready
-        and db.query(PlayerModel.ready).filter(
-            PlayerModel.board_id == player.board_id,
-            PlayerModel.id != player.id
-        ).scalar()
-    ):
-        player.board.state = BoardState.in_game
+    if player.ready:
+        opponent = crud.get_opponent(db, player)
+        if opponent is not None and opponent.ready:
+            player.board.state = BoardState.in_game
 
     db.commit()
     return player
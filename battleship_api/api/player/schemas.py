@@ -23,3 +23,7 @@ class PlayerToken(PlayerBase, PlayerSearch):
 class Player(PlayerBase, PlayerSearch, PlayerStatus):
     class Config:
         orm_mode = True
+
+
+class PlayerCredentials(Player):
+    token: str
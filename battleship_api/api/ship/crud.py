@@ -1,6 +1,6 @@
 from .schemas import ShipCreate as ShipCreateSchema
 from .models import Ship as ShipModel
-from battleship_api.api.player.models import Player as PlayerModel
+from .repository import get_repository
 
 from sqlalchemy.orm import Session
 
@@ -22,8 +22,7 @@ def create_ship(
     Returns:
         New ship database object instance.
     """
-    db.add(new_ship := ShipModel(**ship.dict()))
-    return new_ship
+    return get_repository(db).create_ship(ship)
 
 
 def get_ship(db: Session, ship_id: int) -> ShipModel | None:
@@ -37,7 +36,7 @@ def get_ship(db: Session, ship_id: int) -> ShipModel | None:
     Returns:
         Ship database object instance
     """
-    return db.query(ShipModel).filter(ShipModel.id == ship_id).first()
+    return get_repository(db).get_ship(ship_id)
 
 
 def get_ships(db: Session, limit: int, offset: int) -> list[ShipModel]:
@@ -52,4 +51,83 @@ def get_ships(db: Session, limit: int, offset: int) -> list[ShipModel]:
     Returns:
         Ship list of `limit` elements starting from `offset` ship.
     """
-    return db.query(ShipModel).offset(offset).limit(limit).all()
+    return get_repository(db).get_ships(limit, offset)
+
+
+def get_owner_ships_count(db: Session, owner_id: int) -> int:
+    """
+    Returns number of ships of given owner (player), without loading them.
+
+    Params:
+        - db: Database session
+        - owner_id: Ships owner (player) id
+
+    Returns:
+        Number of owner's ships.
+    """
+    return get_repository(db).get_owner_ships_count(owner_id)
+
+
+def get_owner_ships_counts(db: Session, owner_id: int) -> dict[int, int]:
+    """
+    Returns numbers of ships of given owner (player) by their length, with
+    single grouping query, without loading them.
+
+    Params:
+        - db: Database session
+        - owner_id: Ships owner (player) id
+
+    Returns:
+        Dictionary of ships numbers by ships lengths.
+    """
+    return get_repository(db).get_owner_ships_counts(owner_id)
+
+
+def ship_collides(
+    db: Session,
+    ship: ShipCreateSchema,
+    max_length: int
+) -> bool:
+    """
+    Checks if given ship collides with any ship of its owner, with single
+    query matched by ships location indexes, without loading the fleet.
+
+    Params:
+        - db: Database session
+        - ship: New ship data
+        - max_length: Length of the longest ship on the board (limits range of
+            ships starts checked before the new ship)
+
+    Returns:
+        True if ship collides with any of owner's ships, otherwise False.
+    """
+    return get_repository(db).ship_collides(ship, max_length)
+
+
+def delete_owner_ships(db: Session, owner_id: int) -> int:
+    """
+    Deletes all ships of given owner (player) with single statement, without
+    loading them.
+
+    Params:
+        - db: Database session
+        - owner_id: Ships owner (player) id
+
+    Returns:
+        Number of deleted ships.
+    """
+    return get_repository(db).delete_owner_ships(owner_id)
+
+
+def get_owners_ships(db: Session, owner_ids: list[int]) -> list[ShipModel]:
+    """
+    Returns ships of all given players with single query.
+
+    Params:
+        - db: Database session
+        - owner_ids: Players ids
+
+    Returns:
+        Ship list ordered by id.
+    """
+    return get_repository(db).get_owners_ships(owner_ids)
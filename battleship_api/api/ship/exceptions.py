@@ -8,15 +8,28 @@ class ShipCreationConflictException(BaseAPIException):
     """
     API exception raise when ship cannot be created, due to detected conflict.
     Conflict may occure when player tries to create a new ship that collides
-    with any existing or is the same length.
+    with any existing or all ships of its length in board fleet are already
+    placed.
 
     `battleship_api.api.ship.schemas.ShipCreate` data must be provided,
     when initialized.
     """
     code = status.HTTP_409_CONFLICT
-    message = ("Ship creation conflict detected. Ship may have same length or"
-               " it's position collides with one of already existing"
-               " ships.")
+    message = ("Ship creation conflict detected. All ships of its length may"
+               " be already placed or it's position collides with one of"
+               " already existing ships.")
+    schema = schemas.ShipCreate
+
+
+class ShipOutOfBoardException(BaseAPIException):
+    """
+    API exception raise when ship does not fit on its owner's board.
+
+    `battleship_api.api.ship.schemas.ShipCreate` data must be provided,
+    when initialized.
+    """
+    code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    message = "Ship does not fit on the board."
     schema = schemas.ShipCreate
 
 
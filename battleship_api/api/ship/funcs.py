@@ -1,3 +1,7 @@
+import bisect
+
+from typing import Iterable, Mapping
+
 from . import schemas
 from .models import Ship as ShipModel
 
@@ -26,6 +30,25 @@ def get_ship_cords(
         Point(x=ship.column, y=ship.row+ship.length-1))
 
 
+def get_ship_cells(
+    ship: schemas.ShipLocation | ShipModel
+) -> list[tuple[int, int]]:
+    """
+    Returns all cells (column, row) taken by given ship.
+
+    Params:
+        - ship: Object containing ship location
+
+    Returns:
+        List of cells from ship start to its end.
+    """
+    ship_start, ship_end = get_ship_cords(ship)
+    return [
+        (column, row)
+        for column in range(ship_start.x, ship_end.x + 1)
+        for row in range(ship_start.y, ship_end.y + 1)]
+
+
 def is_ship(
     column: int,
     row: int,
@@ -82,21 +105,119 @@ def ships_collides(
         max(start_rows) <= min(end_rows))
 
 
-def ships_conflicts(
-    first: schemas.ShipCreate | ShipModel,
-    second: schemas.ShipCreate | ShipModel
-):
+def is_on_board(
+    ship: schemas.ShipLocation | ShipModel,
+    width: int,
+    height: int
+) -> bool:
     """
-    Checks if given ship has same length as second one or their positions
-    collides with each other. Returns True if any of that conditions is met,
-    otherwise False.
+    Checks if given ship fits entirely on board of given dimensions.
 
     Params:
-        - first: First ship
-        - second: Second ship
+        - ship: Object containing ship location
+        - width: Board width (number of columns)
+        - height: Board height (number of rows)
+
+    Returns:
+        True if ship end is inside the board, otherwise False.
+    """
+    _, ship_end = get_ship_cords(ship)
+    return ship_end.x <= width and ship_end.y <= height
+
+
+def fleet_allows(
+    length: int,
+    ships_counts: Mapping[int, int],
+    fleet: list[int]
+) -> bool:
+    """
+    Checks if player, who placed given numbers of ships, can place another
+    ship of given length, according to board fleet.
+
+    Params:
+        - length: Length of new ship
+        - ships_counts: Numbers of ships already placed by player, by length
+            (see `battleship_api.api.ship.crud.get_owner_ships_counts`)
+        - fleet: Lengths of ships every player places on the board
 
     Returns:
-        Returns True if ships have the same length or their positions collides
-        with each other. Otherwise False.
+        True if player placed less ships of given length than fleet contains,
+        otherwise False.
+    """
+    return ships_counts.get(length, 0) < fleet.count(length)
+
+
+class ShipIndex:
+    """
+    Spatial index of ships locations, answering which ship (if any) takes
+    given cell in logarithmic time.
+
+    Horizontal ships are kept in per-row interval maps and vertical ones in
+    per-column maps. Ships placed on the same line do not collide, so their
+    intervals are disjoint and the only ship which can take given cell is the
+    one starting last before it.
     """
-    return first.length == second.length or ships_collides(first, second)
+    def __init__(self, ships: Iterable[schemas.ShipLocation | ShipModel] = ()):
+        # Lines (rows or columns) mapped to sorted ships starts and ships.
+        # Ships are added in order of their starts, so they are appended.
+        self.rows: dict[int, tuple[list[int], list]] = dict()
+        self.columns: dict[int, tuple[list[int], list]] = dict()
+        for ship in sorted(ships, key=lambda ship: (ship.row, ship.column)):
+            self.add(ship)
+
+    def add(self, ship: schemas.ShipLocation | ShipModel):
+        """
+        Adds ship to the index. Ship should not collide with indexed ones.
+        """
+        if ship.orientation == Orientation.horizontal:
+            lines, line, start = self.rows, ship.row, ship.column
+        else:
+            lines, line, start = self.columns, ship.column, ship.row
+        starts, ships = lines.setdefault(line, ([], []))
+        if not starts or starts[-1] < start:
+            starts.append(start)
+            ships.append(ship)
+            return
+        position = bisect.bisect(starts, start)
+        starts.insert(position, start)
+        ships.insert(position, ship)
+
+    @staticmethod
+    def find(
+        line: tuple[list[int], list] | None,
+        position: int
+    ) -> schemas.ShipLocation | ShipModel | None:
+        if line is None:
+            return None
+        starts, ships = line
+        index = bisect.bisect(starts, position) - 1
+        if index >= 0 and position < starts[index] + ships[index].length:
+            return ships[index]
+        return None
+
+    def get_ship(
+        self,
+        column: int,
+        row: int
+    ) -> schemas.ShipLocation | ShipModel | None:
+        """
+        Returns indexed ship taking cell at given column and row or None if
+        there is no such ship.
+        """
+        ship = self.find(self.rows.get(row), column)
+        if ship is None:
+            ship = self.find(self.columns.get(column), row)
+        return ship
+
+    def is_ship(self, column: int, row: int) -> bool:
+        """
+        Checks if any indexed ship takes cell at given column and row.
+        """
+        return self.get_ship(column, row) is not None
+
+    def collides(self, ship: schemas.ShipLocation | ShipModel) -> bool:
+        """
+        Checks if given ship collides with any indexed ship.
+        """
+        return any(
+            self.is_ship(column, row) for column, row in get_ship_cells(ship))
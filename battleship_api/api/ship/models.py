@@ -1,4 +1,4 @@
-from sqlalchemy.schema import Column
+from sqlalchemy.schema import Column, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy import Enum, ForeignKey, Integer
 
@@ -9,11 +9,25 @@ from battleship_api.api.player.models import Player
 
 class Ship(BaseModel):
     __tablename__ = 'ships'
+    # Allow to find ships taking given cell (horizontal ones by row, vertical
+    # ones by column) without scanning whole owner's fleet (see
+    # `battleship_api.api.shot.repository.SQLShotRepository
+    # .get_hit_condition` and `battleship_api.api.ship.repository
+    # .SQLShipRepository.get_collision_condition`).
+    __table_args__ = (
+        Index(
+            'ix_ships_owner_rows', 'owner_id', 'orientation', 'row', 'column'),
+        Index(
+            'ix_ships_owner_columns',
+            'owner_id',
+            'orientation',
+            'column',
+            'row'))
 
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(
         Integer,
-        ForeignKey(f'{Player.__tablename__}.id'),
+        ForeignKey(f'{Player.__tablename__}.id', ondelete='CASCADE'),
         index=True)
     length = Column(Integer)
     column = Column(Integer, index=True)
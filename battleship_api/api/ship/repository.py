@@ -0,0 +1,239 @@
+"""
+Ships storage backends used by `battleship_api.api.ship.crud`: SQLAlchemy
+(database) and in-memory (see `battleship_api.core.memory`) one.
+"""
+import collections
+import heapq
+import itertools
+
+from abc import ABC, abstractmethod
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from .funcs import get_ship_cords, ships_collides
+from .models import Ship as ShipModel
+from .schemas import ShipCreate as ShipCreateSchema
+
+from battleship_api.api.player.models import Player as PlayerModel
+
+from battleship_api.core.memory import MemoryRecord, MemorySession
+from battleship_api.core.types import Orientation
+
+
+class ShipRepository(ABC):
+    """
+    Interface of ships storage. Methods are described by functions of
+    `battleship_api.api.ship.crud` calling them.
+    """
+    @abstractmethod
+    def create_ship(self, ship: ShipCreateSchema) -> ShipModel:
+        pass
+
+    @abstractmethod
+    def get_ship(self, ship_id: int) -> ShipModel | None:
+        pass
+
+    @abstractmethod
+    def get_ships(self, limit: int, offset: int) -> list[ShipModel]:
+        pass
+
+    @abstractmethod
+    def get_owner_ships_count(self, owner_id: int) -> int:
+        pass
+
+    @abstractmethod
+    def get_owner_ships_counts(self, owner_id: int) -> dict[int, int]:
+        pass
+
+    @abstractmethod
+    def ship_collides(self, ship: ShipCreateSchema, max_length: int) -> bool:
+        pass
+
+    @abstractmethod
+    def delete_owner_ships(self, owner_id: int) -> int:
+        pass
+
+    @abstractmethod
+    def get_owners_ships(self, owner_ids: list[int]) -> list[ShipModel]:
+        pass
+
+
+class SQLShipRepository(ShipRepository):
+    """
+    Ships stored in the database.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_ship(self, ship: ShipCreateSchema) -> ShipModel:
+        self.db.add(new_ship := ShipModel(**ship.dict()))
+        return new_ship
+
+    def get_ship(self, ship_id: int) -> ShipModel | None:
+        return self.db.query(ShipModel).filter(
+            ShipModel.id == ship_id).first()
+
+    def get_ships(self, limit: int, offset: int) -> list[ShipModel]:
+        return self.db.query(ShipModel).offset(offset).limit(limit).all()
+
+    def get_owner_ships_count(self, owner_id: int) -> int:
+        return self.db.query(ShipModel).filter(
+            ShipModel.owner_id == owner_id).count()
+
+    def get_owner_ships_counts(self, owner_id: int) -> dict[int, int]:
+        return dict(self.db.query(
+            ShipModel.length,
+            func.count(ShipModel.id)
+        ).filter(
+            ShipModel.owner_id == owner_id
+        ).group_by(ShipModel.length))
+
+    @staticmethod
+    def get_collision_condition(
+        ship: ShipCreateSchema,
+        orientation: Orientation,
+        max_length: int
+    ) -> ColumnElement:
+        """
+        Returns SQL condition of owner's ship placed in given orientation
+        colliding with given new ship, comparing their extents.
+
+        Ships of given orientation taking lines (rows of horizontal ships,
+        columns of vertical ones) crossed by the new ship are matched by ships
+        location indexes (`ix_ships_owner_rows` and `ix_ships_owner_columns`)
+        and their starts by index range, bounded by the longest ship length.
+
+        Params:
+            - ship: New ship data
+            - orientation: Orientation of owner's ships
+            - max_length: Length of the longest ship on the board
+
+        Returns:
+            SQL condition.
+        """
+        ship_start, ship_end = get_ship_cords(ship)
+        if orientation is Orientation.horizontal:
+            line, start = ShipModel.row, ShipModel.column
+            first_line, last_line = ship_start.y, ship_end.y
+            first_cell, last_cell = ship_start.x, ship_end.x
+        else:
+            line, start = ShipModel.column, ShipModel.row
+            first_line, last_line = ship_start.x, ship_end.x
+            first_cell, last_cell = ship_start.y, ship_end.y
+        return and_(
+            ShipModel.owner_id == ship.owner_id,
+            ShipModel.orientation == orientation,
+            line.between(first_line, last_line),
+            start.between(first_cell - max_length + 1, last_cell),
+            start + ShipModel.length > first_cell)
+
+    def ship_collides(self, ship: ShipCreateSchema, max_length: int) -> bool:
+        # Ships of each orientation are checked separately, so both checks
+        # use index lookups.
+        return self.db.query(or_(*(
+            self.db.query(ShipModel).filter(
+                self.get_collision_condition(ship, orientation, max_length)
+            ).exists()
+            for orientation in Orientation))).scalar()
+
+    def delete_owner_ships(self, owner_id: int) -> int:
+        return self.db.query(ShipModel).filter(
+            ShipModel.owner_id == owner_id
+        ).delete(synchronize_session=False)
+
+    def get_owners_ships(self, owner_ids: list[int]) -> list[ShipModel]:
+        return self.db.query(ShipModel).filter(
+            ShipModel.owner_id.in_(owner_ids)
+        ).order_by(ShipModel.id).all()
+
+
+class ShipRecord(MemoryRecord):
+    """
+    In-memory ship, with attributes of `ShipModel`.
+    """
+    __tablename__ = ShipModel.__tablename__
+    __columns__ = {
+        'owner_id': None,
+        'length': None,
+        'column': None,
+        'row': None,
+        'orientation': None}
+    # The latter replace ships location indexes.
+    __indexes__ = (
+        'owner_id',
+        ('owner_id', 'orientation', 'row'),
+        ('owner_id', 'orientation', 'column'))
+
+    @property
+    def owner(self) -> MemoryRecord | None:
+        return self.get_related(PlayerModel.__tablename__, self.owner_id)
+
+
+class MemoryShipRepository(ShipRepository):
+    """
+    Ships stored in process memory.
+    """
+    def __init__(self, db: MemorySession):
+        self.db = db
+        self.ships = db.store.table(ShipRecord.__tablename__)
+
+    def create_ship(self, ship: ShipCreateSchema) -> ShipRecord:
+        self.db.add(new_ship := ShipRecord(**ship.dict()))
+        return self.db.bind(new_ship)
+
+    def get_ship(self, ship_id: int) -> ShipRecord | None:
+        return self.db.bind(self.ships.get(ship_id))
+
+    def get_ships(self, limit: int, offset: int) -> list[ShipRecord]:
+        return self.db.bind(list(itertools.islice(
+            self.ships.rows.values(), offset, offset + limit)))
+
+    def get_owner_ships_count(self, owner_id: int) -> int:
+        return self.ships.count('owner_id', owner_id)
+
+    def get_owner_ships_counts(self, owner_id: int) -> dict[int, int]:
+        return dict(collections.Counter(
+            ship.length for ship in self.ships.find('owner_id', owner_id)))
+
+    def ship_collides(self, ship: ShipCreateSchema, max_length: int) -> bool:
+        ship_start, ship_end = get_ship_cords(ship)
+        lines = (
+            (
+                Orientation.horizontal,
+                'row',
+                range(ship_start.y, ship_end.y + 1)),
+            (
+                Orientation.vertical,
+                'column',
+                range(ship_start.x, ship_end.x + 1)))
+        return any(
+            ships_collides(ship, other)
+            for orientation, column, numbers in lines
+            for number in numbers
+            for other in self.ships.find(
+                ('owner_id', 'orientation', column),
+                (ship.owner_id, orientation, number)))
+
+    def delete_owner_ships(self, owner_id: int) -> int:
+        ships = self.ships.find('owner_id', owner_id)
+        for ship in ships:
+            self.db.delete(ship)
+        return len(ships)
+
+    def get_owners_ships(self, owner_ids: list[int]) -> list[ShipRecord]:
+        return self.db.bind(list(heapq.merge(
+            *(
+                self.ships.find('owner_id', owner_id)
+                for owner_id in set(owner_ids)),
+            key=lambda ship: ship.id)))
+
+
+def get_repository(db: Session | MemorySession) -> ShipRepository:
+    """
+    Returns ships storage backend of given session.
+    """
+    if isinstance(db, MemorySession):
+        return MemoryShipRepository(db)
+    return SQLShipRepository(db)
@@ -2,10 +2,18 @@ from fastapi import APIRouter, Depends, Header, Response, status
 
 from battleship_api.core.database import get_db_session
 from battleship_api.core.exceptions import build_exceptions_dict
+from battleship_api.core.grid import load_fleet
 
 from . import crud, funcs, tags, schemas
 
-from .exceptions import ShipCreationConflictException, ShipNotFoundException
+from .exceptions import (
+    ShipCreationConflictException,
+    ShipNotFoundException,
+    ShipOutOfBoardException)
+from battleship_api.api.board import crud as board_crud
+from battleship_api.api.board.exceptions import (
+    BoardConcurrentModificationException)
+
 from battleship_api.api.player.exceptions import (
     InvalidPlayerAccessTokenException,
     PlayerIsReadyException,
@@ -25,7 +33,7 @@ router = APIRouter(prefix='/ships')
     '/',
     status_code=status.HTTP_200_OK,
     response_model=list[schemas.ShipPublic],
-    response_model_exclude=schemas.ShipRestricted.schema().keys(),
+    response_model_exclude=set(schemas.ShipRestricted.__fields__),
     tags=[tags.ships_operation['name']])
 async def get_ships(
     db: Session = Depends(get_db_session),
@@ -57,9 +65,11 @@ async def get_ships(
     status_code=status.HTTP_201_CREATED,
     response_model=schemas.Ship,
     responses=build_exceptions_dict(
+        BoardConcurrentModificationException,
         InvalidPlayerAccessTokenException,
         PlayerNotFoundException,
-        ShipCreationConflictException),
+        ShipCreationConflictException,
+        ShipOutOfBoardException),
     tags=[tags.ships_operation['name']])
 async def create_ship(
     new_ship: schemas.ShipCreate,
@@ -79,12 +89,15 @@ async def create_ship(
                 during request.
 
     Raise:
+        - BoardConcurrentModificationException: Board was modified by another
+            request during validation.
         - InvalidPlayerAccessTokenException: Given player authentication token
             is invalid.
         - PlayerNotFoundException: Player cannot cannot be found by given
             `owner_id`.
         - ShipCreationConflictException: Ship cannot be created due to conflict
-            with another already existing ship.
+            with another already existing ship or board fleet.
+        - ShipOutOfBoardException: Ship does not fit on owner's board.
 
     Returns:
         Database ship instance.
@@ -96,12 +109,27 @@ async def create_ship(
     if not (owner := player_crud.get_player(db, new_ship.owner_id)):
         raise PlayerNotFoundException({'id': new_ship.owner_id})
 
-    for ship in owner.ships:
-        if funcs.ships_conflicts(new_ship, ship):
-            raise ShipCreationConflictException(new_ship)
+    board = owner.board
+    if not funcs.is_on_board(new_ship, board.width, board.height):
+        raise ShipOutOfBoardException(new_ship)
+    # Owner's fleet is checked by the database, without loading it.
+    fleet = load_fleet(board.fleet)
+    if (
+        not funcs.fleet_allows(
+            new_ship.length,
+            crud.get_owner_ships_counts(db, owner.id),
+            fleet)
+        or crud.ship_collides(db, new_ship, max(fleet))
+    ):
+        raise ShipCreationConflictException(new_ship)
     # Ship cannot conflict with any existing one when player is not ready, so
     # it's no needed to verify player's `ready` status.
 
+    # Ships validated above could be changed in the meantime otherwise.
+    if not board_crud.claim_board(db, board):
+        db.rollback()
+        raise BoardConcurrentModificationException({'id': owner.board_id})
+
     new_ship = crud.create_ship(db, new_ship)
     db.commit()
     db.refresh(new_ship)
@@ -157,6 +185,7 @@ async def get_ship_all_data(
     status_code=status.HTTP_204_NO_CONTENT,
     response_class=Response,
     responses=build_exceptions_dict(
+        BoardConcurrentModificationException,
         InvalidPlayerAccessTokenException,
         PlayerIsReadyException,
         ShipNotFoundException),
@@ -180,6 +209,8 @@ async def delete_ship(
                 during request.
 
     Raise:
+        - BoardConcurrentModificationException: Board was modified by another
+            request during validation.
         - ShipNotFoundException: Ship not found by given id.
         - InvalidPlayerAccessTokenException: Given player authentication token
             is invalid for owner of given ship.
@@ -198,6 +229,11 @@ async def delete_ship(
         raise PlayerIsReadyException(
             player_schemas.PlayerSearch(id=ship.owner_id))
 
+    if not board_crud.claim_board(db, ship.owner.board):
+        db.rollback()
+        raise BoardConcurrentModificationException(
+            {'id': ship.owner.board_id})
+
     db.delete(ship)
     db.commit()
 
@@ -2,6 +2,7 @@ from pydantic import BaseModel as BaseSchema, Field
 
 from enum import Enum
 
+from battleship_api.core.grid import MAX_BOARD_SIZE
 from battleship_api.core.types import Orientation
 
 
@@ -14,9 +15,9 @@ class ShipOwner(BaseSchema):
 
 
 class ShipLocation(BaseSchema):
-    length: int = Field(..., ge=1, le=4)
-    column: int = Field(..., ge=1, le=10)
-    row: int = Field(..., ge=1, le=10)
+    length: int = Field(..., ge=1, le=MAX_BOARD_SIZE)
+    column: int = Field(..., ge=1, le=MAX_BOARD_SIZE)
+    row: int = Field(..., ge=1, le=MAX_BOARD_SIZE)
     orientation: Orientation
 
 
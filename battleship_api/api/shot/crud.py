@@ -1,5 +1,6 @@
 from . import schemas
 from .models import Shot as ShotModel
+from .repository import get_repository
 
 from sqlalchemy.orm import Session
 
@@ -15,7 +16,7 @@ def get_shot(db: Session, shot_id: int) -> ShotModel | None:
     Returns:
         Shot database object instance
     """
-    return db.query(ShotModel).filter(ShotModel.id == shot_id).first()
+    return get_repository(db).get_shot(shot_id)
 
 
 def get_shots(db: Session, limit: int, offset: int) -> list[ShotModel]:
@@ -30,9 +31,134 @@ def get_shots(db: Session, limit: int, offset: int) -> list[ShotModel]:
     Returns:
         Shot list of `limit` elements starting from `offset` shot.
     """
-    return db.query(ShotModel).offset(offset).limit(limit).all()
+    return get_repository(db).get_shots(limit, offset)
+
+
+def get_players_shots(
+    db: Session,
+    player_ids: list[int],
+    since: int = 0
+) -> list[ShotModel]:
+    """
+    Returns shots of all given players with id greater than `since`, with
+    single query.
+
+    Params:
+        - db: Database session
+        - player_ids: Players ids
+        - [Optional] since: Id of the last shot to skip
+            - Defaults to: 0
+
+    Returns:
+        Shot list ordered by id.
+    """
+    return get_repository(db).get_players_shots(player_ids, since)
+
+
+def get_players_shots_stats(
+    db: Session,
+    player_ids: list[int]
+) -> dict[int, tuple[int, int]]:
+    """
+    Returns number of shots and id of the last shot of every given player
+    with single query.
+
+    Params:
+        - db: Database session
+        - player_ids: Players ids
+
+    Returns:
+        Tuples of shots number and the last shot id, by player id. Players
+        without shots are omitted.
+    """
+    return get_repository(db).get_players_shots_stats(player_ids)
+
+
+def shot_exists(db: Session, player_id: int, column: int, row: int) -> bool:
+    """
+    Checks if given player already shot at given location.
+
+    Params:
+        - db: Database session
+        - player_id: Shooter (player) id
+        - column: Shot column
+        - row: Shot row
+
+    Returns:
+        True if such shot exists, otherwise False.
+    """
+    return get_repository(db).shot_exists(player_id, column, row)
+
+
+def is_hit(db: Session, shot_id: int) -> bool:
+    """
+    Checks if shot with given id hit any enemy ship, without loading the
+    enemy fleet from the database.
+
+    Params:
+        - db: Database session
+        - shot_id: Shot id
+
+    Returns:
+        True if shot hit enemy ship, otherwise False.
+    """
+    return get_repository(db).is_hit(shot_id)
+
+
+def get_player_hits_stats(
+    db: Session,
+    player_id: int
+) -> schemas.HitsStats | None:
+    """
+    Returns shots, hits and sunk ships numbers of given player. In the
+    database hits are evaluated with single statement, without loading ships
+    and shots.
+
+    Shots are counted by hit ship, so ship is sunk when number of its hits
+    equals its length (shots locations are unique).
+
+    Params:
+        - db: Database session
+        - player_id: Player id
+
+    Returns:
+        Hits statistics or None if player has no shots.
+    """
+    return get_repository(db).get_player_hits_stats(player_id)
+
+
+def get_board_hits_stats(
+    db: Session,
+    board_id: int
+) -> dict[int, schemas.HitsStats]:
+    """
+    Returns hits statistics of all players assigned to given board (see
+    `get_player_hits_stats`).
+
+    Params:
+        - db: Database session
+        - board_id: Board id
+
+    Returns:
+        Hits statistics by player id. Players without shots are omitted.
+    """
+    return get_repository(db).get_board_hits_stats(board_id)
 
 
 def create_shot(db: Session, shot: schemas.ShotCreate) -> ShotModel:
-    db.add(new_shot := ShotModel(**shot.dict()))
-    return new_shot
+    return get_repository(db).create_shot(shot)
+
+
+def delete_board_shots(db: Session, board_id: int) -> int:
+    """
+    Deletes shots of all players assigned to given board with single
+    statement, without loading them.
+
+    Params:
+        - db: Database session
+        - board_id: Board id
+
+    Returns:
+        Number of deleted shots.
+    """
+    return get_repository(db).delete_board_shots(board_id)
@@ -24,6 +24,18 @@ class ShotCreationConflictException(BaseAPIException):
     schema = schemas.ShotCreate
 
 
+class ShotOutOfBoardException(BaseAPIException):
+    """
+    API exception raise when shot location is outside of player's board.
+
+    `battleship_api.api.shot.schemas.ShotCreate` data must be provided,
+    when initialized.
+    """
+    code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    message = "Shot location is outside of the board."
+    schema = schemas.ShotCreate
+
+
 class ShotNotFoundException(BaseAPIException):
     """
     API exception raise when shot cannot be found by given id.
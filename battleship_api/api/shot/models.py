@@ -8,7 +8,8 @@ from battleship_api.api.player.models import Player
 
 class Shot(BaseModel):
     __tablename__ = 'shots'
-    __tableargs__ = (UniqueConstraint(
+    __table_args__ = (UniqueConstraint(
+        'player_id',
         'row',
         'column',
         name='_location_unique_constraint'),)
@@ -16,7 +17,7 @@ class Shot(BaseModel):
     id = Column(Integer, primary_key=True)
     player_id = Column(
         Integer,
-        ForeignKey(f'{Player.__tablename__}.id')
+        ForeignKey(f'{Player.__tablename__}.id', ondelete='CASCADE')
     )
     row = Column(Integer)
     column = Column(Integer)
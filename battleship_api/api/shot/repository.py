@@ -0,0 +1,443 @@
+"""
+Shots storage backends used by `battleship_api.api.shot.crud`: SQLAlchemy
+(database) and in-memory (see `battleship_api.core.memory`) one.
+"""
+import collections
+import heapq
+import itertools
+
+from abc import ABC, abstractmethod
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Query, Session, aliased
+from sqlalchemy.sql import ColumnElement
+
+from . import schemas
+from .models import Shot as ShotModel
+
+from battleship_api.api.player.models import Player as PlayerModel
+
+from battleship_api.api.ship.models import Ship as ShipModel
+
+from battleship_api.core.memory import MemoryRecord, MemorySession
+from battleship_api.core.types import Orientation
+
+
+class ShotRepository(ABC):
+    """
+    Interface of shots storage. Methods are described by functions of
+    `battleship_api.api.shot.crud` calling them.
+    """
+    @abstractmethod
+    def get_shot(self, shot_id: int) -> ShotModel | None:
+        pass
+
+    @abstractmethod
+    def get_shots(self, limit: int, offset: int) -> list[ShotModel]:
+        pass
+
+    @abstractmethod
+    def get_players_shots(
+        self,
+        player_ids: list[int],
+        since: int
+    ) -> list[ShotModel]:
+        pass
+
+    @abstractmethod
+    def get_players_shots_stats(
+        self,
+        player_ids: list[int]
+    ) -> dict[int, tuple[int, int]]:
+        pass
+
+    @abstractmethod
+    def shot_exists(self, player_id: int, column: int, row: int) -> bool:
+        pass
+
+    @abstractmethod
+    def is_hit(self, shot_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    def get_player_hits_stats(
+        self,
+        player_id: int
+    ) -> schemas.HitsStats | None:
+        pass
+
+    @abstractmethod
+    def get_board_hits_stats(
+        self,
+        board_id: int
+    ) -> dict[int, schemas.HitsStats]:
+        pass
+
+    @abstractmethod
+    def create_shot(self, shot: schemas.ShotCreate) -> ShotModel:
+        pass
+
+    @abstractmethod
+    def delete_board_shots(self, board_id: int) -> int:
+        pass
+
+
+class SQLShotRepository(ShotRepository):
+    """
+    Shots stored in the database. Hits are evaluated by the database, without
+    loading ships and shots.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_shot(self, shot_id: int) -> ShotModel | None:
+        return self.db.query(ShotModel).filter(
+            ShotModel.id == shot_id).first()
+
+    def get_shots(self, limit: int, offset: int) -> list[ShotModel]:
+        return self.db.query(ShotModel).offset(offset).limit(limit).all()
+
+    def get_players_shots(
+        self,
+        player_ids: list[int],
+        since: int
+    ) -> list[ShotModel]:
+        return self.db.query(ShotModel).filter(
+            ShotModel.player_id.in_(player_ids),
+            ShotModel.id > since
+        ).order_by(ShotModel.id).all()
+
+    def get_players_shots_stats(
+        self,
+        player_ids: list[int]
+    ) -> dict[int, tuple[int, int]]:
+        return {
+            player_id: (count, last_id)
+            for player_id, count, last_id in self.db.query(
+                ShotModel.player_id,
+                func.count(ShotModel.id),
+                func.max(ShotModel.id)
+            ).filter(
+                ShotModel.player_id.in_(player_ids)
+            ).group_by(ShotModel.player_id)}
+
+    def shot_exists(self, player_id: int, column: int, row: int) -> bool:
+        return self.db.query(
+            self.db.query(ShotModel).filter(
+                ShotModel.player_id == player_id,
+                ShotModel.row == row,
+                ShotModel.column == column).exists()
+        ).scalar()
+
+    @staticmethod
+    def get_hit_condition(
+        ship: type[ShipModel],
+        enemy_id: ColumnElement,
+        orientation: Orientation
+    ) -> ColumnElement:
+        """
+        Returns SQL condition of shot (`ShotModel`) hitting ship of given
+        enemy placed in given orientation, comparing shot location with ship
+        extent.
+
+        Conditions of both orientations are matched by ships location indexes
+        (`ix_ships_owner_rows` and `ix_ships_owner_columns`).
+
+        Params:
+            - ship: Ship model (or its alias)
+            - enemy_id: Ship owner id expression
+            - orientation: Ship orientation
+
+        Returns:
+            SQL condition.
+        """
+        if orientation is Orientation.horizontal:
+            line, shot_line, start, shot_start = (
+                ship.row, ShotModel.row, ship.column, ShotModel.column)
+        else:
+            line, shot_line, start, shot_start = (
+                ship.column, ShotModel.column, ship.row, ShotModel.row)
+        return and_(
+            ship.owner_id == enemy_id,
+            ship.orientation == orientation,
+            line == shot_line,
+            start <= shot_start,
+            start + ship.length > shot_start)
+
+    def get_hits_query(self, *criteria: ColumnElement) -> Query:
+        """
+        Returns query of shots matching given criteria, joined with enemy
+        ship they hit (if any).
+
+        Rows contain shooter id (`player_id`), enemy id (`enemy_id`), shot id
+        (`shot_id`) and id and length of hit ship (`ship_id`, `ship_length`,
+        both None for missed shots).
+
+        Params:
+            - criteria: Shots filtering criteria
+
+        Returns:
+            Hits query.
+        """
+        shooter = aliased(PlayerModel)
+        enemy = aliased(PlayerModel)
+        # Ships of each orientation are joined separately, so both joins use
+        # index lookups.
+        horizontal = aliased(ShipModel)
+        vertical = aliased(ShipModel)
+        ship_id = func.coalesce(horizontal.id, vertical.id)
+        return self.db.query(
+            ShotModel.player_id.label('player_id'),
+            enemy.id.label('enemy_id'),
+            ShotModel.id.label('shot_id'),
+            ship_id.label('ship_id'),
+            func.coalesce(
+                horizontal.length, vertical.length).label('ship_length')
+        ).join(
+            shooter, shooter.id == ShotModel.player_id
+        ).outerjoin(
+            enemy,
+            and_(enemy.board_id == shooter.board_id, enemy.id != shooter.id)
+        ).outerjoin(
+            horizontal,
+            self.get_hit_condition(
+                horizontal, enemy.id, Orientation.horizontal)
+        ).outerjoin(
+            vertical,
+            self.get_hit_condition(vertical, enemy.id, Orientation.vertical)
+        ).filter(*criteria)
+
+    def get_hits_stats(
+        self,
+        *criteria: ColumnElement
+    ) -> dict[int, schemas.HitsStats]:
+        """
+        Returns shots, hits and sunk ships numbers of shooters of shots
+        matching given criteria, with single statement.
+
+        Shots are counted by hit ship first (misses are grouped together), so
+        ship is sunk when number of its hits equals its length (shots
+        locations are unique).
+
+        Params:
+            - criteria: Shots filtering criteria
+
+        Returns:
+            Hits statistics by shooter (player) id. Players without shots are
+            omitted.
+        """
+        hits = self.get_hits_query(*criteria).subquery()
+        ships_hits = self.db.query(
+            hits.c.player_id,
+            hits.c.enemy_id,
+            hits.c.ship_id,
+            hits.c.ship_length,
+            func.count().label('count')
+        ).group_by(
+            hits.c.player_id,
+            hits.c.enemy_id,
+            hits.c.ship_id,
+            hits.c.ship_length
+        ).subquery()
+        return {
+            row.player_id: schemas.HitsStats(**row._asdict())
+            for row in self.db.query(
+                ships_hits.c.player_id,
+                func.sum(ships_hits.c.count).label('shots'),
+                func.sum(case(
+                    (ships_hits.c.ship_id.is_not(None), ships_hits.c.count),
+                    else_=0)).label('hits'),
+                func.sum(case(
+                    (ships_hits.c.count == ships_hits.c.ship_length, 1),
+                    else_=0)).label('sunk_ships'),
+                select(func.count(ShipModel.id)).where(
+                    ShipModel.owner_id == ships_hits.c.enemy_id
+                ).scalar_subquery().label('enemy_ships')
+            ).group_by(ships_hits.c.player_id, ships_hits.c.enemy_id)}
+
+    def is_hit(self, shot_id: int) -> bool:
+        hit = self.get_hits_query(ShotModel.id == shot_id).first()
+        return hit is not None and hit.ship_id is not None
+
+    def get_player_hits_stats(
+        self,
+        player_id: int
+    ) -> schemas.HitsStats | None:
+        return self.get_hits_stats(
+            ShotModel.player_id == player_id).get(player_id)
+
+    def get_board_hits_stats(
+        self,
+        board_id: int
+    ) -> dict[int, schemas.HitsStats]:
+        return self.get_hits_stats(ShotModel.player_id.in_(
+            self.db.query(PlayerModel.id).filter(
+                PlayerModel.board_id == board_id)))
+
+    def create_shot(self, shot: schemas.ShotCreate) -> ShotModel:
+        self.db.add(new_shot := ShotModel(**shot.dict()))
+        return new_shot
+
+    def delete_board_shots(self, board_id: int) -> int:
+        return self.db.query(ShotModel).filter(
+            ShotModel.player_id.in_(
+                self.db.query(PlayerModel.id).filter(
+                    PlayerModel.board_id == board_id))
+        ).delete(synchronize_session=False)
+
+
+class ShotRecord(MemoryRecord):
+    """
+    In-memory shot, with attributes of `ShotModel`.
+    """
+    __tablename__ = ShotModel.__tablename__
+    __columns__ = {'player_id': None, 'row': None, 'column': None}
+    # The latter replaces location unique constraint.
+    __indexes__ = ('player_id', ('player_id', 'column', 'row'))
+
+    @property
+    def player(self) -> MemoryRecord | None:
+        return self.get_related(PlayerModel.__tablename__, self.player_id)
+
+
+class MemoryShotRepository(ShotRepository):
+    """
+    Shots stored in process memory. Hits are evaluated against enemy ships
+    found through ships locations indexes (see `ShipRecord.__indexes__` of
+    `battleship_api.api.ship.repository`).
+    """
+    def __init__(self, db: MemorySession):
+        self.db = db
+        self.shots = db.store.table(ShotRecord.__tablename__)
+        self.players = db.store.table(PlayerModel.__tablename__)
+        self.ships = db.store.table(ShipModel.__tablename__)
+
+    def get_shot(self, shot_id: int) -> ShotRecord | None:
+        return self.db.bind(self.shots.get(shot_id))
+
+    def get_shots(self, limit: int, offset: int) -> list[ShotRecord]:
+        return self.db.bind(list(itertools.islice(
+            self.shots.rows.values(), offset, offset + limit)))
+
+    def get_players_shots(
+        self,
+        player_ids: list[int],
+        since: int
+    ) -> list[ShotRecord]:
+        return self.db.bind([
+            shot
+            for shot in heapq.merge(
+                *(
+                    self.shots.find('player_id', player_id)
+                    for player_id in set(player_ids)),
+                key=lambda shot: shot.id)
+            if shot.id > since])
+
+    def get_players_shots_stats(
+        self,
+        player_ids: list[int]
+    ) -> dict[int, tuple[int, int]]:
+        return {
+            player_id: (self.shots.count('player_id', player_id), last.id)
+            for player_id in player_ids
+            if (last := self.shots.last('player_id', player_id)) is not None}
+
+    def shot_exists(self, player_id: int, column: int, row: int) -> bool:
+        return self.shots.count(
+            ('player_id', 'column', 'row'), (player_id, column, row)) > 0
+
+    def get_enemy(self, player_id: int) -> MemoryRecord | None:
+        """
+        Returns enemy of given player (or None if player is alone).
+        """
+        if (player := self.players.get(player_id)) is None:
+            return None
+        return next(
+            (
+                enemy
+                for enemy in self.players.find('board_id', player.board_id)
+                if enemy.id != player_id),
+            None)
+
+    def get_ship_at(
+        self,
+        owner_id: int,
+        column: int,
+        row: int
+    ) -> MemoryRecord | None:
+        """
+        Returns ship of given owner taking given cell (or None). Only ships
+        placed on the cell's row or column are checked.
+        """
+        lines = (
+            (Orientation.horizontal, 'row', row, 'column', column),
+            (Orientation.vertical, 'column', column, 'row', row))
+        return next(
+            (
+                ship
+                for orientation, line, number, start, position in lines
+                for ship in self.ships.find(
+                    ('owner_id', 'orientation', line),
+                    (owner_id, orientation, number))
+                if 0 <= position - getattr(ship, start) < ship.length),
+            None)
+
+    def is_hit(self, shot_id: int) -> bool:
+        if (shot := self.shots.get(shot_id)) is None:
+            return False
+        if (enemy := self.get_enemy(shot.player_id)) is None:
+            return False
+        return self.get_ship_at(enemy.id, shot.column, shot.row) is not None
+
+    def get_player_hits_stats(
+        self,
+        player_id: int
+    ) -> schemas.HitsStats | None:
+        shots = self.shots.find('player_id', player_id)
+        if not shots:
+            return None
+        enemy = self.get_enemy(player_id)
+        enemy_ships = self.ships.count('owner_id', enemy.id) if enemy else 0
+        ships_hits = collections.Counter(
+            ship
+            for shot in shots
+            if enemy is not None
+            and (ship := self.get_ship_at(
+                enemy.id, shot.column, shot.row)) is not None)
+        return schemas.HitsStats(
+            player_id=player_id,
+            shots=len(shots),
+            hits=sum(ships_hits.values()),
+            sunk_ships=sum(
+                count == ship.length for ship, count in ships_hits.items()),
+            enemy_ships=enemy_ships)
+
+    def get_board_hits_stats(
+        self,
+        board_id: int
+    ) -> dict[int, schemas.HitsStats]:
+        return {
+            player.id: stats
+            for player in self.players.find('board_id', board_id)
+            if (stats := self.get_player_hits_stats(player.id)) is not None}
+
+    def create_shot(self, shot: schemas.ShotCreate) -> ShotRecord:
+        self.db.add(new_shot := ShotRecord(**shot.dict()))
+        return self.db.bind(new_shot)
+
+    def delete_board_shots(self, board_id: int) -> int:
+        deleted = 0
+        for player in self.players.find('board_id', board_id):
+            for shot in self.shots.find('player_id', player.id):
+                self.db.delete(shot)
+                deleted += 1
+        return deleted
+
+
+def get_repository(db: Session | MemorySession) -> ShotRepository:
+    """
+    Returns shots storage backend of given session.
+    """
+    if isinstance(db, MemorySession):
+        return MemoryShotRepository(db)
+    return SQLShotRepository(db)
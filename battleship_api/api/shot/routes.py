@@ -3,22 +3,23 @@ from fastapi import APIRouter, Depends, Header, status
 from . import crud
 from . import schemas
 from . import tags
-from .exceptions import ShotCreationConflictException, ShotNotFoundException
-from .models import Shot as ShotModel
+from .exceptions import (
+    ShotCreationConflictException,
+    ShotNotFoundException,
+    ShotOutOfBoardException)
 
 from battleship_api.core.types import BoardState
 from battleship_api.api.board import crud as board_crud
+from battleship_api.api.board import schemas as board_schemas
+from battleship_api.api.board.exceptions import (
+    BoardConcurrentModificationException)
 
 from battleship_api.api.player.exceptions import (
     InvalidPlayerAccessTokenException)
 from battleship_api.api.player.jwt import decode_player
-from battleship_api.api.player.models import Player as PlayerModel
 from battleship_api.api.player import crud as player_crud
 from battleship_api.api.player import schemas as player_schemas
 
-from battleship_api.api.ship.models import Ship as ShipModel
-from battleship_api.api.ship.funcs import is_ship
-
 from battleship_api.core.database import get_db_session
 from battleship_api.core.exceptions import build_exceptions_dict
 
@@ -62,8 +63,10 @@ async def get_shots(
     status_code=status.HTTP_201_CREATED,
     response_model=schemas.Shot,
     responses=build_exceptions_dict(
+        BoardConcurrentModificationException,
         InvalidPlayerAccessTokenException,
-        ShotCreationConflictException),
+        ShotCreationConflictException,
+        ShotOutOfBoardException),
     tags=[tags.shots_operation['name']])
 async def create_shot(
     new_shot: schemas.ShotCreate,
@@ -73,6 +76,9 @@ async def create_shot(
     """
     Creates shot instance and adds it to the database if player validated
     successfully and no shot creation conflicts detected.
+
+    If the shot sinks last enemy ship, board status changes to "game
+    finished" and the game result is stored in the same transaction.
     \f
     Args:
         - new_shot: Shot creation data.
@@ -83,10 +89,14 @@ async def create_shot(
                 during request.
 
     Raises:
+        - BoardConcurrentModificationException: Board was modified by another
+            request during validation.
         - InvalidPlayerAccessTokenException: Given player authentication token
             is invalid.
         - ShotCreationConflictException: Shot cannot be created, due to
             detected conflict.
+        - ShotOutOfBoardException: Shot location is outside of player's
+            board.
 
     Returns:
         Created shot database instance.
@@ -95,50 +105,53 @@ async def create_shot(
     if authed is None or new_shot.player_id != authed.id:
         raise InvalidPlayerAccessTokenException({"x_auth_token": x_auth_token})
 
-    authed = player_crud.get_player(db, authed.id)
+    if (authed := player_crud.get_player(db, authed.id)) is None:
+        raise InvalidPlayerAccessTokenException({"x_auth_token": x_auth_token})
+    board = authed.board
+    if new_shot.column > board.width or new_shot.row > board.height:
+        raise ShotOutOfBoardException(new_shot)
 
-    enemy_player_id = db.query(PlayerModel.id).filter(
-        PlayerModel.id != authed.id,
-        PlayerModel.board_id == authed.board_id).scalar()
+    enemy = player_crud.get_opponent(db, authed)
+    enemy_player_id = enemy.id if enemy is not None else None
 
-    enemy_shots_num = db.query(ShotModel).filter(
-        ShotModel.player_id == enemy_player_id).count()
-    player_shots_num = db.query(ShotModel).filter(
-        ShotModel.player_id == authed.id).count()
+    shots_stats = crud.get_players_shots_stats(
+        db, [authed.id] if enemy is None else [authed.id, enemy.id])
+    enemy_shots_num, _ = shots_stats.get(enemy_player_id, (0, 0))
+    player_shots_num, _ = shots_stats.get(authed.id, (0, 0))
     if (
-        authed.board.state is not BoardState.in_game
+        board.state is not BoardState.in_game
         or (
             authed.id < enemy_player_id
             and player_shots_num > enemy_shots_num)
         or (
             authed.id > enemy_player_id
             and player_shots_num == enemy_shots_num)
-        or db.query(
-            db.query(ShotModel).filter(
-                ShotModel.player_id == new_shot.player_id,
-                ShotModel.row == new_shot.row,
-                ShotModel.column == new_shot.column).exists()
-        ).scalar()
+        or crud.shot_exists(
+            db, new_shot.player_id, new_shot.column, new_shot.row)
     ):
         raise ShotCreationConflictException(new_shot)
 
+    # Turn validation above is valid only if no other shot was created on
+    # this board in the meantime.
+    if not board_crud.claim_board(db, board):
+        db.rollback()
+        raise BoardConcurrentModificationException(
+            board_schemas.BoardSearch(id=authed.board_id))
+
     new_shot = crud.create_shot(db, new_shot)
-    db.commit()
-    db.refresh(new_shot)
+    db.flush()
 
-    enemy_ships = db.query(ShipModel).filter(
-        ShipModel.owner_id == enemy_player_id
-    ).all()
-    success_shots = [
-        shot
-        for shot
-        in db.query(ShotModel).filter(ShotModel.player_id == authed.id)
-        if is_ship(shot.column, shot.row, enemy_ships)]
-    if (sum([ship.length for ship in enemy_ships]) == len(success_shots)):
-        board = board_crud.get_board(db, authed.board_id)
-        board.state = BoardState.game_finished
-        db.commit()
+    # Only hit can sink the last enemy ship, so the whole fleet is checked
+    # only after hits.
+    if (
+        crud.is_hit(db, new_shot.id)
+        and crud.get_player_hits_stats(db, authed.id).enemy_sunk
+    ):
+        board_crud.finish_game(
+            board, authed.id, player_shots_num + enemy_shots_num + 1)
 
+    db.commit()
+    db.refresh(new_shot)
     return new_shot
 
 
@@ -200,18 +213,4 @@ async def get_shot_success(
     shot = crud.get_shot(db, shot_id)
     if shot is None:
         raise ShotNotFoundException(schemas.ShotSearch(id=shot_id))
-
-    board_id = db.query(PlayerModel.board_id).filter(
-        PlayerModel.id == shot.player_id
-    ).scalar()
-
-    enemy_player_id = db.query(PlayerModel.id).filter(
-        PlayerModel.id != shot.player_id,
-        PlayerModel.board_id == board_id
-    ).scalar()
-
-    return schemas.Hit(
-        hit=is_ship(
-            shot.column,
-            shot.row,
-            db.query(ShipModel).filter(ShipModel.owner_id == enemy_player_id)))
+    return schemas.Hit(hit=crud.is_hit(db, shot_id))
@@ -1,11 +1,12 @@
 from pydantic import BaseModel as BaseSchema, Field
 
+from battleship_api.core.grid import MAX_BOARD_SIZE
 from battleship_api.core.types import Hit
 
 
 class ShotLocation(BaseSchema):
-    column: int = Field(..., ge=1, le=10)
-    row: int = Field(..., ge=1, le=10)
+    column: int = Field(..., ge=1, le=MAX_BOARD_SIZE)
+    row: int = Field(..., ge=1, le=MAX_BOARD_SIZE)
 
 
 class ShotCreate(ShotLocation):
@@ -19,3 +20,18 @@ class ShotSearch(BaseSchema):
 class Shot(ShotCreate, ShotSearch):
     class Config:
         orm_mode = True
+
+
+class HitsStats(BaseSchema):
+    """
+    Shots of player evaluated against enemy fleet.
+    """
+    player_id: int
+    shots: int
+    hits: int
+    sunk_ships: int
+    enemy_ships: int
+
+    @property
+    def enemy_sunk(self) -> bool:
+        return self.sunk_ships == self.enemy_ships
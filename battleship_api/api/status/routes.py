@@ -0,0 +1,41 @@
+from fastapi import APIRouter, status
+
+from . import schemas, tags
+
+from battleship_api.core import admission, single_flight
+
+
+router = APIRouter(prefix='/status')
+
+
+@router.get(
+    '/admission',
+    response_model=list[schemas.AdmissionGroup],
+    status_code=status.HTTP_200_OK,
+    tags=[tags.status_operation['name']])
+async def get_admission():
+    """
+    Retrieves admission control statistics (requests in progress, waiting in
+    queue, admitted and rejected) of every limited route group.
+    \f
+    Returns:
+        List of route groups statistics.
+    """
+    return admission.get_stats()
+
+
+@router.get(
+    '/single-flight',
+    response_model=list[schemas.SingleFlight],
+    status_code=status.HTTP_200_OK,
+    tags=[tags.status_operation['name']])
+async def get_single_flight():
+    """
+    Retrieves counters of coalesced computations (number of performed
+    computations and of requests which shared their results) of every single
+    flight group.
+    \f
+    Returns:
+        List of single flight groups counters.
+    """
+    return single_flight.get_stats()
@@ -0,0 +1,18 @@
+from pydantic import BaseModel as BaseSchema
+
+
+class AdmissionGroup(BaseSchema):
+    name: str
+    limit: int
+    in_flight: int
+    waiting: int
+    queue_size: int
+    admitted: int
+    rejected: int
+
+
+class SingleFlight(BaseSchema):
+    name: str
+    in_flight: int
+    executed: int
+    coalesced: int
@@ -0,0 +1,10 @@
+status_operation = {
+    'name': 'status-operation',
+    'description':
+        "Application load status.<br>"
+        "Counters of admission control, available also in production mode."}
+
+
+all_tags = [
+    status_operation,
+]
@@ -0,0 +1,203 @@
+"""
+Admission control (load shedding) of HTTP requests.
+
+Requests are assigned to route groups, each limiting number of requests
+handled at the same time. Requests above the limit wait in short queue for a
+free slot and are rejected with `503 Service Unavailable` response (with
+`Retry-After` header) when the queue is full or they wait too long. That way,
+when database slows down, requests do not pile up in server until all of
+them time out.
+
+Limits are applied per server worker process.
+"""
+import asyncio
+import re
+
+from collections import deque
+from fastapi import status
+
+from .exceptions import BaseAPIException
+
+
+# Route groups (name, allowed methods or None for all, path pattern). Request
+# belongs to the first matching group or to the default group.
+ROUTE_GROUPS = (
+    ('listing', frozenset({'GET'}), re.compile(
+        r'^/api/(boards|boards/winners|players|ships|shots)/?$')),
+    ('gameplay', None, re.compile(r'^/api/(shots|ships)(/|$)')))
+DEFAULT_GROUP = 'default'
+# Requests (method, path pattern) not limited, because they only dispatch
+# operations limited separately (see `battleship_api.api.batch`).
+UNLIMITED_ROUTES = (
+    ('POST', re.compile(r'^/api/batch/?$')),)
+
+
+class ServiceOverloadedException(BaseAPIException):
+    """
+    API exception raise when request is rejected by admission control,
+    because server is handling too many requests of the same route group.
+    """
+    code = status.HTTP_503_SERVICE_UNAVAILABLE
+    message = "Server is overloaded, try again later."
+
+
+class AdmissionGroup:
+    """
+    Limit of requests handled at the same time, with bounded queue of waiting
+    requests (first in, first out).
+    """
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        queue_size: int,
+        queue_timeout: float
+    ):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        """
+        Takes slot for request, waiting in queue if needed.
+
+        Returns:
+            True if request was admitted, False if it was rejected.
+        """
+        if self.in_flight < self.limit and not self.waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self.waiters) >= self.queue_size or self.queue_timeout <= 0:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        except asyncio.CancelledError:
+            # Slot could be handed over just before request was cancelled.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+        self.admitted += 1
+        return True
+
+    def release(self):
+        """
+        Frees slot taken by finished request, handing it over to the first
+        waiting request (if any).
+        """
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            'name': self.name,
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'waiting': len(self.waiters),
+            'queue_size': self.queue_size,
+            'admitted': self.admitted,
+            'rejected': self.rejected}
+
+
+groups: dict[str, AdmissionGroup] = dict()
+
+
+def init(
+    limits: dict[str, int | None],
+    queue_size: int,
+    queue_timeout: float
+):
+    """
+    Initializes route groups limits.
+
+    Params:
+        - limits: Limits of requests handled at the same time, by route group
+          name (`listing`, `gameplay` or `default`). Groups with None limit
+          are not limited.
+        - queue_size: Maximum number of requests waiting for a free slot in
+          each group.
+        - queue_timeout: Maximum number of seconds request waits for a free
+          slot.
+    """
+    global groups
+    groups = {
+        name: AdmissionGroup(name, limit, queue_size, queue_timeout)
+        for name, limit in limits.items()
+        if limit is not None}
+
+
+def get_group_name(method: str, path: str) -> str:
+    """
+    Returns name of route group of request with given method and path.
+    """
+    return next(
+        (
+            name
+            for name, methods, pattern in ROUTE_GROUPS
+            if (methods is None or method in methods) and pattern.match(path)),
+        DEFAULT_GROUP)
+
+
+def get_group(method: str, path: str) -> AdmissionGroup | None:
+    """
+    Returns limited route group of request with given method and path, or
+    None if request is not limited.
+    """
+    if any(
+        method == route_method and pattern.match(path)
+        for route_method, pattern in UNLIMITED_ROUTES
+    ):
+        return None
+    return groups.get(get_group_name(method, path))
+
+
+def get_stats() -> list[dict]:
+    """
+    Returns current statistics of all limited route groups.
+    """
+    return [group.stats() for group in groups.values()]
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware limiting requests handled at the same time, per route
+    group (see `battleship_api.core.admission.init`).
+    """
+    def __init__(self, app, retry_after: int = 1):
+        self.app = app
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        group = get_group(scope['method'], scope['path'])
+        if group is None:
+            return await self.app(scope, receive, send)
+
+        if not await group.acquire():
+            response = ServiceOverloadedException(
+                headers={'Retry-After': str(self.retry_after)}).response()
+            return await response(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            group.release()
@@ -1,38 +1,148 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator
+from fastapi import Request
 from pydantic import PostgresDsn, stricturl
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Transaction, make_url
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.schema import Column
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.declarative import declarative_base
 
+from . import memory
+
 
 SQLiteUrl = stricturl(host_required=False, allowed_schemes=["sqlite"])
 
+# Key of ASGI scope item holding session shared by requests dispatched
+# internally (e.g. batch operations).
+SESSION_SCOPE_KEY = 'battleship_api.db_session'
+
+# Keys of session `info` items holding functions called after commit (see
+# `on_commit`) and marking shared sessions (see `begin_shared_session`).
+ON_COMMIT_KEY = 'battleship_api.on_commit'
+SHARED_SESSION_KEY = 'battleship_api.shared'
+
+# Maximum number of rows inserted by single statement.
+INSERT_CHUNK_SIZE = 500
+
 
 BaseModel = declarative_base()
 
+# Lock serializing batch requests with the others on SQLite database (see
+# `get_lock`).
+sqlite_lock: memory.StoreLock | None = None
+
+
+def is_memory_db(db_url: PostgresDsn | SQLiteUrl) -> bool:
+    """
+    Checks if given database url points to in-memory SQLite database.
+    """
+    url = make_url(db_url)
+    return (
+        url.get_backend_name() == 'sqlite'
+        and url.database in (None, '', ':memory:'))
+
 
-def init(db_url: PostgresDsn | SQLiteUrl, **connect_args):
+def enable_sqlite_foreign_keys(dbapi_connection, _):
+    """
+    Enables foreign keys constraints (and so `ON DELETE CASCADE` actions),
+    which are disabled by default in SQLite connections.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+def init(
+    db_url: PostgresDsn | SQLiteUrl,
+    create_all: bool = True,
+    **connect_args
+):
     """
     Initialize database connection engine instance and local Session class.
-    After that creates all needed, non existing tables in connected database.
+    After that (if `create_all` is set) creates all needed, non existing
+    tables in connected database.
 
     Connection is initializing with database url given via `db_url`
     parameter or application setting. If it is not possible, use local sqlite
     file in app directory.
 
+    Foreign keys are enforced also in SQLite databases, whose requests are
+    handled holding lock (see `get_lock`).
+
+    In-memory SQLite database is shared by all sessions through single
+    connection, so `check_same_thread` should be disabled for it and it
+    should not be used to handle concurrent requests.
+
     Params:
         - [Optional] `db_url` - Database connection url.
             - Default: Local sqlite database connection url.
+        - [Optional] `create_all` - Whether to create missing tables.
+            - Default: True.
+            - Disable it when database schema is managed by migrations, to
+              skip inspecting database schema on every application start.
     """
     global engine
     global LocalSession
+    global sqlite_lock
 
+    db_url = db_url or "sqlite:///./db.sqlite3"
+    engine_args = dict()
+    if is_memory_db(db_url):
+        engine_args |= {'poolclass': StaticPool}
     engine = create_engine(
-        db_url := db_url or "sqlite:///./db.sqlite3",
-        connect_args={**connect_args})
+        db_url,
+        connect_args={**connect_args},
+        **engine_args)
+    sqlite_lock = None
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', enable_sqlite_foreign_keys)
+        sqlite_lock = memory.StoreLock()
     LocalSession = sessionmaker(engine, autoflush=False, autocommit=False)
+    if create_all:
+        BaseModel.metadata.create_all(bind=engine)
+
+
+def create_all():
+    """
+    Creates all needed, non existing tables in connected database.
+    """
+    global engine
     BaseModel.metadata.create_all(bind=engine)
 
 
+def warm_up(connections: int):
+    """
+    Opens given number of database connections at once and returns them to
+    the connection pool, so first requests do not pay for connecting.
+
+    Number of opened connections is limited by the connection pool size.
+
+    Params:
+        - connections: Number of connections to open.
+    """
+    global engine
+    pool_size = getattr(engine.pool, 'size', None)
+    if callable(pool_size):
+        connections = min(connections, pool_size())
+    opened = list()
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+def dispose():
+    """
+    Closes all connections held by database connection pool.
+    """
+    global engine
+    engine.dispose()
+
+
 def get_engine():
     """
     Returns database connection engine instance.
@@ -41,15 +151,169 @@ def get_engine():
     return engine
 
 
-def get_db_session():
+def get_lock() -> memory.StoreLock | None:
+    """
+    Returns lock held exclusively by batch requests and shared by the others
+    (see `battleship_api.core.memory.StoreLockMiddleware`): lock of in-memory
+    store or, for SQLite database, lock of the engine. SQLite database is
+    locked by single writer, so requests writing during batch transaction
+    would block the event loop till busy timeout and fail. None is returned
+    for other databases.
+    """
+    global sqlite_lock
+    if memory.is_enabled():
+        return memory.store.lock
+    return sqlite_lock
+
+
+def on_commit(
+    db: Session | memory.MemorySession,
+    callback: Callable[[], None]
+):
+    """
+    Registers function called after the current transaction of given session
+    is committed. Functions registered in shared session (see
+    `begin_shared_session`) are called when its transaction ends, also if it
+    is rolled back.
+
+    Params:
+        - db: Database session
+        - callback: Function without parameters
+    """
+    if isinstance(db, memory.MemorySession):
+        db.on_commit(callback)
+    else:
+        db.info.setdefault(ON_COMMIT_KEY, list()).append(callback)
+
+
+def run_commit_callbacks(session: Session):
+    for callback in session.info.pop(ON_COMMIT_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, 'after_commit')
+def after_commit(session: Session):
+    # Commit of shared session releases only its savepoint.
+    if not session.info.get(SHARED_SESSION_KEY):
+        run_commit_callbacks(session)
+
+
+def insert_many(
+    db: Session,
+    model: type,
+    values: list[dict],
+    *columns: Column
+) -> list[tuple]:
+    """
+    Inserts rows of given model with set based statements (bypassing ORM
+    objects) and returns values of given columns of inserted rows.
+
+    On databases supporting `INSERT ... RETURNING` rows are inserted by
+    multi-row statements of `INSERT_CHUNK_SIZE` rows, otherwise they are
+    inserted one by one (to fetch generated primary keys) within the current
+    transaction.
+
+    Params:
+        - db: Database session
+        - model: Model class
+        - values: Column values of inserted rows
+        - *columns: Returned columns
+
+    Returns:
+        Values of returned columns of inserted rows.
+    """
+    if db.get_bind().dialect.full_returning:
+        return [
+            tuple(row)
+            for start in range(0, len(values), INSERT_CHUNK_SIZE)
+            for row in db.execute(
+                insert(model)
+                .values(values[start:start + INSERT_CHUNK_SIZE])
+                .returning(*columns))]
+    values = [dict(value) for value in values]
+    db.bulk_insert_mappings(model, values, return_defaults=True)
+    return [
+        tuple(value[column.key] for column in columns)
+        for value in values]
+
+
+@contextmanager
+def begin_shared_session() -> Iterator[tuple[Session, Transaction]]:
+    """
+    Context manager yielding session working inside single database
+    transaction, together with that transaction.
+
+    Session works in savepoint, which is released by session commit and
+    rolled back by session rollback, and then new savepoint is started. So
+    code commiting the session does not commit the transaction, which is
+    committed or rolled back only by the owner of yielded transaction.
+    Transaction not committed at exit is rolled back.
+
+    With in-memory storage enabled, its session and transaction are yielded
+    instead (see `battleship_api.core.memory.begin_shared_session`).
+    """
+    global engine
+    global LocalSession
+    if memory.is_enabled():
+        with memory.begin_shared_session() as shared:
+            yield shared
+        return
+    connection = engine.connect()
+    sqlite_connection = None
+    if engine.dialect.name == 'sqlite':
+        # pysqlite does not begin transaction before savepoint, so its
+        # implicit transactions handling is replaced by explicit BEGIN.
+        sqlite_connection = connection.connection
+        isolation_level = sqlite_connection.isolation_level
+        sqlite_connection.isolation_level = None
+    transaction = connection.begin()
+    if sqlite_connection is not None:
+        connection.exec_driver_sql('BEGIN')
+    db_session = LocalSession(bind=connection)
+    db_session.info[SHARED_SESSION_KEY] = True
+    db_session.begin_nested()
+
+    @event.listens_for(db_session, 'after_transaction_end')
+    def restart_savepoint(session, session_transaction):
+        if (
+            session_transaction.nested
+            and not session_transaction._parent.nested
+        ):
+            session.expire_all()
+            session.begin_nested()
+
+    try:
+        yield db_session, transaction
+    finally:
+        event.remove(db_session, 'after_transaction_end', restart_savepoint)
+        db_session.close()
+        if transaction.is_active:
+            transaction.rollback()
+        if sqlite_connection is not None:
+            sqlite_connection.isolation_level = isolation_level
+        connection.close()
+        run_commit_callbacks(db_session)
+
+
+def get_db_session(request: Request):
     """
     Generator that at first yields the database session instance and nextly
     closes this session.
     Designed to be used as dependable function with FastAPI path operation
     functions.
+
+    Requests dispatched with shared session (in `SESSION_SCOPE_KEY` scope
+    item) get that session, which is not closed. With in-memory storage
+    enabled, session of in-memory store is yielded instead.
     """
     global LocalSession
-    db_session = LocalSession()
+    if (shared_session := request.scope.get(SESSION_SCOPE_KEY)) is not None:
+        yield shared_session
+        return
+    db_session = (
+        memory.MemorySession(memory.store)
+        if memory.is_enabled()
+        else LocalSession())
     try:
         yield db_session
     finally:
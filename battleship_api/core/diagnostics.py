@@ -0,0 +1,156 @@
+import gc
+import resource
+import tracemalloc
+
+from pydantic import BaseModel as BaseSchema
+from sqlalchemy.orm import session as orm_session
+
+from typing import Callable
+
+from . import database, logging
+
+
+caches: dict[str, Callable[[], int]] = dict()
+snapshot: tracemalloc.Snapshot | None = None
+
+
+def register_cache(name: str, sizer: Callable[[], int]):
+    """
+    Registers application cache or buffer, which size will be reported by
+    diagnostics.
+
+    Params:
+        - name: Unique cache name.
+        - sizer: Function without parameters returning current number of
+            entries held by the cache.
+    """
+    caches[name] = sizer
+
+
+def unregister_cache(name: str):
+    """
+    Removes cache with given name from diagnostics registry (if registered).
+
+    Params:
+        - name: Cache name.
+    """
+    caches.pop(name, None)
+
+
+def get_caches_sizes() -> dict[str, int]:
+    """
+    Returns number of entries held by each registered cache or buffer.
+    Caches which size could not be measured are reported as -1.
+    """
+    sizes = dict()
+    for name, sizer in sorted(caches.items()):
+        try:
+            sizes[name] = sizer()
+        except Exception:
+            sizes[name] = -1
+    return sizes
+
+
+def get_max_rss() -> int:
+    """
+    Returns maximum resident set size of the process in kilobytes.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def start_tracing(frames: int = 1):
+    """
+    Starts tracing memory allocations with `tracemalloc`, storing given number
+    of frames for each allocation trace. Restarts tracing if already started.
+
+    Params:
+        - [Optional] frames: Number of stored traceback frames.
+            - Defaults to: 1.
+    """
+    global snapshot
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    snapshot = None
+    tracemalloc.start(frames)
+
+
+def stop_tracing():
+    """
+    Stops tracing memory allocations and forgets last taken snapshot.
+    """
+    global snapshot
+    snapshot = None
+    tracemalloc.stop()
+
+
+def take_snapshot(
+    limit: int = 10,
+    key_type: str = 'lineno'
+) -> tuple[list[tracemalloc.Statistic], list[tracemalloc.StatisticDiff]]:
+    """
+    Takes memory allocations snapshot and compares it with the previous one.
+    New snapshot replaces previous one.
+
+    Tracing must be started before with
+    `battleship_api.core.diagnostics.start_tracing`.
+
+    Params:
+        - [Optional] limit: Number of top allocation sites to return.
+            - Defaults to: 10.
+        - [Optional] key_type: Allocation sites grouping key.
+            - One of: `filename`, `lineno`, `traceback`.
+            - Defaults to: `lineno`.
+
+    Returns:
+        Tuple of top allocation sites of the new snapshot and top allocation
+        sites differences between previous and new snapshot (empty if it is
+        the first snapshot).
+    """
+    global snapshot
+    gc.collect()
+    new_snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<unknown>')))
+    top = new_snapshot.statistics(key_type)[:limit]
+    diff = (
+        new_snapshot.compare_to(snapshot, key_type)[:limit]
+        if snapshot is not None
+        else list())
+    snapshot = new_snapshot
+    return top, diff
+
+
+def _get_sessions() -> list:
+    """
+    Returns living SQLAlchemy sessions, read from its private registry (empty
+    list if the registry is not available in installed SQLAlchemy version).
+    """
+    return list(getattr(orm_session, '_sessions', {}).values())
+
+
+def _identity_map_size() -> int:
+    return sum(len(session.identity_map) for session in _get_sessions())
+
+
+def _schema_cache_size() -> int:
+    size = 0
+    classes = [BaseSchema]
+    while classes:
+        cls = classes.pop()
+        size += len(cls.__dict__.get('__schema_cache__', ()))
+        classes.extend(cls.__subclasses__())
+    return size
+
+
+register_cache('logger_queue', lambda: len(logging.logger_queue))
+register_cache('log_records_queue', logging.records_queue.qsize)
+register_cache('sqlalchemy_sessions', lambda: len(_get_sessions()))
+register_cache('sqlalchemy_identity_maps', _identity_map_size)
+register_cache(
+    'sqlalchemy_compiled_cache',
+    lambda: len(database.get_engine()._compiled_cache or ()))
+register_cache(
+    'sqlalchemy_pool_checked_out',
+    lambda: database.get_engine().pool.checkedout())
+register_cache('pydantic_schema_cache', _schema_cache_size)
@@ -2,6 +2,8 @@ from fastapi import HTTPException, status
 from pydantic import BaseModel as BaseSchema
 import http
 
+from .negotiation import NegotiatedResponse
+
 
 class BaseAPIException(HTTPException):
     """
@@ -41,10 +43,10 @@ class BaseAPIException(HTTPException):
             self.data.update({'data': self.schema(**(exception_data)).dict()})
 
     def response(self):
-        from fastapi.responses import JSONResponse
-        return JSONResponse(
+        return NegotiatedResponse(
             content=self.data,
-            status_code=self.code
+            status_code=self.code,
+            headers=self.headers
         )
 
     @classmethod
@@ -0,0 +1,91 @@
+"""
+Board geometry and compact representation of sets of board cells.
+
+Set of cells is encoded as base64 string of bitmask, in which bit of cell in
+given column and row (both counted from 1) has index
+`(row - 1) * width + column - 1`. Bits are stored in bytes from the least
+significant one (bit `i` is bit `i % 8` of byte `i // 8`), so whole default
+10x10 board takes 13 bytes (20 base64 characters).
+"""
+import base64
+
+from typing import Iterable
+
+
+DEFAULT_BOARD_SIZE = 10
+MAX_BOARD_SIZE = 1000
+# Lengths of ships every player places on the board.
+DEFAULT_FLEET = (1, 2, 3, 4)
+MAX_FLEET_SIZE = 10_000
+
+
+def dump_fleet(fleet: Iterable[int]) -> str:
+    """
+    Returns fleet (ships lengths) in format stored in the database: lengths
+    separated by commas.
+    """
+    return ','.join(str(length) for length in fleet)
+
+
+def load_fleet(fleet: str) -> list[int]:
+    """
+    Returns fleet (ships lengths) stored in the database (see `dump_fleet`).
+    """
+    return [int(length) for length in fleet.split(',') if length]
+
+
+def get_cell_index(column: int, row: int, width: int) -> int:
+    """
+    Returns index of bit representing cell in given column and row.
+    """
+    return (row - 1) * width + column - 1
+
+
+def encode_cells(
+    cells: Iterable[tuple[int, int]],
+    width: int = DEFAULT_BOARD_SIZE,
+    height: int = DEFAULT_BOARD_SIZE
+) -> str:
+    """
+    Encodes set of cells as base64 bitmask.
+
+    Params:
+        - cells: Cells (column, row) to encode.
+        - [Optional] width: Board width (number of columns).
+            - Defaults to: `DEFAULT_BOARD_SIZE`.
+        - [Optional] height: Board height (number of rows).
+            - Defaults to: `DEFAULT_BOARD_SIZE`.
+
+    Returns:
+        Base64 encoded bitmask.
+    """
+    mask = 0
+    for column, row in cells:
+        mask |= 1 << get_cell_index(column, row, width)
+    return base64.b64encode(
+        mask.to_bytes((width * height + 7) // 8, 'little')).decode('ascii')
+
+
+def decode_cells(
+    encoded: str,
+    width: int = DEFAULT_BOARD_SIZE,
+    height: int = DEFAULT_BOARD_SIZE
+) -> set[tuple[int, int]]:
+    """
+    Decodes set of cells (column, row) from base64 bitmask.
+
+    Params:
+        - encoded: Base64 encoded bitmask.
+        - [Optional] width: Board width (number of columns).
+            - Defaults to: `DEFAULT_BOARD_SIZE`.
+        - [Optional] height: Board height (number of rows).
+            - Defaults to: `DEFAULT_BOARD_SIZE`.
+
+    Returns:
+        Set of encoded cells.
+    """
+    mask = int.from_bytes(base64.b64decode(encoded), 'little')
+    return {
+        (index % width + 1, index // width + 1)
+        for index in range(width * height)
+        if mask >> index & 1}
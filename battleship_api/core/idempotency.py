@@ -0,0 +1,345 @@
+"""
+Idempotency keys of creation requests.
+
+Client retrying request, which response it did not receive, sends it again
+with the same `Idempotency-Key` header value. The first successful response
+(with status code lower than 400) to request with given key is stored for
+`ttl` seconds and replayed (with `Idempotent-Replayed: true` header) to
+retries, without handling them again. Failed requests are not stored, so
+their retries are handled again.
+
+Keys are scoped by client (see `battleship_api.core.rate_limit
+.get_client_key`), request path and response format. Retry with the same key
+but different request body is rejected with `422 Unprocessable Entity`
+response, while retry sent before the first request was handled is rejected
+with `409 Conflict` response (with `Retry-After` header).
+
+Responses are kept in process memory by default, so retry handled by another
+server worker is handled again. Redis store shares them between all workers.
+"""
+import base64
+import hashlib
+import json
+import re
+import time
+
+from collections import OrderedDict
+from fastapi import status
+from typing import Callable, NamedTuple
+
+from . import diagnostics, negotiation
+from .exceptions import BaseAPIException
+from .rate_limit import get_client_key
+
+
+IDEMPOTENCY_KEY_HEADER = b'idempotency-key'
+REPLAYED_HEADER = b'idempotent-replayed'
+# ASGI scope key of list collecting responses of requests handled in shared
+# database session (see `battleship_api.api.batch`), which are stored only
+# after the session is committed (see `finish_pending`).
+PENDING_SCOPE_KEY = 'battleship_api.idempotency_pending'
+
+# Requests (method, path pattern) accepting idempotency keys.
+IDEMPOTENT_ROUTES = (
+    ('POST', re.compile(r'^/api/(players|ships|shots)/?$')),)
+
+MAX_KEY_LENGTH = 255
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_RESPONSES = 100_000
+# Number of seconds after which key of request still being handled (e.g. by
+# crashed worker) is released.
+IN_PROGRESS_TTL = 60
+
+
+class StoredResponse(NamedTuple):
+    """
+    Response stored under idempotency key. Status is None while the first
+    request is being handled.
+    """
+    fingerprint: str
+    status: int | None = None
+    headers: tuple[tuple[str, str], ...] = ()
+    body: bytes = b''
+
+    def dumps(self) -> str:
+        return json.dumps({
+            'fingerprint': self.fingerprint,
+            'status': self.status,
+            'headers': self.headers,
+            'body': base64.b64encode(self.body).decode('ascii')})
+
+    @classmethod
+    def loads(cls, data: str | bytes) -> 'StoredResponse':
+        data = json.loads(data)
+        return cls(
+            data['fingerprint'],
+            data['status'],
+            tuple(tuple(header) for header in data['headers']),
+            base64.b64decode(data['body']))
+
+
+class IdempotencyKeyInProgressException(BaseAPIException):
+    """
+    API exception raise when request with idempotency key is sent before the
+    first request with the same key was handled.
+    """
+    code = status.HTTP_409_CONFLICT
+    message = "Request with this Idempotency-Key is still being handled."
+
+
+class IdempotencyKeyMismatchException(BaseAPIException):
+    """
+    API exception raise when idempotency key is reused for request with
+    different body.
+    """
+    code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    message = "Idempotency-Key was already used for a different request."
+
+
+class MemoryStore:
+    """
+    Responses kept in process memory.
+
+    Least recently stored responses are dropped when number of responses
+    exceeds `max_responses`.
+    """
+    def __init__(self, max_responses: int = DEFAULT_MAX_RESPONSES):
+        self.max_responses = max_responses
+        self.responses: OrderedDict[str, tuple[float, StoredResponse]] = (
+            OrderedDict())
+
+    async def reserve(
+        self,
+        key: str,
+        fingerprint: str
+    ) -> StoredResponse | None:
+        """
+        Marks key as being handled, unless it is already used.
+
+        Returns:
+            None if key was reserved, otherwise response stored under it.
+        """
+        now = time.monotonic()
+        if (item := self.responses.get(key)) is not None:
+            expires, response = item
+            if expires > now:
+                return response
+        self.set(key, StoredResponse(fingerprint), now + IN_PROGRESS_TTL)
+        return None
+
+    async def save(self, key: str, response: StoredResponse, ttl: int):
+        self.set(key, response, time.monotonic() + ttl)
+
+    async def release(self, key: str):
+        self.responses.pop(key, None)
+
+    def set(self, key: str, response: StoredResponse, expires: float):
+        self.responses.pop(key, None)
+        self.responses[key] = (expires, response)
+        if len(self.responses) > self.max_responses:
+            self.responses.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.responses)
+
+
+class RedisStore:
+    """
+    Responses kept in Redis, shared by all server workers.
+
+    Requires `redis` package.
+    """
+    def __init__(self, url: str, prefix: str = 'battleship_api:idempotency:'):
+        from redis import asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def reserve(
+        self,
+        key: str,
+        fingerprint: str
+    ) -> StoredResponse | None:
+        """
+        Marks key as being handled, unless it is already used.
+
+        Returns:
+            None if key was reserved, otherwise response stored under it.
+        """
+        key = self.prefix + key
+        while not await self.client.set(
+            key,
+            StoredResponse(fingerprint).dumps(),
+            ex=IN_PROGRESS_TTL,
+            nx=True
+        ):
+            if (data := await self.client.get(key)) is not None:
+                return StoredResponse.loads(data)
+        return None
+
+    async def save(self, key: str, response: StoredResponse, ttl: int):
+        await self.client.set(self.prefix + key, response.dumps(), ex=ttl)
+
+    async def release(self, key: str):
+        await self.client.delete(self.prefix + key)
+
+
+ttl: int = DEFAULT_TTL
+store: MemoryStore | RedisStore = MemoryStore()
+
+
+def init(responses_ttl: int = DEFAULT_TTL, redis_url: str | None = None):
+    """
+    Initializes responses store.
+
+    Params:
+        - [Optional] responses_ttl: Number of seconds responses are stored.
+            - Defaults to: `DEFAULT_TTL` (24 hours).
+        - [Optional] redis_url: Url of Redis database keeping responses. If
+          not given, responses are kept in process memory.
+    """
+    global ttl
+    global store
+    ttl = responses_ttl
+    store = RedisStore(redis_url) if redis_url else MemoryStore()
+
+
+async def finish_pending(
+    pending: list[tuple[str, StoredResponse]],
+    committed: bool
+):
+    """
+    Stores responses collected in `PENDING_SCOPE_KEY` scope list if changes
+    of their requests were committed, otherwise releases their keys.
+    """
+    for key, response in pending:
+        if committed:
+            await store.save(key, response, ttl)
+        else:
+            await store.release(key)
+    pending.clear()
+
+
+def is_idempotent_route(method: str, path: str) -> bool:
+    return any(
+        method == route_method and pattern.match(path)
+        for route_method, pattern in IDEMPOTENT_ROUTES)
+
+
+def get_responses_count() -> int:
+    return len(store) if isinstance(store, MemoryStore) else 0
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware replaying stored responses to retried requests with
+    `Idempotency-Key` header (see `battleship_api.core.idempotency.init`).
+
+    `identify_player` is called with value of `X-Auth-Token` header and
+    should return player id or None if token is invalid.
+    """
+    def __init__(
+        self,
+        app,
+        identify_player: Callable[[str], int | None] = lambda _: None
+    ):
+        self.app = app
+        self.identify_player = identify_player
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        idempotency_key = dict(scope['headers']).get(IDEMPOTENCY_KEY_HEADER)
+        if (
+            not idempotency_key
+            or len(idempotency_key) > MAX_KEY_LENGTH
+            or not is_idempotent_route(scope['method'], scope['path'])
+        ):
+            return await self.app(scope, receive, send)
+
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] != 'http.request':
+                break
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+        # Stored body is encoded in format negotiated with the first request.
+        key = ':'.join((
+            get_client_key(scope, self.identify_player),
+            scope['path'],
+            negotiation.response_media_type.get(),
+            idempotency_key.decode('latin-1')))
+        fingerprint = hashlib.sha256(
+            scope['query_string'] + b'?' + bytes(body)).hexdigest()
+
+        stored = await store.reserve(key, fingerprint)
+        if stored is not None:
+            if stored.fingerprint != fingerprint:
+                exception = IdempotencyKeyMismatchException()
+            elif stored.status is None:
+                exception = IdempotencyKeyInProgressException(
+                    headers={'Retry-After': '1'})
+            else:
+                return await self.replay(stored, send)
+            return await exception.response()(scope, receive, send)
+
+        received = False
+
+        async def receive_body():
+            nonlocal received
+            if received:
+                return await receive()
+            received = True
+            return {
+                'type': 'http.request',
+                'body': bytes(body),
+                'more_body': False}
+
+        response_status = None
+        response_headers = list()
+        response_body = bytearray()
+
+        async def send_recording(message):
+            nonlocal response_status
+            if message['type'] == 'http.response.start':
+                response_status = message['status']
+                response_headers.extend(
+                    (name.decode('latin-1'), value.decode('latin-1'))
+                    for name, value in message.get('headers', ()))
+            elif message['type'] == 'http.response.body':
+                response_body.extend(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, send_recording)
+        except BaseException:
+            await store.release(key)
+            raise
+        if response_status is not None and response_status < 400:
+            response = StoredResponse(
+                fingerprint,
+                response_status,
+                tuple(response_headers),
+                bytes(response_body))
+            if (pending := scope.get(PENDING_SCOPE_KEY)) is not None:
+                pending.append((key, response))
+            else:
+                await store.save(key, response, ttl)
+        else:
+            await store.release(key)
+
+    async def replay(self, stored: StoredResponse, send):
+        await send({
+            'type': 'http.response.start',
+            'status': stored.status,
+            'headers': [
+                (name.encode('latin-1'), value.encode('latin-1'))
+                for name, value in stored.headers] + [
+                    (REPLAYED_HEADER, b'true')]})
+        await send({'type': 'http.response.body', 'body': stored.body})
+
+
+diagnostics.register_cache('idempotency_responses', get_responses_count)
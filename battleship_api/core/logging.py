@@ -1,18 +1,41 @@
+import atexit
+import copy
+import json
 import logging
 import logging.config
+import logging.handlers
+import queue
+import random
+import time
+import uuid
 from pydantic import BaseModel
 
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from logging import Logger
 from typing import Callable
 
 
 DEFAULT_LOGGER_NAME = 'battleship_api'
 DEBUG_LOGGER_NAME = f'{DEFAULT_LOGGER_NAME}.debug'
+ACCESS_LOGGER_NAME = f'{DEFAULT_LOGGER_NAME}.access'
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# Attributes of every log record, not included in JSON output as extra data.
+RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {
+    'message', 'asctime', 'request_id'}
 
 
 logger_queue = list()
 logger_initialized = False
 
+# Records waiting for being written by the background listener thread.
+records_queue = queue.SimpleQueue()
+listener: logging.handlers.QueueListener | None = None
+
+request_id: ContextVar[str | None] = ContextVar('request_id', default=None)
+
 
 class LogConfig(BaseModel):
     """
@@ -24,6 +47,9 @@ class LogConfig(BaseModel):
         'default': {
             '()': 'uvicorn.logging.DefaultFormatter',
             'fmt': '%(levelprefix)s %(message)s'
+        },
+        'json': {
+            '()': 'battleship_api.core.logging.JsonFormatter'
         }
     }
     handlers = {
@@ -44,6 +70,133 @@ class LogConfig(BaseModel):
     }
 
 
+class RequestIdFilter(logging.Filter):
+    """
+    Adds id of currently handled request (or None) to every record as
+    `request_id` attribute.
+    """
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Passes only given fraction of records with level not higher than
+    `max_level`. Records of higher levels are always passed.
+    """
+    def __init__(self, rate: float, max_level: int = logging.INFO):
+        super().__init__()
+        self.rate = rate
+        self.max_level = max_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return (
+            record.levelno > self.max_level
+            or self.rate >= 1
+            or random.random() < self.rate)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as single line JSON objects, containing also request id
+    and all extra attributes passed to the logger call.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': datetime.fromtimestamp(
+                record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None)}
+        data |= {
+            key: value
+            for key, value in record.__dict__.items()
+            if key not in RECORD_ATTRIBUTES}
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler passing record's exception as formatted text in its
+    `exc_text` attribute, instead of folding it into the message, so it is
+    formatted by the handler of the listener (e.g. as `exception` field of
+    `JsonFormatter` output).
+    """
+    exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Traceback is not queued, so its frames are not kept alive.
+            record.exc_text = (
+                record.exc_text
+                or self.exception_formatter.formatException(record.exc_info))
+            record.exc_info = None
+        return record
+
+
+class RequestLoggingMiddleware:
+    """
+    ASGI middleware assigning id to every HTTP request (taken from
+    `X-Request-ID` request header or generated) and returning it via the same
+    response header. Id is available to log records emitted during request
+    handling.
+
+    If `access_log` is set, every request is logged (after it is handled) by
+    `battleship_api.access` logger with its method, path, response status code
+    and duration.
+    """
+    def __init__(self, app, access_log: bool = False):
+        self.app = app
+        self.access_log = access_log
+        self.access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        header = REQUEST_ID_HEADER.lower().encode()
+        current_id = next(
+            (
+                value.decode('latin-1')
+                for name, value in scope['headers']
+                if name == header),
+            None) or uuid.uuid4().hex
+        token = request_id.set(current_id)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                message['headers'] = list(message.get('headers', ())) + [
+                    (header, current_id.encode('latin-1'))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            if self.access_log:
+                self.access_logger.info(
+                    f"{scope['method']} {scope['path']} {status_code}",
+                    extra={
+                        'method': scope['method'],
+                        'path': scope['path'],
+                        'status_code': status_code,
+                        'duration_ms': round(
+                            (time.perf_counter() - start) * 1e3, 3)})
+            request_id.reset(token)
+
+
 def append_logger_queue(task: Callable[[Logger], None]):
     global logger_queue
     global logger_initialized
@@ -54,7 +207,13 @@ def append_logger_queue(task: Callable[[Logger], None]):
     logger_queue.append(task)
 
 
-def init(name: str | None = None):
+def init(
+    name: str | None = None,
+    json_format: bool = False,
+    use_queue: bool = True,
+    access_sample_rate: float = 1.0,
+    debug_sample_rate: float = 1.0
+):
     """
     Initialize new logger and replace previous one with it.
 
@@ -64,15 +223,59 @@ def init(name: str | None = None):
     Params:
         - [Optional] `name` - Logger name string defining new logger.
             - Default: `battleship_api.core.logging.DEFAULT_LOGGER_NAME`
+        - [Optional] `json_format` - Whether records should be written as
+          JSON objects instead of text lines.
+            - Default: False
+        - [Optional] `use_queue` - Whether records should be written by
+          background thread, so logging calls never wait for output stream.
+            - Default: True
+        - [Optional] `access_sample_rate` - Fraction of access log records
+          (see `RequestLoggingMiddleware`) that are written.
+            - Default: 1.0
+        - [Optional] `debug_sample_rate` - Fraction of debug level records
+          that are written.
+            - Default: 1.0
     """
     global logger
     global logger_queue
     global logger_initialized
-    logging.config.dictConfig(LogConfig().dict())
+    global listener
+    stop_listener()
+
+    config = LogConfig().dict()
+    if json_format:
+        config['handlers']['default']['formatter'] = 'json'
+    logging.config.dictConfig(config)
+
+    app_logger = logging.getLogger(DEFAULT_LOGGER_NAME)
+    handler = app_logger.handlers[0]
+    if use_queue:
+        listener = logging.handlers.QueueListener(
+            records_queue, handler, respect_handler_level=True)
+        listener.start()
+        handler = RecordQueueHandler(records_queue)
+        app_logger.handlers = [handler]
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(SamplingFilter(debug_sample_rate, logging.DEBUG))
+    logging.getLogger(ACCESS_LOGGER_NAME).filters = [
+        SamplingFilter(access_sample_rate, logging.INFO)]
+
     logger = logging.getLogger(name or DEFAULT_LOGGER_NAME)
     logger_initialized = True
     for task in logger_queue:
         task(logger)
+    logger_queue.clear()
+
+
+def stop_listener():
+    """
+    Writes all records waiting in queue and stops background listener thread
+    (if it is running).
+    """
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
 
 
 def get_app_logger():
@@ -81,3 +284,6 @@ def get_app_logger():
     """
     global logger
     return logger
+
+
+atexit.register(stop_listener)
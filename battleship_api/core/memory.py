@@ -0,0 +1,550 @@
+"""
+In-memory storage backend (see `storage` setting).
+
+Records of every table are kept in process memory, in dictionaries indexed
+by primary key and by declared columns (e.g. players by board id), so data
+access does not leave the process. Data is lost when the process exits and it
+is not shared between server workers, so this backend fits casual games,
+tests and benchmarks served by single worker.
+
+Records are accessed through session (see `MemorySession.bind`). Changes are
+applied to records immediately and journaled by the session which made them,
+so session rollback (explicit or on close without commit) reverts them. Path
+operations do not await between reading and changing records, so changes of
+concurrent requests do not interleave. Batch (shared) session keeps its
+changes journaled till its transaction ends, so batch requests are handled
+with exclusive access to the store (see `StoreLockMiddleware`) - otherwise
+batch rollback could revert changes committed by other requests in the
+meantime.
+"""
+import asyncio
+import re
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator
+
+
+# Requests (method, path pattern) handled with exclusive access to the store.
+EXCLUSIVE_ROUTES = (
+    ('POST', re.compile(r'^/api/batch/?$')),)
+
+
+# Record classes by their table name.
+record_classes: dict[str, type['MemoryRecord']] = dict()
+
+
+class MemoryRecord:
+    """
+    Base of in-memory records, mimicking attributes of database models.
+
+    Subclasses declare table name, columns (with their default values) and
+    indexes, each of single column name or tuple of columns names. Columns
+    of stored records are changed through session (see `SessionRecord`),
+    which journals the changes.
+    """
+    __tablename__: str = ''
+    __columns__: dict[str, Any] = dict()
+    __indexes__: tuple[str | tuple[str, ...], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.__tablename__:
+            record_classes[cls.__tablename__] = cls
+
+    def __init__(self, **values):
+        object.__setattr__(self, 'id', values.pop('id', None))
+        object.__setattr__(self, 'table', None)
+        object.__setattr__(self, 'store', None)
+        for name, default in self.__columns__.items():
+            object.__setattr__(self, name, values.pop(name, default))
+        if values:
+            raise TypeError(f"Unknown columns: {', '.join(values)}")
+
+    def __setattr__(self, name: str, value: Any):
+        if self.table is not None and name in self.__columns__:
+            raise AttributeError(
+                f"Column `{name}` of stored {self!r} can be changed only"
+                " through session.")
+        object.__setattr__(self, name, value)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(id={self.id})'
+
+    def get_dependents(self) -> Iterable['MemoryRecord']:
+        """
+        Returns records deleted together with this one (like `ON DELETE
+        CASCADE` foreign keys).
+        """
+        return ()
+
+    def get_related(self, table_name: str, record_id: int | None):
+        """
+        Returns record of given table referenced by given id.
+        """
+        return self.store.table(table_name).get(record_id)
+
+    def get_referencing(self, table_name: str, column: str) -> list:
+        """
+        Returns records of given table referencing this record by given
+        (indexed) column, ordered by id.
+        """
+        return self.store.table(table_name).find(column, self.id)
+
+
+class MemoryTable:
+    """
+    Records of single table by id, with indexes of declared columns.
+    Records are kept in order of their ids.
+    """
+    def __init__(self, store: 'MemoryStore', record_class: type[MemoryRecord]):
+        self.store = store
+        self.record_class = record_class
+        self.rows: dict[int, MemoryRecord] = dict()
+        self.indexes: dict[
+            str | tuple[str, ...],
+            dict[Any, dict[int, MemoryRecord]]
+        ] = {columns: dict() for columns in record_class.__indexes__}
+        self.last_id = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, record_id: int | None) -> MemoryRecord | None:
+        return self.rows.get(record_id)
+
+    def find(
+        self,
+        columns: str | tuple[str, ...],
+        value: Any
+    ) -> list[MemoryRecord]:
+        """
+        Returns records with given value (tuple of values for composite
+        index) of given indexed column(s), ordered by id.
+        """
+        return list(self.indexes[columns].get(value, {}).values())
+
+    def count(self, columns: str | tuple[str, ...], value: Any) -> int:
+        """
+        Returns number of records with given value of given indexed
+        column(s).
+        """
+        return len(self.indexes[columns].get(value, ()))
+
+    def first(
+        self,
+        columns: str | tuple[str, ...],
+        value: Any
+    ) -> MemoryRecord | None:
+        """
+        Returns record with the lowest id among records with given value of
+        given indexed column(s).
+        """
+        records = self.indexes[columns].get(value)
+        return records[next(iter(records))] if records else None
+
+    def last(
+        self,
+        columns: str | tuple[str, ...],
+        value: Any
+    ) -> MemoryRecord | None:
+        """
+        Returns record with the greatest id among records with given value of
+        given indexed column(s).
+        """
+        records = self.indexes[columns].get(value)
+        return records[next(reversed(records))] if records else None
+
+    def insert(self, record: MemoryRecord, session: 'MemorySession'):
+        """
+        Stores new record, assigning it the next id if it has none. Change is
+        journaled by given session.
+        """
+        if record.id is None:
+            self.last_id += 1
+            object.__setattr__(record, 'id', self.last_id)
+        else:
+            self.last_id = max(self.last_id, record.id)
+        self.attach(record)
+        session.journal(lambda: self.detach(record))
+
+    def delete(self, record: MemoryRecord, session: 'MemorySession'):
+        """
+        Deletes stored record together with its dependents. Change is
+        journaled by given session.
+        """
+        for dependent in record.get_dependents():
+            if dependent.table is not None:
+                dependent.table.delete(dependent, session)
+        self.detach(record)
+        session.journal(lambda: self.attach(record))
+
+    def update(
+        self,
+        record: MemoryRecord,
+        name: str,
+        value: Any,
+        session: 'MemorySession'
+    ):
+        """
+        Changes column value of stored record. Change is journaled by given
+        session.
+        """
+        old = getattr(record, name)
+        if old is value:
+            return
+        self.set(record, name, value)
+        session.journal(lambda: self.set(record, name, old))
+
+    def attach(self, record: MemoryRecord):
+        object.__setattr__(record, 'table', self)
+        object.__setattr__(record, 'store', self.store)
+        self.rows = self.add_ordered(self.rows, record)
+        for columns, index in self.indexes.items():
+            value = self.get_key(record, columns)
+            index[value] = self.add_ordered(index.get(value, {}), record)
+
+    def detach(self, record: MemoryRecord):
+        object.__setattr__(record, 'table', None)
+        self.rows.pop(record.id, None)
+        for columns, index in self.indexes.items():
+            self.remove_indexed(
+                index, self.get_key(record, columns), record)
+
+    def set(self, record: MemoryRecord, name: str, value: Any):
+        changed = [
+            (columns, index)
+            for columns, index in self.indexes.items()
+            if name in ((columns,) if isinstance(columns, str) else columns)]
+        for columns, index in changed:
+            self.remove_indexed(
+                index, self.get_key(record, columns), record)
+        object.__setattr__(record, name, value)
+        for columns, index in changed:
+            key = self.get_key(record, columns)
+            index[key] = self.add_ordered(index.get(key, {}), record)
+
+    @staticmethod
+    def get_key(record: MemoryRecord, columns: str | tuple[str, ...]) -> Any:
+        """
+        Returns value of record's indexed column(s).
+        """
+        if isinstance(columns, str):
+            return getattr(record, columns)
+        return tuple(getattr(record, column) for column in columns)
+
+    @staticmethod
+    def add_ordered(
+        records: dict[int, MemoryRecord],
+        record: MemoryRecord
+    ) -> dict[int, MemoryRecord]:
+        """
+        Adds record to dictionary ordered by id. Records are appended, unless
+        deleted record is restored by rollback.
+        """
+        if records and record.id < next(reversed(records)):
+            records[record.id] = record
+            return dict(sorted(records.items()))
+        records[record.id] = record
+        return records
+
+    @staticmethod
+    def remove_indexed(
+        index: dict[Any, dict[int, MemoryRecord]],
+        value: Any,
+        record: MemoryRecord
+    ):
+        records = index.get(value)
+        if records is not None:
+            records.pop(record.id, None)
+            if not records:
+                del index[value]
+
+
+class StoreLock:
+    """
+    Readers-writer lock of the store. Requests are handled holding it shared,
+    batch requests holding it exclusively. Waiting requests are admitted in
+    order of arrival, so requests arriving after waiting batch wait for it.
+    Lock of the same kind serializes batches on SQLite database (see
+    `battleship_api.core.database.get_lock`).
+    """
+    def __init__(self):
+        self.shared = 0
+        self.exclusive = False
+        self.waiters: deque[tuple[asyncio.Future, bool]] = deque()
+
+    def is_free(self, exclusive: bool) -> bool:
+        return not self.exclusive and (not exclusive or self.shared == 0)
+
+    def take(self, exclusive: bool):
+        if exclusive:
+            self.exclusive = True
+        else:
+            self.shared += 1
+
+    async def acquire(self, exclusive: bool):
+        """
+        Takes the lock, waiting till it is free if needed.
+        """
+        if not self.waiters and self.is_free(exclusive):
+            self.take(exclusive)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append((waiter, exclusive))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Lock could be handed over just before request was cancelled.
+            if waiter.done() and not waiter.cancelled():
+                self.release(exclusive)
+            elif (waiter, exclusive) in self.waiters:
+                self.waiters.remove((waiter, exclusive))
+                self.wake()
+            raise
+
+    def release(self, exclusive: bool):
+        """
+        Frees the lock, handing it over to the first waiting requests (if
+        they can hold it together).
+        """
+        if exclusive:
+            self.exclusive = False
+        else:
+            self.shared -= 1
+        self.wake()
+
+    def wake(self):
+        while self.waiters:
+            waiter, exclusive = self.waiters[0]
+            if not waiter.done() and not self.is_free(exclusive):
+                return
+            self.waiters.popleft()
+            if not waiter.done():
+                self.take(exclusive)
+                waiter.set_result(None)
+
+
+class MemoryStore:
+    """
+    In-memory tables, created on first use.
+    """
+    def __init__(self):
+        self.tables: dict[str, MemoryTable] = dict()
+        self.lock = StoreLock()
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self.tables.values())
+
+    def table(self, name: str) -> MemoryTable:
+        if (table := self.tables.get(name)) is None:
+            table = self.tables[name] = MemoryTable(self, record_classes[name])
+        return table
+
+
+class MemoryTransaction:
+    """
+    Transaction of shared session (see `begin_shared_session`), collecting
+    changes committed by the session.
+    """
+    def __init__(self):
+        self.changes: list[Callable[[], None]] = list()
+        # Functions registered by `MemorySession.on_commit`, called when
+        # transaction ends.
+        self.callbacks: list[Callable[[], None]] = list()
+        self.is_active = True
+
+    def commit(self):
+        self.changes.clear()
+        self.is_active = False
+
+    def rollback(self):
+        while self.changes:
+            self.changes.pop()()
+        self.is_active = False
+
+
+class SessionRecord:
+    """
+    Stored record accessed through session. Attributes are read from the
+    record (related records are bound to the same session), while changes of
+    its columns are journaled by the session.
+    """
+    __slots__ = ('record', 'session')
+
+    def __init__(self, record: MemoryRecord, session: 'MemorySession'):
+        object.__setattr__(self, 'record', record)
+        object.__setattr__(self, 'session', session)
+
+    def __getattr__(self, name: str) -> Any:
+        return self.session.bind(getattr(self.record, name))
+
+    def __setattr__(self, name: str, value: Any):
+        record = self.record
+        if record.table is None or name not in record.__columns__:
+            setattr(record, name, value)
+        else:
+            record.table.update(record, name, value, self.session)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SessionRecord):
+            return self.record is other.record
+        return self.record is other
+
+    def __hash__(self) -> int:
+        return hash(self.record)
+
+    def __repr__(self) -> str:
+        return repr(self.record)
+
+
+class MemorySession:
+    """
+    Session of in-memory store, mimicking subset of SQLAlchemy session
+    interface used by path operations.
+
+    Session given a transaction works like savepoint: commit passes its
+    changes to the transaction and rollback reverts only changes made since
+    the last commit.
+    """
+    def __init__(
+        self,
+        store: MemoryStore,
+        transaction: MemoryTransaction | None = None
+    ):
+        self.store = store
+        self.transaction = transaction
+        self.changes: list[Callable[[], None]] = list()
+        self.callbacks: list[Callable[[], None]] = list()
+
+    def bind(self, value: Any) -> Any:
+        """
+        Returns given record (or list or tuple of records, or any other value
+        unchanged) accessed through session (see `SessionRecord`).
+        """
+        if isinstance(value, MemoryRecord):
+            return SessionRecord(value, self)
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.bind(item) for item in value)
+        return value
+
+    def journal(self, undo: Callable[[], None]):
+        """
+        Records function reverting change made by session.
+        """
+        self.changes.append(undo)
+
+    def add(self, record: MemoryRecord | SessionRecord):
+        if isinstance(record, SessionRecord):
+            record = record.record
+        self.store.table(record.__tablename__).insert(record, self)
+
+    def delete(self, record: MemoryRecord | SessionRecord):
+        if isinstance(record, SessionRecord):
+            record = record.record
+        if record.table is not None:
+            record.table.delete(record, self)
+
+    def on_commit(self, callback: Callable[[], None]):
+        """
+        Registers function called after commit (see
+        `battleship_api.core.database.on_commit`).
+        """
+        self.callbacks.append(callback)
+
+    def commit(self):
+        callbacks = list(self.callbacks)
+        self.callbacks.clear()
+        if self.transaction is not None:
+            self.transaction.changes.extend(self.changes)
+            self.transaction.callbacks.extend(callbacks)
+            callbacks.clear()
+        self.changes.clear()
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self.callbacks.clear()
+        while self.changes:
+            self.changes.pop()()
+
+    def flush(self):
+        pass
+
+    def refresh(self, _):
+        pass
+
+    def close(self):
+        self.rollback()
+
+
+store: MemoryStore | None = None
+
+
+def init(enabled: bool = True):
+    """
+    Enables in-memory storage with empty store or disables it.
+
+    Params:
+        - [Optional] enabled: Whether to enable in-memory storage.
+            - Defaults to: True.
+    """
+    global store
+    store = MemoryStore() if enabled else None
+
+
+def is_enabled() -> bool:
+    return store is not None
+
+
+def is_exclusive_route(method: str, path: str) -> bool:
+    return any(
+        method == route_method and pattern.match(path)
+        for route_method, pattern in EXCLUSIVE_ROUTES)
+
+
+@contextmanager
+def begin_shared_session() -> Iterator[
+    tuple[MemorySession, MemoryTransaction]
+]:
+    """
+    In-memory equivalent of
+    `battleship_api.core.database.begin_shared_session`.
+    """
+    transaction = MemoryTransaction()
+    session = MemorySession(store, transaction)
+    try:
+        yield session, transaction
+    finally:
+        session.close()
+        if transaction.is_active:
+            transaction.rollback()
+        for callback in transaction.callbacks:
+            callback()
+
+
+class StoreLockMiddleware:
+    """
+    ASGI middleware handling requests holding lock of in-memory store (see
+    `StoreLock`) or lock returned by `get_lock`, if given: exclusively
+    requests listed in `EXCLUSIVE_ROUTES`, shared all the others. Does
+    nothing if there is no lock (e.g. in-memory storage is disabled).
+    """
+    def __init__(
+        self,
+        app,
+        get_lock: Callable[[], StoreLock | None] | None = None
+    ):
+        self.app = app
+        self.get_lock = get_lock or (
+            lambda: store.lock if store is not None else None)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or (lock := self.get_lock()) is None:
+            return await self.app(scope, receive, send)
+        exclusive = is_exclusive_route(scope['method'], scope['path'])
+        await lock.acquire(exclusive)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lock.release(exclusive)
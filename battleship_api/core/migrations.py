@@ -0,0 +1,328 @@
+"""
+Versioned database schema migrations.
+
+Migrations are modules of `battleship_api.migrations` package named
+`m<version>_<name>`, each defining `description` string and
+`upgrade(context: MigrationContext)` function. Applied versions are stored in
+`schema_migrations` table.
+
+Migrations are not run in a single transaction (indexes on PostgreSQL are
+created concurrently, backfills are committed in batches), so every step is
+performed with idempotent `MigrationContext` helpers and interrupted
+migration can be safely run again.
+"""
+import importlib
+import pkgutil
+import re
+
+from datetime import datetime
+from types import ModuleType
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    inspect,
+    select)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+from .logging import append_logger_queue
+
+
+MIGRATIONS_PACKAGE = 'battleship_api.migrations'
+MIGRATION_MODULE_PATTERN = re.compile(r'^m(\d+)_\w+$')
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+versions_table = Table(
+    'schema_migrations',
+    MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('description', String, nullable=False),
+    Column('applied_at', DateTime, nullable=False))
+
+
+class MigrationContext:
+    """
+    Database schema operations available to migrations.
+
+    Every operation checks current database schema at first and does nothing
+    if it was already performed.
+    """
+    def __init__(self, engine: Engine, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.engine = engine
+        self.batch_size = batch_size
+
+    @property
+    def dialect(self) -> str:
+        return self.engine.dialect.name
+
+    def has_table(self, table_name: str) -> bool:
+        return inspect(self.engine).has_table(table_name)
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return any(
+            column['name'] == column_name
+            for column in inspect(self.engine).get_columns(table_name))
+
+    def has_index(self, table_name: str, index_name: str) -> bool:
+        """
+        Checks if table has index or unique constraint of given name.
+        """
+        inspector = inspect(self.engine)
+        return any(
+            item['name'] == index_name
+            for item in (
+                inspector.get_indexes(table_name)
+                + inspector.get_unique_constraints(table_name)))
+
+    def create_table(self, table: Table):
+        """
+        Creates table (with its indexes) if it does not exist.
+        """
+        if not self.has_table(table.name):
+            with self.engine.begin() as connection:
+                table.create(connection)
+
+    def add_column(self, column: Column):
+        """
+        Adds column to its table if it does not exist yet.
+
+        Added column should have server default if it is not nullable.
+        """
+        table = column.table
+        if self.has_column(table.name, column.name):
+            return
+        column_ddl = CreateColumn(column).compile(dialect=self.engine.dialect)
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                f'ALTER TABLE {table.name} ADD COLUMN {column_ddl}')
+
+    def create_index(self, index: Index):
+        """
+        Creates index if it does not exist.
+
+        On PostgreSQL index is created concurrently (without blocking writes
+        to the table). Invalid index left by interrupted concurrent creation
+        is dropped and created again.
+        """
+        table_name = index.table.name
+        if self.dialect == 'postgresql' and self.is_invalid_index(index.name):
+            with self.autocommit() as connection:
+                connection.exec_driver_sql(
+                    f'DROP INDEX CONCURRENTLY IF EXISTS {index.name}')
+        if self.has_index(table_name, index.name):
+            return
+        ddl = CreateIndex(index).compile(dialect=self.engine.dialect)
+        if self.dialect == 'postgresql':
+            ddl = re.sub(
+                r'^CREATE (UNIQUE )?INDEX', r'\g<0> CONCURRENTLY', str(ddl))
+            with self.autocommit() as connection:
+                connection.exec_driver_sql(str(ddl))
+        else:
+            with self.engine.begin() as connection:
+                connection.exec_driver_sql(str(ddl))
+
+    def is_invalid_index(self, index_name: str) -> bool:
+        with self.engine.connect() as connection:
+            return bool(connection.exec_driver_sql(
+                'SELECT 1 FROM pg_index'
+                ' JOIN pg_class ON pg_class.oid = pg_index.indexrelid'
+                ' WHERE pg_class.relname = %(name)s'
+                ' AND NOT pg_index.indisvalid',
+                {'name': index_name}).first())
+
+    def backfill(self, table: Table, values: dict):
+        """
+        Updates all table rows with given values in batches of `batch_size`
+        rows (by primary key ranges), each committed separately, so table is
+        never locked for long.
+
+        Params:
+            - table: Updated table.
+                - It has to have single column, integer primary key.
+            - values: Values of updated columns, by column name. Can be SQL
+              expressions (e.g. correlated subqueries).
+        """
+        key = table.primary_key.columns.values()[0]
+        with self.engine.connect() as connection:
+            first, last = connection.execute(
+                select(func.min(key), func.max(key))).first()
+        if first is None:
+            return
+        for start in range(first, last + 1, self.batch_size):
+            with self.engine.begin() as connection:
+                connection.execute(
+                    table.update()
+                    .where(key >= start, key < start + self.batch_size)
+                    .values(values))
+
+    def set_foreign_key(self, table: Table, column_name: str):
+        """
+        Recreates foreign key constraint of given column, if its `ON DELETE`
+        action differs from the one declared by given table definition.
+
+        On PostgreSQL constraint is added as `NOT VALID` and validated in
+        separate transaction, so table is not locked during validation. On
+        SQLite (not allowing to alter constraints) whole table is rebuilt.
+
+        Params:
+            - table: Table definition with desired foreign key.
+            - column_name: Name of foreign key column.
+        """
+        foreign_key = next(
+            constraint
+            for constraint in table.foreign_key_constraints
+            if constraint.column_keys == [column_name])
+        ondelete = foreign_key.ondelete
+        current = next(
+            constraint
+            for constraint in inspect(self.engine).get_foreign_keys(
+                table.name)
+            if constraint['constrained_columns'] == [column_name])
+        current_ondelete = current.get('options', dict()).get('ondelete')
+        if (current_ondelete or '').upper() == (ondelete or '').upper():
+            return
+        if self.dialect == 'sqlite':
+            self.rebuild_sqlite_table(table)
+            return
+
+        referred = foreign_key.elements[0].column
+        name = current['name']
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                f'ALTER TABLE {table.name} DROP CONSTRAINT {name},'
+                f' ADD CONSTRAINT {name} FOREIGN KEY ({column_name})'
+                f' REFERENCES {referred.table.name} ({referred.name})'
+                + (f' ON DELETE {ondelete}' if ondelete else '')
+                + ' NOT VALID')
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                f'ALTER TABLE {table.name} VALIDATE CONSTRAINT {name}')
+
+    def rebuild_sqlite_table(self, table: Table):
+        """
+        Rebuilds SQLite table according to given definition, copying all rows
+        of columns existing in both definitions, in single transaction.
+        """
+        columns = ', '.join(
+            column.name
+            for column in table.columns
+            if self.has_column(table.name, column.name))
+        temporary = f'_rebuilt_{table.name}'
+        create_ddl = str(CreateTable(table).compile(
+            dialect=self.engine.dialect))
+        create_ddl = create_ddl.replace(
+            f'CREATE TABLE {table.name}', f'CREATE TABLE {temporary}', 1)
+        indexes_ddl = [
+            str(CreateIndex(index).compile(dialect=self.engine.dialect))
+            for index in table.indexes]
+
+        connection = self.engine.raw_connection()
+        isolation_level = connection.isolation_level
+        connection.isolation_level = None
+        cursor = connection.cursor()
+        try:
+            cursor.execute('PRAGMA foreign_keys=OFF')
+            cursor.execute('BEGIN')
+            try:
+                cursor.execute(create_ddl)
+                cursor.execute(
+                    f'INSERT INTO {temporary} ({columns})'
+                    f' SELECT {columns} FROM {table.name}')
+                cursor.execute(f'DROP TABLE {table.name}')
+                cursor.execute(
+                    f'ALTER TABLE {temporary} RENAME TO {table.name}')
+                for ddl in indexes_ddl:
+                    cursor.execute(ddl)
+                if cursor.execute(
+                    f'PRAGMA foreign_key_check({table.name})'
+                ).fetchone() is not None:
+                    raise RuntimeError(
+                        f"Rebuilt table `{table.name}` violates foreign key"
+                        " constraints.")
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+            cursor.execute('COMMIT')
+        finally:
+            cursor.execute('PRAGMA foreign_keys=ON')
+            cursor.close()
+            connection.isolation_level = isolation_level
+            connection.close()
+
+    def autocommit(self) -> Connection:
+        return self.engine.connect().execution_options(
+            isolation_level='AUTOCOMMIT')
+
+
+def get_migrations() -> list[tuple[int, ModuleType]]:
+    """
+    Returns all migration modules with their versions, ordered by version.
+    """
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations = list()
+    for module_info in pkgutil.iter_modules(package.__path__):
+        if match := MIGRATION_MODULE_PATTERN.match(module_info.name):
+            migrations.append((
+                int(match.group(1)),
+                importlib.import_module(
+                    f'{MIGRATIONS_PACKAGE}.{module_info.name}')))
+    return sorted(migrations, key=lambda migration: migration[0])
+
+
+def get_applied_versions(engine: Engine) -> set[int]:
+    """
+    Returns versions of migrations applied to the database.
+    """
+    if not inspect(engine).has_table(versions_table.name):
+        return set()
+    with engine.connect() as connection:
+        return set(connection.execute(
+            select(versions_table.c.version)).scalars())
+
+
+def upgrade(
+    engine: Engine,
+    target: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> list[int]:
+    """
+    Applies all not applied migrations up to `target` version, in order.
+
+    Params:
+        - engine: Database connection engine.
+        - [Optional] target: Last version to apply.
+            - Defaults to: Latest version.
+        - [Optional] batch_size: Number of rows updated by single backfill
+          transaction.
+            - Defaults to: `DEFAULT_BATCH_SIZE`.
+
+    Returns:
+        Versions of applied migrations.
+    """
+    versions_table.create(engine, checkfirst=True)
+    applied = get_applied_versions(engine)
+    context = MigrationContext(engine, batch_size)
+    performed = list()
+    for version, module in get_migrations():
+        if version in applied or (target is not None and version > target):
+            continue
+        append_logger_queue(lambda logger, version=version, module=module: (
+            logger.info(
+                f"Applying migration {version}: {module.description}")))
+        module.upgrade(context)
+        with engine.begin() as connection:
+            connection.execute(versions_table.insert().values(
+                version=version,
+                description=module.description,
+                applied_at=datetime.utcnow()))
+        performed.append(version)
+    return performed
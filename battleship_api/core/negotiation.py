@@ -0,0 +1,209 @@
+"""
+Content negotiation between JSON and MessagePack bodies.
+
+Requests with `Content-Type: application/msgpack` header have their bodies
+decoded by `ContentNegotiationMiddleware` before routing, so endpoints parse
+them as JSON ones. Responses are encoded as MessagePack when request's
+`Accept` header prefers it. `NegotiatedResponse` (application's default
+response class, also used by API exceptions) encodes its content directly in
+chosen format, other JSON responses (e.g. request validation errors) are
+converted by the middleware.
+
+Requires `msgpack` package.
+"""
+import json
+
+from contextvars import ContextVar
+from fastapi.responses import JSONResponse
+from typing import Any
+
+
+JSON_MEDIA_TYPE = 'application/json'
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+MSGPACK_MEDIA_TYPES = frozenset({MSGPACK_MEDIA_TYPE, 'application/x-msgpack'})
+
+# Media type of response body to the currently handled request.
+response_media_type: ContextVar[str] = ContextVar(
+    'response_media_type', default=JSON_MEDIA_TYPE)
+
+
+def get_media_type(content_type: str) -> str:
+    """
+    Returns media type of `Content-Type` header value, without parameters.
+    """
+    return content_type.split(';', 1)[0].strip().lower()
+
+
+def get_accepted_media_type(accept: str) -> str:
+    """
+    Returns media type of response body (JSON or MessagePack) preferred by
+    given `Accept` header value. JSON is chosen if both are equally
+    preferred or none of them is accepted.
+    """
+    msgpack_quality = json_quality = 0.0
+    for item in accept.split(','):
+        media_type, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = media_type.strip().lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, quality)
+        elif media_type in (JSON_MEDIA_TYPE, 'application/*', '*/*'):
+            json_quality = max(json_quality, quality)
+    return (
+        MSGPACK_MEDIA_TYPE
+        if msgpack_quality > json_quality
+        else JSON_MEDIA_TYPE)
+
+
+def replace_headers(
+    headers: list[tuple[bytes, bytes]],
+    content_type: str,
+    content_length: int
+) -> list[tuple[bytes, bytes]]:
+    """
+    Returns ASGI headers list with `Content-Type` and `Content-Length`
+    headers replaced by given values.
+    """
+    return [
+        (name, value)
+        for name, value in headers
+        if name not in (b'content-type', b'content-length')] + [
+            (b'content-type', content_type.encode('latin-1')),
+            (b'content-length', str(content_length).encode('latin-1'))]
+
+
+class NegotiatedResponse(JSONResponse):
+    """
+    JSON response encoded as MessagePack if it was preferred by handled
+    request (see `ContentNegotiationMiddleware`).
+    """
+    def __init__(self, content: Any = None, *args, **kwargs):
+        if (
+            kwargs.get('media_type') is None
+            and response_media_type.get() == MSGPACK_MEDIA_TYPE
+        ):
+            kwargs['media_type'] = MSGPACK_MEDIA_TYPE
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            import msgpack
+
+            return msgpack.packb(content)
+        return super().render(content)
+
+
+class ContentNegotiationMiddleware:
+    """
+    ASGI middleware decoding MessagePack request bodies to JSON and choosing
+    format of response bodies by `Accept` request header. JSON response
+    bodies not encoded by `NegotiatedResponse` are converted to MessagePack
+    when it was preferred.
+
+    Should wrap all middlewares returning error responses, so their bodies
+    are negotiated too.
+    """
+    def __init__(self, app):
+        import msgpack
+
+        self.app = app
+        self.msgpack = msgpack
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope['headers'])
+        content_type = get_media_type(
+            headers.get(b'content-type', b'').decode('latin-1'))
+        if content_type in MSGPACK_MEDIA_TYPES:
+            receive = await self.decode_request(scope, receive)
+
+        media_type = get_accepted_media_type(
+            headers.get(b'accept', b'').decode('latin-1'))
+        token = response_media_type.set(media_type)
+        try:
+            await self.app(scope, receive, self.encoding_sender(
+                send, media_type == MSGPACK_MEDIA_TYPE))
+        finally:
+            response_media_type.reset(token)
+
+    async def decode_request(self, scope, receive):
+        """
+        Reads whole MessagePack request body and replaces it (with
+        `Content-Type` and `Content-Length` headers) by its JSON equivalent.
+
+        Returns:
+            Receive callable returning decoded body.
+        """
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] != 'http.request':
+                break
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+        try:
+            body = json.dumps(
+                self.msgpack.unpackb(body),
+                separators=(',', ':')).encode('utf-8')
+        except (ValueError, TypeError, self.msgpack.UnpackException):
+            # Left invalid, so it is rejected by request validation.
+            body = bytes(body)
+        scope['headers'] = replace_headers(
+            scope['headers'], JSON_MEDIA_TYPE, len(body))
+
+        sent = False
+
+        async def receive_decoded():
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        return receive_decoded
+
+    def encoding_sender(self, send, encode: bool):
+        """
+        Returns send callable adding `Vary: Accept` header to the response
+        and (if `encode` is set) converting its JSON body to MessagePack.
+        """
+        start = None
+        body = bytearray()
+
+        async def send_encoded(message):
+            nonlocal start
+            if message['type'] == 'http.response.start':
+                message['headers'] = list(message.get('headers', ())) + [
+                    (b'vary', b'Accept')]
+                content_type = next(
+                    (
+                        value.decode('latin-1')
+                        for name, value in message['headers']
+                        if name == b'content-type'),
+                    '')
+                if encode and get_media_type(content_type) == JSON_MEDIA_TYPE:
+                    start = message
+                    return
+            elif message['type'] == 'http.response.body' and start:
+                body.extend(message.get('body', b''))
+                if message.get('more_body', False):
+                    return
+                encoded = self.msgpack.packb(json.loads(body)) if body else b''
+                start['headers'] = replace_headers(
+                    start['headers'], MSGPACK_MEDIA_TYPE, len(encoded))
+                await send(start)
+                message = {'type': 'http.response.body', 'body': encoded}
+            await send(message)
+
+        return send_encoded
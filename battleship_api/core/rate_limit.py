@@ -0,0 +1,207 @@
+"""
+Rate limiting of HTTP requests with token buckets.
+
+Every client has separate bucket in each limited route group (see
+`battleship_api.core.admission.ROUTE_GROUPS`). Bucket holds up to `burst`
+tokens and is refilled with `rate` tokens per second. Every request takes
+one token and requests finding empty bucket are rejected with
+`429 Too Many Requests` response (with `Retry-After` header).
+
+Clients are identified by player id of their `X-Auth-Token` header (if it is
+valid) or by their IP address.
+
+Buckets are kept in process memory by default, so each server worker limits
+clients separately. Redis store shares buckets between all workers.
+"""
+import math
+import time
+
+from collections import OrderedDict
+from fastapi import status
+from typing import Callable, NamedTuple
+
+from . import diagnostics
+from .admission import get_group_name
+from .exceptions import BaseAPIException
+
+
+AUTH_TOKEN_HEADER = b'x-auth-token'
+
+DEFAULT_MAX_BUCKETS = 100_000
+
+
+class RateLimit(NamedTuple):
+    rate: float
+    burst: int
+
+
+class TooManyRequestsException(BaseAPIException):
+    """
+    API exception raise when client exceeds rate limit of route group.
+    """
+    code = status.HTTP_429_TOO_MANY_REQUESTS
+    message = "Too many requests, slow down."
+
+
+class MemoryStore:
+    """
+    Token buckets kept in process memory.
+
+    Least recently used buckets are dropped when number of buckets exceeds
+    `max_buckets`.
+    """
+    def __init__(self, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """
+        Takes one token from bucket of given key.
+
+        Returns:
+            0 if token was taken, otherwise number of seconds after which it
+            will be available.
+        """
+        now = time.monotonic()
+        tokens, updated = self.buckets.pop(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / limit.rate
+        self.buckets[key] = (tokens, now)
+        if len(self.buckets) > self.max_buckets:
+            self.buckets.popitem(last=False)
+        return wait
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+
+class RedisStore:
+    """
+    Token buckets kept in Redis, shared by all server workers.
+
+    Requires `redis` package.
+    """
+    SCRIPT = """
+        local rate = tonumber(ARGV[1])
+        local burst = tonumber(ARGV[2])
+        local time = redis.call('TIME')
+        local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+        local tokens = tonumber(bucket[1]) or burst
+        local updated = tonumber(bucket[2]) or now
+        tokens = math.min(burst, tokens + (now - updated) * rate)
+        local wait = 0
+        if tokens >= 1 then
+            tokens = tokens - 1
+        else
+            wait = (1 - tokens) / rate
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+        return tostring(wait)
+    """
+
+    def __init__(self, url: str, prefix: str = 'battleship_api:rate_limit:'):
+        from redis import asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.script = self.client.register_script(self.SCRIPT)
+        self.prefix = prefix
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """
+        Takes one token from bucket of given key.
+
+        Returns:
+            0 if token was taken, otherwise number of seconds after which it
+            will be available.
+        """
+        return float(await self.script(
+            keys=[self.prefix + key], args=[limit.rate, limit.burst]))
+
+
+limits: dict[str, RateLimit] = dict()
+store: MemoryStore | RedisStore = MemoryStore()
+
+
+def init(group_limits: dict[str, RateLimit | None], redis_url: str | None):
+    """
+    Initializes route groups rate limits and buckets store.
+
+    Params:
+        - group_limits: Rate limits by route group name (`listing`,
+          `gameplay` or `default`). Groups with None limit are not limited.
+        - redis_url: Url of Redis database keeping buckets. If not given,
+          buckets are kept in process memory.
+    """
+    global limits
+    global store
+    limits = {
+        name: limit
+        for name, limit in group_limits.items()
+        if limit is not None}
+    store = RedisStore(redis_url) if redis_url else MemoryStore()
+
+
+def get_client_key(
+    scope,
+    identify_player: Callable[[str], int | None]
+) -> str:
+    """
+    Returns key identifying client of request with given ASGI scope: player
+    id of its `X-Auth-Token` header (if `identify_player` returns it) or its
+    IP address.
+    """
+    token = next(
+        (
+            value.decode('latin-1')
+            for name, value in scope['headers']
+            if name == AUTH_TOKEN_HEADER),
+        None)
+    if token and (player_id := identify_player(token)) is not None:
+        return f'player:{player_id}'
+    client = scope.get('client')
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+def get_buckets_count() -> int:
+    return len(store) if isinstance(store, MemoryStore) else 0
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware rejecting requests of clients exceeding rate limits of
+    route groups (see `battleship_api.core.rate_limit.init`).
+
+    `identify_player` is called with value of `X-Auth-Token` header and
+    should return player id or None if token is invalid.
+    """
+    def __init__(
+        self,
+        app,
+        identify_player: Callable[[str], int | None] = lambda _: None
+    ):
+        self.app = app
+        self.identify_player = identify_player
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        group = get_group_name(scope['method'], scope['path'])
+        if (limit := limits.get(group)) is None:
+            return await self.app(scope, receive, send)
+
+        wait = await store.take(
+            f'{group}:{get_client_key(scope, self.identify_player)}', limit)
+        if wait > 0:
+            response = TooManyRequestsException(
+                headers={'Retry-After': str(math.ceil(wait))}).response()
+            return await response(scope, receive, send)
+        await self.app(scope, receive, send)
+
+
+diagnostics.register_cache('rate_limit_buckets', get_buckets_count)
@@ -0,0 +1,67 @@
+import os
+import uvicorn
+
+from battleship_api import create_app, init_database
+
+from . import database
+from .settings import ENV_PREFIX, Settings
+
+
+APP_FACTORY = 'battleship_api:create_app'
+
+
+def get_server_args(settings: Settings) -> dict:
+    """
+    Translates application settings into `uvicorn.run` keyword arguments.
+    """
+    return {
+        'host': settings.host,
+        'port': settings.port,
+        'workers': settings.workers,
+        'loop': settings.loop,
+        'http': settings.http,
+        'backlog': settings.backlog,
+        'timeout_keep_alive': settings.keep_alive_timeout,
+        'limit_concurrency': settings.limit_concurrency,
+        'timeout_graceful_shutdown': settings.graceful_shutdown_timeout,
+        # Requests are logged by the application itself, if enabled.
+        'access_log': not settings.log_access}
+
+
+def run(settings: Settings):
+    """
+    Runs application server with given settings.
+
+    Single worker serves application created from given settings in this
+    process. Multiple workers are started as separate processes, each
+    creating its own application instance (and so its own database
+    connection pool) through `battleship_api.create_app` factory, from
+    environment variables and configuration file. Database migrations and
+    tables (if enabled by `db_migrate` and `db_create_all` settings) are
+    applied and created once, before workers are started, so workers do not
+    race each other doing it and skip this step.
+
+    In-memory storage (`storage` setting) is not shared between processes,
+    so with it application is always served by single worker.
+
+    On SIGTERM or SIGINT server stops accepting new connections and waits up
+    to `graceful_shutdown_timeout` seconds for requests in progress before
+    exiting.
+
+    Params:
+        - settings: Settings object instance.
+    """
+    if settings.storage == 'memory':
+        uvicorn.run(
+            create_app(settings),
+            **get_server_args(settings) | {'workers': 1})
+    elif settings.workers == 1:
+        uvicorn.run(create_app(settings), **get_server_args(settings))
+    else:
+        init_database(settings)
+        database.dispose()
+        # Spawned workers inherit environment, so they skip creating tables
+        # and applying migrations.
+        os.environ[f'{ENV_PREFIX}_db_create_all'] = 'false'
+        os.environ[f'{ENV_PREFIX}_db_migrate'] = 'false'
+        uvicorn.run(APP_FACTORY, factory=True, **get_server_args(settings))
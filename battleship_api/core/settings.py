@@ -7,6 +7,7 @@ from .logging import append_logger_queue
 
 from pathlib import Path
 from pydantic import PostgresDsn
+from typing import Literal
 from .database import SQLiteUrl
 
 ENV_PREFIX = 'battleship_api'
@@ -17,8 +18,49 @@ class Settings(BaseSettings):
     port: int = Field(80)
     debug: bool = Field(True)
 
+    log_format: Literal['text', 'json'] = Field('text')
+    log_queue: bool = Field(True)
+    log_access: bool = Field(False)
+    log_access_sample_rate: float = Field(1.0, ge=0, le=1)
+    log_debug_sample_rate: float = Field(1.0, ge=0, le=1)
+
+    workers: int = Field(1, ge=1)
+    loop: Literal['auto', 'asyncio', 'uvloop'] = Field('auto')
+    http: Literal['auto', 'h11', 'httptools'] = Field('auto')
+    backlog: int = Field(2048, ge=1)
+    keep_alive_timeout: int = Field(5, ge=0)
+    limit_concurrency: int | None = Field(None, ge=1)
+    graceful_shutdown_timeout: int | None = Field(30, ge=0)
+
+    admission_gameplay_limit: int | None = Field(None, ge=1)
+    admission_listing_limit: int | None = Field(None, ge=1)
+    admission_default_limit: int | None = Field(None, ge=1)
+    admission_queue_size: int = Field(100, ge=0)
+    admission_queue_timeout: float = Field(0.5, ge=0)
+    admission_retry_after: int = Field(1, ge=0)
+
+    rate_limit_gameplay: float | None = Field(None, gt=0)
+    rate_limit_gameplay_burst: int | None = Field(None, ge=1)
+    rate_limit_listing: float | None = Field(None, gt=0)
+    rate_limit_listing_burst: int | None = Field(None, ge=1)
+    rate_limit_default: float | None = Field(None, gt=0)
+    rate_limit_default_burst: int | None = Field(None, ge=1)
+    rate_limit_redis_url: str | None
+
+    idempotency_ttl: int = Field(24 * 60 * 60, ge=1)
+    idempotency_redis_url: str | None
+
+    msgpack: bool = Field(False)
+
+    batch_max_operations: int = Field(500, ge=1)
+    bulk_max_boards: int = Field(1000, ge=1)
+
+    storage: Literal['sqlalchemy', 'memory'] = Field('sqlalchemy')
     db_url: PostgresDsn | SQLiteUrl = Field("sqlite:///./db.sqlite3")
     db_check_same_thread: bool | None
+    db_create_all: bool = Field(True)
+    db_migrate: bool = Field(False)
+    db_pool_warm_up: int = Field(0, ge=0)
 
     secret_key: str = Field('please_overwrite_me_im_not_secure')
 
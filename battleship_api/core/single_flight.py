@@ -0,0 +1,121 @@
+"""
+Coalescing of concurrent identical computations (single flight).
+
+While computation of given key is in progress, every other request for the
+same key waits for its result instead of starting its own computation.
+Results are not cached - computation started after the previous one finished
+is performed again.
+
+Computations in progress of key which data was changed (see `invalidate`) are
+not joined anymore, so request sent after its own committed write does not
+get result read before that write. Writes are tracked per process only -
+request handled by other server worker can still get result read before
+write committed by another one.
+"""
+import asyncio
+
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Callable, Hashable
+
+from . import diagnostics
+
+
+class SingleFlight:
+    """
+    Group of coalesced computations, identified by keys.
+
+    Counters:
+        - executed: Number of performed computations.
+        - coalesced: Number of requests which shared result of computation
+          started by another request.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.calls: dict[Hashable, asyncio.Future] = dict()
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[..., Any], *args) -> Any:
+        """
+        Returns result of `func(*args)` call (run in threadpool), shared with
+        all concurrent calls of the same key. Exception raised by the call is
+        raised in all of them. If the call is cancelled (e.g. its client
+        disconnected), waiting requests retry it instead.
+        """
+        while (call := self.calls.get(key)) is not None:
+            self.coalesced += 1
+            # Unlike awaiting the call, waiting does not propagate its
+            # cancellation.
+            await asyncio.wait((call,))
+            if not call.cancelled():
+                return call.result()
+            self.coalesced -= 1
+
+        call = asyncio.get_running_loop().create_future()
+        self.calls[key] = call
+        self.executed += 1
+        try:
+            result = await run_in_threadpool(func, *args)
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as exception:
+            call.set_exception(exception)
+            # Marks exception as retrieved, if no one else waits for it.
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            if self.calls.get(key) is call:
+                del self.calls[key]
+
+    def invalidate(self, key: Hashable):
+        """
+        Makes computation of given key in progress (if any) not joinable by
+        next requests, which start new computation instead.
+        """
+        self.calls.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            'name': self.name,
+            'in_flight': len(self.calls),
+            'executed': self.executed,
+            'coalesced': self.coalesced}
+
+
+flights: dict[str, SingleFlight] = dict()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """
+    Returns single flight group of given name, creating it at first call.
+    """
+    if name not in flights:
+        flights[name] = SingleFlight(name)
+    return flights[name]
+
+
+def invalidate(key: Hashable):
+    """
+    Makes computations of given key in progress in all single flight groups
+    not joinable (see `SingleFlight.invalidate`). Should be called, from the
+    event loop thread, when data read by these computations changes - both
+    before and after the change is committed.
+    """
+    for flight in flights.values():
+        flight.invalidate(key)
+
+
+def get_stats() -> list[dict]:
+    """
+    Returns counters of all single flight groups.
+    """
+    return [flight.stats() for flight in flights.values()]
+
+
+diagnostics.register_cache(
+    'single_flight_calls',
+    lambda: sum(len(flight.calls) for flight in flights.values()))
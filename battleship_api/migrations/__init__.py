@@ -0,0 +1,8 @@
+"""
+Versioned database schema migrations applied by
+`battleship_api.core.migrations.upgrade` (or by running this package, see
+`python -m battleship_api.migrations --help`).
+
+Every migration declares tables it operates on as they look at its version,
+so migrations do not change when application models do.
+"""
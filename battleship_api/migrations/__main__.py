@@ -0,0 +1,43 @@
+import argparse
+import sys
+
+from battleship_api import init_database
+from battleship_api.core import database, migrations
+from battleship_api.core.settings import get_settings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m battleship_api.migrations',
+        description="Applies BattleshipAPI database schema migrations to the"
+                    " database configured by application settings.")
+    parser.add_argument(
+        'command', choices=('upgrade', 'status'), nargs='?',
+        default='upgrade')
+    parser.add_argument(
+        '--target', type=int,
+        help="Last migration version to apply. Defaults to the latest one.")
+    parser.add_argument(
+        '--batch-size', type=int, default=migrations.DEFAULT_BATCH_SIZE,
+        help="Number of rows updated by single backfill transaction.")
+    args = parser.parse_args(argv)
+
+    settings = get_settings(db_create_all=False, db_migrate=False)
+    init_database(settings)
+    engine = database.get_engine()
+
+    if args.command == 'status':
+        applied = migrations.get_applied_versions(engine)
+        for version, module in migrations.get_migrations():
+            print(
+                f"[{'x' if version in applied else ' '}] {version:04d}"
+                f" {module.description}")
+        return 0
+
+    for version in migrations.upgrade(engine, args.target, args.batch_size):
+        print(f"Applied migration {version:04d}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
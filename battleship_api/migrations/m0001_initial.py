@@ -0,0 +1,55 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Enum,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table)
+
+from battleship_api.core.migrations import MigrationContext
+from battleship_api.core.types import BoardState, Orientation
+
+
+description = "Create boards, players, ships and shots tables"
+
+
+metadata = MetaData()
+
+boards = Table(
+    'boards',
+    metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column('password', String, nullable=True),
+    Column('state', Enum(BoardState)))
+
+players = Table(
+    'players',
+    metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column('board_id', Integer, ForeignKey('boards.id'), index=True),
+    Column('ready', Boolean))
+
+ships = Table(
+    'ships',
+    metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column('owner_id', Integer, ForeignKey('players.id'), index=True),
+    Column('length', Integer),
+    Column('column', Integer, index=True),
+    Column('row', Integer, index=True),
+    Column('orientation', Enum(Orientation)))
+
+shots = Table(
+    'shots',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('player_id', Integer, ForeignKey('players.id')),
+    Column('row', Integer),
+    Column('column', Integer))
+
+
+def upgrade(context: MigrationContext):
+    for table in metadata.sorted_tables:
+        context.create_table(table)
@@ -0,0 +1,55 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    false,
+    func,
+    select)
+
+from battleship_api.core.migrations import MigrationContext
+
+
+description = (
+    "Add boards lobby columns (has_password, players_count, version) and"
+    " index")
+
+
+metadata = MetaData()
+
+boards = Table(
+    'boards',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('password', String, nullable=True),
+    Column('state', String),
+    Column('has_password', Boolean, server_default=false(), nullable=False),
+    Column('players_count', Integer, server_default='0', nullable=False),
+    Column('version', Integer, server_default='0', nullable=False))
+
+players = Table(
+    'players',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('board_id', Integer))
+
+lobby_index = Index(
+    'ix_boards_lobby',
+    boards.c.state,
+    boards.c.has_password,
+    boards.c.id,
+    boards.c.players_count)
+
+
+def upgrade(context: MigrationContext):
+    context.add_column(boards.c.has_password)
+    context.add_column(boards.c.players_count)
+    context.add_column(boards.c.version)
+    context.backfill(boards, {
+        'has_password': boards.c.password.is_not(None),
+        'players_count': select(func.count(players.c.id)).where(
+            players.c.board_id == boards.c.id).scalar_subquery()})
+    context.create_index(lobby_index)
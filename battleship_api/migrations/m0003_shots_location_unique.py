@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Index, Integer, MetaData, Table
+
+from battleship_api.core.migrations import MigrationContext
+
+
+description = "Add unique index of shots locations of each player"
+
+
+metadata = MetaData()
+
+shots = Table(
+    'shots',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('player_id', Integer),
+    Column('row', Integer),
+    Column('column', Integer))
+
+location_index = Index(
+    '_location_unique_constraint',
+    shots.c.player_id,
+    shots.c.row,
+    shots.c.column,
+    unique=True)
+
+
+def upgrade(context: MigrationContext):
+    context.create_index(location_index)
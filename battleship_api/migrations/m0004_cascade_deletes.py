@@ -0,0 +1,70 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    Table)
+
+from battleship_api.core.migrations import MigrationContext
+from battleship_api.core.types import Orientation
+
+
+description = (
+    "Delete players, ships and shots together with their board or player"
+    " (ON DELETE CASCADE)")
+
+
+metadata = MetaData()
+
+boards = Table(
+    'boards',
+    metadata,
+    Column('id', Integer, primary_key=True))
+
+players = Table(
+    'players',
+    metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column(
+        'board_id',
+        Integer,
+        ForeignKey('boards.id', ondelete='CASCADE'),
+        index=True),
+    Column('ready', Boolean))
+
+ships = Table(
+    'ships',
+    metadata,
+    Column('id', Integer, primary_key=True, index=True),
+    Column(
+        'owner_id',
+        Integer,
+        ForeignKey('players.id', ondelete='CASCADE'),
+        index=True),
+    Column('length', Integer),
+    Column('column', Integer, index=True),
+    Column('row', Integer, index=True),
+    Column('orientation', Enum(Orientation)))
+
+shots = Table(
+    'shots',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('player_id', Integer, ForeignKey('players.id', ondelete='CASCADE')),
+    Column('row', Integer),
+    Column('column', Integer),
+    Index(
+        '_location_unique_constraint',
+        'player_id',
+        'row',
+        'column',
+        unique=True))
+
+
+def upgrade(context: MigrationContext):
+    context.set_foreign_key(players, 'board_id')
+    context.set_foreign_key(ships, 'owner_id')
+    context.set_foreign_key(shots, 'player_id')
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, Table
+
+from battleship_api.core.migrations import MigrationContext
+
+
+description = (
+    "Add boards game result columns (winner_id, finished_at, shots_count)"
+    " and index")
+
+
+metadata = MetaData()
+
+boards = Table(
+    'boards',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('winner_id', Integer, nullable=True),
+    Column('finished_at', DateTime, nullable=True),
+    Column('shots_count', Integer, nullable=True))
+
+finished_at_index = Index(
+    'ix_boards_finished_at',
+    boards.c.finished_at,
+    boards.c.id)
+
+
+def upgrade(context: MigrationContext):
+    context.add_column(boards.c.winner_id)
+    context.add_column(boards.c.finished_at)
+    context.add_column(boards.c.shots_count)
+    context.create_index(finished_at_index)
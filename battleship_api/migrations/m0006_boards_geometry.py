@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, MetaData, String, Table
+
+from battleship_api.core.migrations import MigrationContext
+
+
+description = "Add boards geometry columns (width, height, fleet)"
+
+
+metadata = MetaData()
+
+# Existing boards keep classic 10x10 board with ships of length 1-4.
+boards = Table(
+    'boards',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('width', Integer, server_default='10', nullable=False),
+    Column('height', Integer, server_default='10', nullable=False),
+    Column('fleet', String, server_default='1,2,3,4', nullable=False))
+
+
+def upgrade(context: MigrationContext):
+    context.add_column(boards.c.width)
+    context.add_column(boards.c.height)
+    context.add_column(boards.c.fleet)
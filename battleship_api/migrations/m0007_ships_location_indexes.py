@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table
+
+from battleship_api.core.migrations import MigrationContext
+
+
+description = "Add indexes of ships locations of each player"
+
+
+metadata = MetaData()
+
+ships = Table(
+    'ships',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('owner_id', Integer),
+    Column('orientation', String),
+    Column('row', Integer),
+    Column('column', Integer))
+
+rows_index = Index(
+    'ix_ships_owner_rows',
+    ships.c.owner_id,
+    ships.c.orientation,
+    ships.c.row,
+    ships.c.column)
+
+columns_index = Index(
+    'ix_ships_owner_columns',
+    ships.c.owner_id,
+    ships.c.orientation,
+    ships.c.column,
+    ships.c.row)
+
+
+def upgrade(context: MigrationContext):
+    context.create_index(rows_index)
+    context.create_index(columns_index)
@@ -0,0 +1,20 @@
+from sqlalchemy import Boolean, Column, Integer, MetaData, Table, false
+
+from battleship_api.core.migrations import MigrationContext
+
+
+description = "Add boards matchmaking column"
+
+
+metadata = MetaData()
+
+# Existing boards are treated as created directly.
+boards = Table(
+    'boards',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('matchmaking', Boolean, server_default=false(), nullable=False))
+
+
+def upgrade(context: MigrationContext):
+    context.add_column(boards.c.matchmaking)
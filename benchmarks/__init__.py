@@ -0,0 +1,6 @@
+"""
+BattleshipAPI performance tooling.
+
+Run `python -m benchmarks --help` from the repository root for the list of
+available options.
+"""
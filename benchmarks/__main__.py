@@ -0,0 +1,73 @@
+import argparse
+import sys
+
+from pathlib import Path
+
+from . import flows, rules
+from .timing import compare_results, load_results, save_results
+
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description="Runs BattleshipAPI benchmarks and compares results with"
+                    " stored baseline.")
+    parser.add_argument(
+        '--suite', choices=('all', 'rules', 'flows'), default='all')
+    parser.add_argument(
+        '--games', type=int, default=20,
+        help="Number of games played by flows suite.")
+    parser.add_argument(
+        '--storage', choices=('sqlalchemy', 'memory'), default='sqlalchemy',
+        help="Storage backend used by flows suite (baseline is recorded with"
+             " `sqlalchemy` one).")
+    parser.add_argument(
+        '--output', type=Path,
+        help="Path of JSON file to which results are saved.")
+    parser.add_argument(
+        '--baseline', type=Path, default=BASELINE_PATH,
+        help="Path of JSON file with baseline results.")
+    parser.add_argument(
+        '--update-baseline', action='store_true',
+        help="Overwrite baseline with current results.")
+    parser.add_argument(
+        '--tolerance', type=float, default=0.25,
+        help="Allowed relative slowdown against baseline.")
+    parser.add_argument(
+        '--metric', choices=('best_us', 'median_us', 'worst_us'),
+        default='best_us',
+        help="Metric compared against baseline.")
+    args = parser.parse_args(argv)
+
+    results = dict()
+    if args.suite in ('all', 'rules'):
+        results |= rules.run()
+    if args.suite in ('all', 'flows'):
+        results |= flows.run(args.games, storage=args.storage)
+
+    for name, result in sorted(results.items()):
+        print(f"{name:60} {result[args.metric]:12.1f} us")
+
+    if args.output:
+        save_results(results, args.output)
+    if args.update_baseline:
+        save_results(results, args.baseline)
+        return 0
+    if not args.baseline.exists():
+        print(f"Baseline `{args.baseline}` not found, comparison skipped.")
+        return 0
+
+    regressions = compare_results(
+        results, load_results(args.baseline), args.tolerance, args.metric)
+    for name, baseline, current, ratio in regressions:
+        print(
+            f"REGRESSION {name}: {baseline:.1f} us -> {current:.1f} us"
+            f" (x{ratio:.2f})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
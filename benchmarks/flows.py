@@ -0,0 +1,84 @@
+import asyncio
+import random
+import time
+
+import httpx
+
+from battleship_api import create_app
+from battleship_api.core.settings import Settings
+
+from .game import GameClient, play_game
+
+
+MEMORY_DB_URL = 'sqlite:///:memory:'
+
+
+def create_client(**settings) -> httpx.AsyncClient:
+    """
+    Creates API client bound directly (without network) to new application
+    instance using in-memory database.
+
+    Params:
+        - **settings: Application settings overwriting the defaults.
+    """
+    settings = {'db_url': MEMORY_DB_URL, 'debug': False} | settings
+    if settings['db_url'].startswith('sqlite'):
+        settings.setdefault('db_check_same_thread', False)
+    app = create_app(Settings(**settings))
+    return httpx.AsyncClient(app=app, base_url='http://benchmark')
+
+
+async def run_games(
+    games: int,
+    seed: int,
+    storage: str
+) -> dict[str, dict[str, float]]:
+    latencies = dict()
+
+    def record(route: str, _: int, elapsed: float):
+        latencies.setdefault(route, list()).append(elapsed * 1e6)
+
+    rng = random.Random(seed)
+    async with create_client(storage=storage) as client:
+        game_client = GameClient(client, record)
+        games_times = list()
+        for _ in range(games):
+            start = time.perf_counter()
+            await play_game(game_client, rng)
+            games_times.append((time.perf_counter() - start) * 1e6)
+
+    results = {
+        'flows.full_game': summarize(games_times)}
+    for route, route_latencies in latencies.items():
+        results[f'flows.route[{route}]'] = summarize(route_latencies)
+    return results
+
+
+def summarize(times: list[float]) -> dict[str, float]:
+    times = sorted(times)
+    return {
+        'best_us': times[0],
+        'median_us': times[len(times) // 2],
+        'worst_us': times[-1],
+        'count': len(times)}
+
+
+def run(
+    games: int = 20,
+    seed: int = 0,
+    storage: str = 'sqlalchemy'
+) -> dict[str, dict[str, float]]:
+    """
+    Benchmarks full game flows (create board, join two players, place fleets,
+    mark players as ready and shoot to game completion) against application
+    using in-memory database or in-memory storage backend.
+
+    Params:
+        - [Optional] games: Number of played games.
+        - [Optional] seed: Random numbers generator seed.
+        - [Optional] storage: Application `storage` setting.
+
+    Returns:
+        Benchmark results mapped by benchmark name.
+    """
+    return asyncio.run(run_games(games, seed, storage))
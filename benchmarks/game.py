@@ -0,0 +1,244 @@
+import asyncio
+import random
+import time
+
+import httpx
+
+from typing import Callable
+
+from battleship_api.core.types import BoardState, Orientation
+
+
+BOARD_SIZE = 10
+FLEET = (1, 2, 3, 4)
+
+
+Recorder = Callable[[str, int, float], None]
+ErrorRecorder = Callable[[str, Exception], None]
+
+
+def random_fleet(
+    rng: random.Random,
+    size: int = BOARD_SIZE,
+    fleet: tuple[int, ...] = FLEET
+) -> list[dict]:
+    """
+    Places given fleet at random, non colliding positions.
+
+    Params:
+        - rng: Random numbers generator.
+        - [Optional] size: Board size.
+        - [Optional] fleet: Lengths of ships to place.
+
+    Returns:
+        List of ships location data accepted by `POST /api/ships/`.
+    """
+    taken = set()
+    ships = list()
+    for length in fleet:
+        while True:
+            orientation = rng.choice(list(Orientation))
+            horizontal = orientation is Orientation.horizontal
+            column = rng.randint(1, size - (length - 1) * horizontal)
+            row = rng.randint(1, size - (length - 1) * (not horizontal))
+            cells = {
+                (column + i * horizontal, row + i * (not horizontal))
+                for i in range(length)}
+            if not cells & taken:
+                break
+        taken |= cells
+        ships.append({
+            'length': length,
+            'column': column,
+            'row': row,
+            'orientation': orientation.value})
+    return ships
+
+
+def fleet_cells(ships: list[dict]) -> set[tuple[int, int]]:
+    """
+    Returns set of (column, row) cells taken by given ships.
+    """
+    return {
+        (
+            ship['column'] + i * ship['orientation'],
+            ship['row'] + i * (1 - ship['orientation']))
+        for ship in ships
+        for i in range(ship['length'])}
+
+
+class GameClient:
+    """
+    Thin wrapper of `httpx.AsyncClient` reporting every API call to given
+    recorder as route name, response status code and latency in seconds.
+
+    Exceptions raised during calls (e.g. unhandled application exceptions
+    when client is bound directly to application) are reported to error
+    recorder (if given) and reraised.
+    """
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: Recorder | None = None,
+        error_recorder: ErrorRecorder | None = None
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.error_recorder = error_recorder
+
+    async def call(
+        self,
+        route: str,
+        method: str,
+        url: str,
+        **kwargs
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except Exception as exception:
+            if self.error_recorder is not None:
+                self.error_recorder(route, exception)
+            raise
+        if self.recorder is not None:
+            self.recorder(
+                route,
+                response.status_code,
+                time.perf_counter() - start)
+        return response
+
+
+class Bot:
+    """
+    Player bot placing its fleet and shooting at enemy cells in random order.
+    """
+    def __init__(self, client: GameClient, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.fleet = random_fleet(rng)
+        self.targets = [
+            (column, row)
+            for column in range(1, BOARD_SIZE + 1)
+            for row in range(1, BOARD_SIZE + 1)]
+        rng.shuffle(self.targets)
+        self.hits = 0
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {'X-Auth-Token': self.token}
+
+    async def join(self, board_id: int):
+        response = await self.client.call(
+            'POST /players/', 'POST', '/api/players/',
+            json={'board_id': board_id})
+        response.raise_for_status()
+        self.id = response.json()['id']
+        self.board_id = board_id
+        self.token = response.headers['X-Auth-Token']
+
+    async def call_retrying(self, *args, **kwargs) -> httpx.Response:
+        """
+        Performs API call, retrying it while board is concurrently modified
+        by the other player.
+        """
+        while (
+            response := await self.client.call(*args, **kwargs)
+        ).status_code == 409:
+            await asyncio.sleep(0)
+        response.raise_for_status()
+        return response
+
+    async def prepare(self):
+        for ship in self.fleet:
+            await self.call_retrying(
+                'POST /ships/', 'POST', '/api/ships/',
+                json=ship | {'owner_id': self.id},
+                headers=self.headers)
+        await self.call_retrying(
+            'PUT /players/{id}/ready', 'PUT', f'/api/players/{self.id}/ready',
+            json={'ready': True},
+            headers=self.headers)
+
+    async def shoot(self, enemy_cells: set[tuple[int, int]]) -> bool:
+        """
+        Tries to shoot at next target.
+
+        Returns:
+            True if shot was created, False on conflict.
+        """
+        column, row = self.targets[-1]
+        response = await self.client.call(
+            'POST /shots/', 'POST', '/api/shots/',
+            json={'player_id': self.id, 'column': column, 'row': row},
+            headers=self.headers)
+        if response.status_code == 409:
+            return False
+        response.raise_for_status()
+        self.targets.pop()
+        self.hits += (column, row) in enemy_cells
+        return True
+
+    async def is_game_finished(self) -> bool:
+        response = await self.client.call(
+            'GET /boards/{id}', 'GET', f'/api/boards/{self.board_id}')
+        response.raise_for_status()
+        return response.json()['state'] == BoardState.game_finished
+
+
+async def play_game(
+    client: GameClient,
+    rng: random.Random,
+    concurrent_players: bool = False,
+) -> int:
+    """
+    Plays full game (create board, join two players, place fleets, mark
+    players as ready and shoot until one fleet is sunk).
+
+    Params:
+        - client: API client.
+        - rng: Random numbers generator.
+        - [Optional] concurrent_players: Whether both players should play as
+          independent tasks (retrying on shot conflicts) instead of taking
+          turns sequentially.
+            - Defaults to: False.
+
+    Returns:
+        Winner id returned by `GET /api/boards/{id}/winner`.
+    """
+    response = await client.call(
+        'POST /boards/', 'POST', '/api/boards/', json={'password': None})
+    response.raise_for_status()
+    board_id = response.json()['id']
+
+    bots = [Bot(client, rng), Bot(client, rng)]
+    for bot in bots:
+        await bot.join(board_id)
+    if concurrent_players:
+        await asyncio.gather(*(bot.prepare() for bot in bots))
+    else:
+        for bot in bots:
+            await bot.prepare()
+    bots.sort(key=lambda bot: bot.id)
+    total = sum(FLEET)
+
+    if concurrent_players:
+        async def play(bot: Bot, enemy: Bot):
+            enemy_cells = fleet_cells(enemy.fleet)
+            while bot.hits < total:
+                if not await bot.shoot(enemy_cells):
+                    if await bot.is_game_finished():
+                        return
+                    await asyncio.sleep(0)
+        await asyncio.gather(play(bots[0], bots[1]), play(bots[1], bots[0]))
+    else:
+        cells = [fleet_cells(bot.fleet) for bot in reversed(bots)]
+        turn = 0
+        while all(bot.hits < total for bot in bots):
+            if not await bots[turn].shoot(cells[turn]):
+                raise RuntimeError("Unexpected shot conflict.")
+            turn ^= 1
+
+    response = await client.call(
+        'GET /boards/{id}/winner', 'GET', f'/api/boards/{board_id}/winner')
+    response.raise_for_status()
+    return response.json()['id']
@@ -0,0 +1,225 @@
+"""
+In-process load generator playing concurrent bot games against BattleshipAPI.
+
+Games are played either against application bound directly to the client
+(ASGI, no network) or against running server given by `--url`. Database lock
+errors can be recognized only in the first case, as server responds to them
+with generic internal server error.
+
+Run `python -m benchmarks.load --help` for the list of available options.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+
+from pathlib import Path
+
+from .flows import create_client
+from .game import GameClient, play_game
+
+
+LOCK_ERROR_MARKERS = (
+    'database is locked',
+    'deadlock detected',
+    'could not serialize access',
+    'lock timeout')
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """
+    Returns given percentile of sorted values (nearest-rank method).
+    """
+    if not values:
+        return 0.0
+    rank = round(percent / 100 * len(values)) - 1
+    return values[max(0, min(len(values) - 1, rank))]
+
+
+class LoadStats:
+    """
+    Collects per route latencies, response status codes and errors.
+    """
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = dict()
+        self.statuses: dict[str, dict[int, int]] = dict()
+        self.errors: dict[str, int] = dict()
+        self.lock_errors = 0
+        self.games_finished = 0
+        self.games_failed = 0
+
+    def record(self, route: str, status_code: int, elapsed: float):
+        self.latencies.setdefault(route, list()).append(elapsed)
+        route_statuses = self.statuses.setdefault(route, dict())
+        route_statuses[status_code] = route_statuses.get(status_code, 0) + 1
+
+    def record_error(self, route: str, exception: Exception):
+        self.errors[route] = self.errors.get(route, 0) + 1
+        if is_lock_error(exception):
+            self.lock_errors += 1
+
+    def report(self, elapsed: float) -> dict:
+        """
+        Summarizes collected data.
+
+        Params:
+            - elapsed: Load test duration in seconds.
+
+        Returns:
+            Dictionary with overall and per route statistics.
+        """
+        requests = sum(len(values) for values in self.latencies.values())
+        routes = dict()
+        for route, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            statuses = self.statuses[route]
+            routes[route] = {
+                'requests': len(latencies),
+                'p50_ms': percentile(latencies, 50) * 1e3,
+                'p90_ms': percentile(latencies, 90) * 1e3,
+                'p99_ms': percentile(latencies, 99) * 1e3,
+                'max_ms': latencies[-1] * 1e3,
+                'conflict_rate': statuses.get(409, 0) / len(latencies),
+                'server_errors': sum(
+                    count
+                    for status_code, count in statuses.items()
+                    if status_code >= 500) + self.errors.get(route, 0),
+                'statuses': statuses}
+        return {
+            'duration_s': elapsed,
+            'requests': requests,
+            'requests_per_second': requests / elapsed if elapsed else 0.0,
+            'games_finished': self.games_finished,
+            'games_failed': self.games_failed,
+            'db_lock_errors': self.lock_errors,
+            'routes': routes}
+
+
+def is_lock_error(exception: BaseException) -> bool:
+    """
+    Checks if given exception (or any exception in its chain) was caused by
+    database lock.
+    """
+    while exception is not None:
+        if any(
+            marker in str(exception).lower()
+            for marker in LOCK_ERROR_MARKERS
+        ):
+            return True
+        exception = exception.__cause__ or exception.__context__
+    return False
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    games: int,
+    concurrency: int,
+    seed: int,
+    concurrent_players: bool
+) -> dict:
+    stats = LoadStats()
+    game_client = GameClient(client, stats.record, stats.record_error)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_game(game_seed: int):
+        async with semaphore:
+            try:
+                await play_game(
+                    game_client,
+                    random.Random(game_seed),
+                    concurrent_players)
+            except Exception:
+                stats.games_failed += 1
+            else:
+                stats.games_finished += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_game(seed + game) for game in range(games)))
+    return stats.report(time.perf_counter() - start)
+
+
+def print_report(report: dict):
+    print(
+        f"{report['requests']} requests in {report['duration_s']:.2f} s"
+        f" ({report['requests_per_second']:.1f} req/s),"
+        f" games finished: {report['games_finished']},"
+        f" games failed: {report['games_failed']},"
+        f" DB lock errors: {report['db_lock_errors']}")
+    print(
+        f"{'route':28} {'requests':>9} {'p50 ms':>9} {'p90 ms':>9}"
+        f" {'p99 ms':>9} {'max ms':>9} {'409 %':>7} {'5xx':>5}")
+    for route, stats in report['routes'].items():
+        print(
+            f"{route:28} {stats['requests']:9d} {stats['p50_ms']:9.2f}"
+            f" {stats['p90_ms']:9.2f} {stats['p99_ms']:9.2f}"
+            f" {stats['max_ms']:9.2f} {stats['conflict_rate'] * 100:7.2f}"
+            f" {stats['server_errors']:5d}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.load',
+        description="Plays concurrent bot games against BattleshipAPI and"
+                    " reports throughput, latencies, conflicts and errors.")
+    parser.add_argument(
+        '--games', type=int, default=100,
+        help="Total number of played games.")
+    parser.add_argument(
+        '--concurrency', type=int, default=10,
+        help="Number of games played at the same time.")
+    parser.add_argument(
+        '--url',
+        help="Base url of running server (e.g. `http://127.0.0.1:8000`). If"
+             " not given, games are played against application instance"
+             " created in this process.")
+    parser.add_argument(
+        '--db-url',
+        help="Database url of application instance created in this process."
+             " Defaults to new SQLite database in temporary directory.")
+    parser.add_argument(
+        '--sequential-players', action='store_true',
+        help="Players take turns instead of shooting concurrently and"
+             " retrying on conflicts.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--timeout', type=float, default=30.0,
+        help="Single request timeout in seconds.")
+    parser.add_argument(
+        '--output', type=Path,
+        help="Path of JSON file to which report is saved.")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        client = httpx.AsyncClient(
+            base_url=args.url,
+            timeout=args.timeout,
+            limits=httpx.Limits(max_connections=args.concurrency * 2))
+    else:
+        temp_dir = tempfile.TemporaryDirectory()
+        client = create_client(db_url=(
+            args.db_url or f'sqlite:///{temp_dir.name}/load.sqlite3'))
+
+    async def run() -> dict:
+        async with client:
+            return await run_load(
+                client,
+                args.games,
+                args.concurrency,
+                args.seed,
+                not args.sequential_players)
+
+    report = asyncio.run(run())
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+    return 1 if report['games_failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Query plan regression checks of hot queries.
+
+Plays full game and calls single object getters against application instance
+created in this process, capturing all SQL statements emitted by each route.
+Then every captured statement is explained by the database (`EXPLAIN QUERY
+PLAN` on SQLite, `EXPLAIN` on PostgreSQL) and check fails if any of them
+reads whole table of `shots`, `ships` or `players`.
+
+Run `python -m benchmarks.query_plans --help` for the list of available
+options.
+"""
+import argparse
+import asyncio
+import random
+import re
+import sys
+import tempfile
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from battleship_api.core import database
+
+from .flows import create_client
+from .game import GameClient, play_game
+
+
+WATCHED_TABLES = ('shots', 'ships', 'players')
+
+EXPLAINED_STATEMENTS = ('SELECT', 'UPDATE', 'DELETE')
+
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (\w+)'),
+    'postgresql': re.compile(r'\bSeq Scan on (\w+)')}
+
+# Single object getters called after played game, by route name.
+GETTERS = {
+    'GET /boards/{id}': '/api/boards/1',
+    'GET /players/{id}': '/api/players/1',
+    'GET /ships/{id}/public': '/api/ships/1/public',
+    'GET /shots/{id}': '/api/shots/1',
+    'GET /shots/{id}/hit': '/api/shots/1/hit'}
+
+
+class CapturingGameClient(GameClient):
+    """
+    Game client remembering route name of currently performed call.
+    """
+    route: str | None = None
+
+    async def call(self, route: str, *args, **kwargs):
+        self.route = route
+        try:
+            return await super().call(route, *args, **kwargs)
+        finally:
+            self.route = None
+
+
+def explain(
+    connection: Connection,
+    statement: str,
+    parameters
+) -> list[str]:
+    """
+    Returns lines of query plan of given statement.
+    """
+    if connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql('SET enable_seqscan = off')
+        rows = connection.exec_driver_sql(f'EXPLAIN {statement}', parameters)
+        return [row[0] for row in rows]
+    rows = connection.exec_driver_sql(
+        f'EXPLAIN QUERY PLAN {statement}', parameters)
+    return [row[-1] for row in rows]
+
+
+def find_full_scans(dialect: str, plan: list[str]) -> list[str]:
+    """
+    Returns names of watched tables fully scanned by given query plan.
+    """
+    pattern = FULL_SCAN_PATTERNS.get(dialect, FULL_SCAN_PATTERNS['sqlite'])
+    return [
+        table
+        for line in plan
+        for table in pattern.findall(line)
+        if table in WATCHED_TABLES]
+
+
+async def capture_statements(
+    client: CapturingGameClient,
+    engine: Engine
+) -> dict[tuple[str, str], object]:
+    statements = dict()
+
+    def before_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        if (
+            client.route is not None
+            and statement.lstrip().upper().startswith(EXPLAINED_STATEMENTS)
+        ):
+            statements.setdefault((client.route, statement), parameters)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        await play_game(client, random.Random(0))
+        for route, url in GETTERS.items():
+            response = await client.call(route, 'GET', url)
+            response.raise_for_status()
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return statements
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.query_plans',
+        description="Fails if any hot query of BattleshipAPI scans whole"
+                    f" table of: {', '.join(WATCHED_TABLES)}.")
+    parser.add_argument(
+        '--db-url',
+        help="Url of empty database used by checked application. Defaults to"
+             " new SQLite database in temporary directory.")
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help="Print query plans of all checked statements.")
+    args = parser.parse_args(argv)
+
+    temp_dir = tempfile.TemporaryDirectory()
+    client = create_client(db_url=(
+        args.db_url or f'sqlite:///{temp_dir.name}/plans.sqlite3'))
+    engine = database.get_engine()
+
+    async def run():
+        async with client:
+            return await capture_statements(
+                CapturingGameClient(client), engine)
+
+    statements = asyncio.run(run())
+
+    failures = 0
+    with engine.connect() as connection:
+        for (route, statement), parameters in statements.items():
+            plan = explain(connection, statement, parameters)
+            scans = find_full_scans(engine.dialect.name, plan)
+            if scans or args.verbose:
+                print(f"{'FULL SCAN' if scans else 'OK'} [{route}]")
+                print(f"    {' '.join(statement.split())}")
+                for line in plan:
+                    print(f"        {line}")
+            failures += bool(scans)
+    print(
+        f"Checked {len(statements)} statements, {failures} with full scans of"
+        f" watched tables.")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
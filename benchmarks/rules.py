@@ -0,0 +1,99 @@
+import math
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from battleship_api.api.ship import funcs
+from battleship_api.api.ship.models import Ship as ShipModel
+from battleship_api.api.ship.repository import SQLShipRepository
+from battleship_api.api.ship.schemas import ShipCreate
+from battleship_api.core.database import BaseModel
+from battleship_api.core.types import Orientation
+
+from .timing import measure
+
+
+FLEET_SIZES = (4, 16, 64, 256, 1024)
+
+
+def build_fleet(rng: random.Random, fleet_size: int) -> list[ShipCreate]:
+    """
+    Builds fleet of `fleet_size` ships of length 1-4 placed at random on
+    square board big enough to fit them.
+
+    Validation is skipped, so ships may collide.
+    """
+    size = max(10, math.ceil(math.sqrt(fleet_size * 4 * 4)))
+    fleet = list()
+    for _ in range(fleet_size):
+        length = rng.randint(1, 4)
+        orientation = rng.choice(list(Orientation))
+        horizontal = orientation is Orientation.horizontal
+        fleet.append(ShipCreate.construct(
+            owner_id=1,
+            length=length,
+            orientation=orientation,
+            column=rng.randint(1, size - (length - 1) * horizontal),
+            row=rng.randint(1, size - (length - 1) * (not horizontal))))
+    return fleet
+
+
+def create_fleet_session(fleet: list[ShipCreate]) -> Session:
+    """
+    Returns session of new in-memory SQLite database with schema created and
+    given fleet stored.
+    """
+    engine = create_engine('sqlite://')
+    BaseModel.metadata.create_all(engine)
+    db = Session(bind=engine)
+    db.add_all(ShipModel(**ship.dict()) for ship in fleet)
+    db.commit()
+    return db
+
+
+def run(number: int = 200, repeat: int = 5) -> dict[str, dict[str, float]]:
+    """
+    Micro-benchmarks game rules functions from `battleship_api.api.ship.funcs`
+    and ship creation conflict check (fleet and collision queries against
+    in-memory SQLite database) across fleet sizes.
+
+    Params:
+        - [Optional] number: Number of calls in each measurement round.
+        - [Optional] repeat: Number of measurement rounds.
+
+    Returns:
+        Benchmark results mapped by benchmark name.
+    """
+    rng = random.Random(0)
+    results = dict()
+    for fleet_size in FLEET_SIZES:
+        fleet = build_fleet(rng, fleet_size)
+        ship = fleet[0]
+        # Miss is the worst case for `is_ship`, as all ships are checked.
+        results[f'rules.is_ship[fleet={fleet_size}]'] = measure(
+            lambda: funcs.is_ship(0, 0, fleet), repeat, number)
+        results[f'rules.ships_collides[fleet={fleet_size}]'] = measure(
+            lambda: [funcs.ships_collides(ship, other) for other in fleet],
+            repeat, number)
+        db = create_fleet_session(fleet)
+        ships = SQLShipRepository(db)
+        lengths = [1, 2, 3, 4] * fleet_size
+        results[f'rules.ships_conflicts[fleet={fleet_size}]'] = measure(
+            lambda: (
+                not funcs.fleet_allows(
+                    ship.length, ships.get_owner_ships_counts(1), lengths)
+                or ships.ship_collides(ship, 4)),
+            repeat, number)
+        db.close()
+        index = funcs.ShipIndex(fleet)
+        results[f'rules.ShipIndex.build[fleet={fleet_size}]'] = measure(
+            lambda: funcs.ShipIndex(fleet), repeat, number)
+        results[f'rules.ShipIndex.is_ship[fleet={fleet_size}]'] = measure(
+            lambda: index.is_ship(0, 0), repeat, number)
+        results[f'rules.ShipIndex.collides[fleet={fleet_size}]'] = measure(
+            lambda: index.collides(ship), repeat, number)
+        results[f'rules.get_ship_cords[fleet={fleet_size}]'] = measure(
+            lambda: [funcs.get_ship_cords(other) for other in fleet],
+            repeat, number)
+    return results
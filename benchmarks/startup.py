@@ -0,0 +1,113 @@
+"""
+Import and startup time benchmark with budget assertion.
+
+Every sample is taken in fresh Python process, which imports `battleship_api`
+package and creates application instance (in production mode) connected to
+SQLite database in temporary directory. Tables are created before
+measurements, so sampled startups differ only by `db_create_all` setting.
+
+Run `python -m benchmarks.startup --help` for the list of available options.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from pathlib import Path
+
+
+REPOSITORY_PATH = Path(__file__).parent.parent
+
+SAMPLE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from battleship_api import create_app
+from battleship_api.core.settings import Settings
+imported = time.perf_counter()
+create_app(Settings(
+    db_url=sys.argv[1],
+    db_check_same_thread=False,
+    db_create_all=sys.argv[2] == 'true',
+    debug=False))
+created = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1e3,
+    'create_app_ms': (created - imported) * 1e3}))
+"""
+
+
+def sample(db_url: str, create_all: bool) -> dict[str, float]:
+    """
+    Measures import and application creation time in new process.
+
+    Returns:
+        Dictionary with `import_ms`, `create_app_ms` and `total_ms` times.
+    """
+    output = subprocess.run(
+        [
+            sys.executable, '-c', SAMPLE_SCRIPT,
+            db_url, 'true' if create_all else 'false'],
+        cwd=REPOSITORY_PATH,
+        capture_output=True,
+        check=True,
+        text=True).stdout
+    times = json.loads(output)
+    times['total_ms'] = times['import_ms'] + times['create_app_ms']
+    return times
+
+
+def run(runs: int, create_all: bool) -> dict[str, dict[str, float]]:
+    """
+    Takes given number of startup samples.
+
+    Returns:
+        Best and median time of every measured phase, by phase name.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_url = f'sqlite:///{temp_dir}/startup.sqlite3'
+        # Creates tables, so every sample starts with the same database.
+        sample(db_url, True)
+        samples = [sample(db_url, create_all) for _ in range(runs)]
+    return {
+        phase: {
+            'best_ms': min(times[phase] for times in samples),
+            'median_ms': statistics.median(
+                times[phase] for times in samples)}
+        for phase in samples[0]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.startup',
+        description="Measures BattleshipAPI import and startup time and"
+                    " fails if it exceeds given budget.")
+    parser.add_argument(
+        '--runs', type=int, default=5,
+        help="Number of measured startups.")
+    parser.add_argument(
+        '--create-all', action='store_true',
+        help="Create missing tables on startup (`db_create_all` setting)"
+             " instead of relying on migrations.")
+    parser.add_argument(
+        '--budget-ms', type=float, default=1500.0,
+        help="Allowed median time of import and application creation.")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs, args.create_all)
+    for phase, times in results.items():
+        print(
+            f"{phase:16} best {times['best_ms']:9.1f} ms"
+            f"   median {times['median_ms']:9.1f} ms")
+
+    total = results['total_ms']['median_ms']
+    if total > args.budget_ms:
+        print(f"OVER BUDGET: {total:.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    print(f"Within budget: {total:.1f} ms <= {args.budget_ms:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import json
+import math
+import statistics
+import time
+
+from pathlib import Path
+from typing import Callable
+
+
+def measure(
+    func: Callable[[], object],
+    repeat: int = 5,
+    number: int = 1000
+) -> dict[str, float]:
+    """
+    Measures execution time of given function.
+
+    Params:
+        - func: Function without parameters to measure.
+        - [Optional] repeat: Number of measurement rounds.
+            - Defaults to: 5.
+        - [Optional] number: Number of function calls in each round.
+            - Defaults to: 1000.
+
+    Returns:
+        Dictionary with best, median and worst single call time (in
+        microseconds) from all rounds.
+    """
+    rounds = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        'best_us': min(rounds),
+        'median_us': statistics.median(rounds),
+        'worst_us': max(rounds)}
+
+
+def save_results(results: dict[str, dict[str, float]], path: Path):
+    """
+    Saves benchmark results as JSON file.
+
+    Params:
+        - results: Benchmark results mapped by benchmark name.
+        - path: JSON file path.
+    """
+    with open(path, 'w', encoding='utf-8') as results_file:
+        json.dump(
+            {
+                name: {key: round(value, 1) for key, value in result.items()}
+                for name, result in results.items()},
+            results_file,
+            indent=2,
+            sort_keys=True)
+        results_file.write('\n')
+
+
+def load_results(path: Path) -> dict[str, dict[str, float]]:
+    """
+    Loads benchmark results from JSON file.
+
+    Params:
+        - path: JSON file path.
+
+    Returns:
+        Benchmark results mapped by benchmark name.
+    """
+    with open(path, encoding='utf-8') as results_file:
+        return json.load(results_file)
+
+
+def compare_results(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+    metric: str = 'best_us'
+) -> list[tuple[str, float, float, float]]:
+    """
+    Compares benchmark results with baseline ones.
+
+    Params:
+        - results: Current benchmark results.
+        - baseline: Baseline benchmark results.
+        - tolerance: Allowed relative slowdown (e.g. 0.2 means 20%).
+        - [Optional] metric: Compared metric name.
+            - Defaults to: `best_us`, as the least affected by noise.
+
+    Returns:
+        List of regressed benchmarks as tuples of benchmark name, baseline
+        value, current value and ratio between them.
+    """
+    regressions = list()
+    for name, result in sorted(results.items()):
+        if name not in baseline or metric not in baseline[name]:
+            continue
+        baseline_value = baseline[name][metric]
+        if baseline_value > 0:
+            ratio = result[metric] / baseline_value
+        else:
+            # Anything slower than (unmeasurable) zero time is a regression.
+            ratio = math.inf if result[metric] > 0 else 1.0
+        if ratio > 1 + tolerance:
+            regressions.append(
+                (name, baseline[name][metric], result[metric], ratio))
+    return regressions